@@ -144,7 +144,7 @@ class DesktopPetApp:
             print("  [OK] 配置加载完成")
             self.logger.info("配置文件加载成功")
         except Exception as e:
-            self.logger.error(f"配置加载失败: {e}")
+            self.logger.error("配置加载失败: %s", e)
             self.config = {}  # 使用空配置
             print(f"  [WARN] 配置加载失败，使用默认配置: {e}")
         
@@ -154,7 +154,7 @@ class DesktopPetApp:
             db_path = self.config.get('Database', {}).get('db_path', 'data/tasks.db')
             self.database = Database(db_path)
             print("  [OK] 数据库初始化完成")
-            self.logger.info(f"数据库初始化成功: {db_path}")
+            self.logger.info("数据库初始化成功: %s", db_path)
             
             # 自动备份数据库
             auto_backup = self.config.get('Database', {}).get('auto_backup', True)
@@ -186,7 +186,7 @@ class DesktopPetApp:
             print("  [OK] 宠物管理器初始化完成")
             self.logger.info("宠物管理器初始化成功")
         except Exception as e:
-            self.logger.error(f"宠物管理器初始化失败: {e}")
+            self.logger.error("宠物管理器初始化失败: %s", e)
             print(f"  [WARN] 宠物管理器初始化失败: {e}")
         # 4. 初始化宠物成长系统 [v0.4.0]
         print("\n[4/15] 初始化宠物成长系统...")
@@ -200,7 +200,7 @@ class DesktopPetApp:
             else:
                 print("  [WARN] 没有激活的宠物，跳过成长系统初始化")
         except Exception as e:
-            self.logger.error(f"宠物成长系统初始化失败: {e}")
+            self.logger.error("宠物成长系统初始化失败: %s", e)
             print(f"  [WARN] 宠物成长系统初始化失败: {e}")
         
         # 5. 创建宠物窗口
@@ -287,7 +287,7 @@ class DesktopPetApp:
             print("  [OK] 番茄钟系统创建完成")
             self.logger.info("番茄钟系统创建成功")
         except Exception as e:
-            self.logger.error(f"番茄钟系统创建失败: {e}")
+            self.logger.error("番茄钟系统创建失败: %s", e)
             print(f"  [WARN] 番茄钟系统创建失败: {e}")
             self.pomodoro_window = None
             self.pomodoro_widget = None
@@ -323,7 +323,7 @@ class DesktopPetApp:
             
             self.logger.info("成就/背包/商店窗口创建成功")
         except Exception as e:
-            self.logger.error(f"成就/背包/商店窗口创建失败: {e}")
+            self.logger.error("成就/背包/商店窗口创建失败: %s", e)
             print(f"  [ERROR] 成就/背包/商店窗口创建失败: {e}")
             self.achievements_window = None
             self.inventory_window = None
@@ -340,7 +340,7 @@ class DesktopPetApp:
             print("  [OK] AI对话窗口创建完成")
             self.logger.info("AI对话窗口创建成功")
         except Exception as e:
-            self.logger.error(f"AI对话窗口创建失败: {e}")
+            self.logger.error("AI对话窗口创建失败: %s", e)
             print(f"  [WARN] AI对话窗口创建失败: {e}")
             self.chat_window = None
         
@@ -352,7 +352,7 @@ class DesktopPetApp:
             print("  [OK] 图片识别器创建完成")
             self.logger.info("图片识别器创建成功")
         except Exception as e:
-            self.logger.error(f"图片识别器创建失败: {e}")
+            self.logger.error("图片识别器创建失败: %s", e)
             print(f"  [WARN] 图片识别器创建失败: {e}")
             self.image_recognizer = None
         
@@ -366,7 +366,7 @@ class DesktopPetApp:
             print("  [OK] 便签窗口创建完成")
             self.logger.info("便签窗口创建成功")
         except Exception as e:
-            self.logger.error(f"便签窗口创建失败: {e}")
+            self.logger.error("便签窗口创建失败: %s", e)
             print(f"  [WARN] 便签窗口创建失败: {e}")
             self.note_window = None
         
@@ -378,7 +378,7 @@ class DesktopPetApp:
             print("  [OK] 视图管理器创建完成")
             self.logger.info("视图管理器创建成功")
         except Exception as e:
-            self.logger.error(f"视图管理器创建失败: {e}")
+            self.logger.error("视图管理器创建失败: %s", e)
             print(f"  [WARN] 视图管理器创建失败: {e}")
             self.view_manager = None
         
@@ -399,7 +399,7 @@ class DesktopPetApp:
             print("  [OK] 全局快捷键创建完成")
             self.logger.info("全局快捷键创建成功")
         except Exception as e:
-            self.logger.error(f"全局快捷键创建失败: {e}")
+            self.logger.error("全局快捷键创建失败: %s", e)
             print(f"  [WARN] 全局快捷键创建失败: {e}")
             self.global_hotkey = None
         
@@ -413,7 +413,7 @@ class DesktopPetApp:
             print("  [OK] 数据导入导出器创建完成")
             self.logger.info("数据导入导出器创建成功")
         except Exception as e:
-            self.logger.error(f"数据导入导出器创建失败: {e}")
+            self.logger.error("数据导入导出器创建失败: %s", e)
             print(f"  [WARN] 数据导入导出器创建失败: {e}")
             self.data_exporter = None
             self.data_importer = None
@@ -426,7 +426,7 @@ class DesktopPetApp:
             print("  [OK] 重复提醒系统创建完成")
             self.logger.info("重复提醒系统创建成功")
         except Exception as e:
-            self.logger.error(f"重复提醒系统创建失败: {e}")
+            self.logger.error("重复提醒系统创建失败: %s", e)
             print(f"  [WARN] 重复提醒系统创建失败: {e}")
             self.recurring_reminder = None
         
@@ -440,7 +440,7 @@ class DesktopPetApp:
             print("  [OK] 透明任务窗口创建完成")
             self.logger.info("透明任务窗口创建成功")
         except Exception as e:
-            self.logger.error(f"透明任务窗口创建失败: {e}")
+            self.logger.error("透明任务窗口创建失败: %s", e)
             print(f"  [WARN] 透明任务窗口创建失败: {e}")
             self.transparent_task_window = None
         
@@ -451,7 +451,7 @@ class DesktopPetApp:
             print("  [OK] 信号连接完成")
             self.logger.info("信号连接成功")
         except Exception as e:
-            self.logger.error(f"信号连接失败: {e}")
+            self.logger.error("信号连接失败: %s", e)
             print(f"  [ERROR] 信号连接失败: {e}")
         
         # 21. 检查并显示新手引导 [v0.3.0]
@@ -494,7 +494,7 @@ class DesktopPetApp:
                 else:
                     new_y = base_y
                 window.move(new_x, new_y)
-                self.logger.info(f"宠物窗口 {pet['id']} 位置调整为: ({new_x}, {new_y})")
+                self.logger.info("宠物窗口 %s 位置调整为: (%s, %s)", pet['id'], new_x, new_y)
         
         active_id = self.pet_manager.active_pet_id or pets[0]['id']
         self.pet_window = self.pet_windows.get(active_id)
@@ -538,7 +538,7 @@ class DesktopPetApp:
                 f"尺寸={window.width()}x{window.height()}, "
                 f"可见={window.isVisible()}, 最小化={window.isMinimized()}, "
                 f"隐藏={window.isHidden()}, 透明度={window.windowOpacity()}")
-        self.logger.info(f"宠物窗口已创建并显示: {info}")
+        self.logger.info("宠物窗口已创建并显示: %s", info)
         print(f"[主程序] 宠物窗口已创建: {info}")
         return window
 
@@ -740,7 +740,7 @@ class DesktopPetApp:
             else:
                 print("\n[新手引导] 跳过（已完成）")
         except Exception as e:
-            self.logger.warning(f"新手引导显示失败: {e}")
+            self.logger.warning("新手引导显示失败: %s", e)
             print(f"  [WARN] 新手引导显示失败: {e}")
     
     def connect_signals(self):
@@ -891,7 +891,7 @@ class DesktopPetApp:
             palette.exec_()
         except Exception as e:
             print(f"[命令面板] 显示失败: {e}")
-            self.logger.error(f"命令面板显示失败: {e}")
+            self.logger.error("命令面板显示失败: %s", e)
     
     def handle_command(self, command_id: str):
         """处理命令面板命令 [v0.5.0]"""
@@ -913,7 +913,7 @@ class DesktopPetApp:
                 handler()
             except Exception as e:
                 print(f"[命令处理] 执行命令 {command_id} 失败: {e}")
-                self.logger.error(f"执行命令失败: {command_id} - {e}")
+                self.logger.error("执行命令失败: %s - %s", command_id, e)
     
     def export_data(self):
         """导出数据 [v0.5.0]"""
@@ -922,7 +922,7 @@ class DesktopPetApp:
                 self.data_exporter.export_to_json(parent_widget=self.pet_window if self.pet_window else None)
             except Exception as e:
                 print(f"[数据导出] 失败: {e}")
-                self.logger.error(f"数据导出失败: {e}")
+                self.logger.error("数据导出失败: %s", e)
         else:
             QMessageBox.warning(
                 self.pet_window if self.pet_window else None,
@@ -944,7 +944,7 @@ class DesktopPetApp:
                         self.transparent_task_window.load_tasks()
             except Exception as e:
                 print(f"[数据导入] 失败: {e}")
-                self.logger.error(f"数据导入失败: {e}")
+                self.logger.error("数据导入失败: %s", e)
         else:
             QMessageBox.warning(
                 self.pet_window if self.pet_window else None,
@@ -1095,7 +1095,7 @@ class DesktopPetApp:
                         self.reminder_system.stop()
                         self.logger.info("提醒系统已停止")
                     except Exception as e:
-                        self.logger.error(f"停止提醒系统失败: {e}")
+                        self.logger.error("停止提醒系统失败: %s", e)
                 
                 # 关闭数据库
                 if self.database:
@@ -1103,13 +1103,13 @@ class DesktopPetApp:
                         self.database.close()
                         self.logger.info("数据库已关闭")
                     except Exception as e:
-                        self.logger.error(f"关闭数据库失败: {e}")
+                        self.logger.error("关闭数据库失败: %s", e)
                 
                 if self.pet_manager:
                     try:
                         self.pet_manager.save_all_positions()
                     except Exception as e:
-                        self.logger.error(f"保存宠物位置失败: {e}")
+                        self.logger.error("保存宠物位置失败: %s", e)
                 
                 print("[系统] 再见！")
                 self.logger.info("应用正常退出")
@@ -1123,7 +1123,7 @@ class DesktopPetApp:
         """任务完成回调"""
         try:
             print(f"[应用] 任务 {task_id} 已完成")
-            self.logger.info(f"任务完成: ID={task_id}")
+            self.logger.info("任务完成: ID=%s", task_id)
             
             # 播放兴奋动画
             if self.pet_window:
@@ -1148,21 +1148,21 @@ class DesktopPetApp:
                 
                 print("  [奖励] +5经验，获得道具奖励")
         except Exception as e:
-            self.logger.exception(f"处理任务完成失败: {task_id}")
+            self.logger.exception("处理任务完成失败: %s", task_id)
     
     def on_task_snoozed(self, task_id, minutes):
         """任务延后回调"""
         try:
             print(f"[应用] 任务 {task_id} 延后 {minutes} 分钟")
-            self.logger.info(f"任务延后: ID={task_id}, 延后{minutes}分钟")
+            self.logger.info("任务延后: ID=%s, 延后%s分钟", task_id, minutes)
         except Exception as e:
-            self.logger.exception(f"处理任务延后失败: {task_id}")
+            self.logger.exception("处理任务延后失败: %s", task_id)
     
     def on_task_added(self, task_data):
         """任务添加回调"""
         try:
             print(f"[应用] 新增任务: {task_data.get('title')}")
-            self.logger.info(f"新增任务: {task_data.get('title')}")
+            self.logger.info("新增任务: %s", task_data.get('title'))
             # 显示托盘通知
             if self.tray_icon:
                 self.tray_icon.show_notification(
@@ -1176,9 +1176,9 @@ class DesktopPetApp:
         """任务删除回调"""
         try:
             print(f"[应用] 删除任务: {task_id}")
-            self.logger.info(f"删除任务: ID={task_id}")
+            self.logger.info("删除任务: ID=%s", task_id)
         except Exception as e:
-            self.logger.exception(f"处理任务删除失败: {task_id}")
+            self.logger.exception("处理任务删除失败: %s", task_id)
     
     def on_settings_changed(self, settings):
         """设置改变回调"""
@@ -1207,7 +1207,7 @@ class DesktopPetApp:
             theme = theme_map.get(theme_name, 'light')
             
             print(f"[应用] 切换主题: {theme_name} -> {theme}")
-            self.logger.info(f"主题切换: {theme}")
+            self.logger.info("主题切换: %s", theme)
             
             # 应用到所有窗口
             if self.todo_window and hasattr(self.todo_window, 'apply_theme'):
@@ -1231,7 +1231,7 @@ class DesktopPetApp:
         """
         try:
             print(f"[应用] 收到拖放图片: {image_path}")
-            self.logger.info(f"图片拖放: {image_path}")
+            self.logger.info("图片拖放: %s", image_path)
             
             # 使用图片识别器处理
             if self.image_recognizer:
@@ -1262,7 +1262,7 @@ class DesktopPetApp:
             tasks = result.get('tasks', [])
             
             print(f"[应用] 图片识别完成: {summary}")
-            self.logger.info(f"图片识别完成，识别到{len(tasks)}个任务")
+            self.logger.info("图片识别完成，识别到%s个任务", len(tasks))
             
             if not tasks:
                 QMessageBox.information(
@@ -1324,7 +1324,7 @@ class DesktopPetApp:
                 )
                 
                 print(f"[应用] 已添加 {added_count} 个任务")
-                self.logger.info(f"从图片添加了{added_count}个任务")
+                self.logger.info("从图片添加了%s个任务", added_count)
         except Exception as e:
             self.logger.exception("生成任务失败")
     
@@ -1352,7 +1352,7 @@ class DesktopPetApp:
             from src.pet_inventory import ItemManager
             
             print(f"[应用] 宠物升级: {old_level} → {new_level}")
-            self.logger.info(f"宠物升级到{new_level}级")
+            self.logger.info("宠物升级到%s级", new_level)
             
             # 显示升级提示
             QMessageBox.information(
@@ -1382,7 +1382,7 @@ class DesktopPetApp:
             stage_name = stage_names.get(stage, '未知')
             
             print(f"[应用] 宠物进化: {stage_name}")
-            self.logger.info(f"宠物进化到{stage_name}")
+            self.logger.info("宠物进化到%s", stage_name)
             
             QMessageBox.information(
                 self.pet_window,
@@ -1401,7 +1401,7 @@ class DesktopPetApp:
         """
         try:
             print(f"[应用] 解锁成就: {achievement_name}")
-            self.logger.info(f"解锁成就: {achievement_name}")
+            self.logger.info("解锁成就: %s", achievement_name)
             
             # 可以在这里显示成就解锁动画或提示
         except Exception as e:
@@ -1417,7 +1417,7 @@ class DesktopPetApp:
         """
         try:
             print(f"[应用] 番茄钟完成: {session_type}, {duration}秒")
-            self.logger.info(f"番茄钟会话完成: {session_type}")
+            self.logger.info("番茄钟会话完成: %s", session_type)
             
             # 播放伸懒腰动画（休息完成）
             if session_type == 'break' and self.pet_window:
@@ -1449,7 +1449,7 @@ class DesktopPetApp:
                        f"尺寸={self.pet_window.width()}x{self.pet_window.height()}, "
                        f"可见={self.pet_window.isVisible()}, 最小化={self.pet_window.isMinimized()}, "
                        f"隐藏={self.pet_window.isHidden()}, 透明度={self.pet_window.windowOpacity()}")
-                self.logger.info(f"宠物窗口已显示: {info}")
+                self.logger.info("宠物窗口已显示: %s", info)
                 print(f"[主程序.run] 宠物窗口已显示: {info}")
             
             # 显示所有宠物窗口
@@ -1464,7 +1464,7 @@ class DesktopPetApp:
                            f"尺寸={window.width()}x{window.height()}, "
                            f"可见={window.isVisible()}, 最小化={window.isMinimized()}, "
                            f"隐藏={window.isHidden()}, 透明度={window.windowOpacity()}")
-                    self.logger.info(f"宠物窗口 {pet_id} 已显示: {info}")
+                    self.logger.info("宠物窗口 %s 已显示: %s", pet_id, info)
                     print(f"[主程序.run] 宠物窗口 {pet_id} 已显示: {info}")
             
             # 显示启动通知
@@ -1531,7 +1531,7 @@ def main():
         # 启动事件循环
         logger.info("进入应用事件循环")
         exit_code = app.exec_()
-        logger.info(f"应用退出，退出码: {exit_code}")
+        logger.info("应用退出，退出码: %s", exit_code)
         sys.exit(exit_code)
         
     except KeyboardInterrupt:
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+数据库模块冒烟测试：在 data/test_tasks.db 上执行增删改查并打印结果。
+
+用法::
+
+    python scripts/smoke_database.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import Database
+
+
+def main():
+    print("=" * 60)
+    print("数据库模块测试")
+    print("=" * 60)
+    
+    # 创建数据库实例
+    db = Database("data/test_tasks.db")
+    
+    # 测试添加任务
+    task_id1 = db.add_task(
+        title="完成项目文档",
+        description="编写桌面灵宠的开发文档",
+        due_date="2025-10-15 18:00:00",
+        priority=3,
+        category="work"
+    )
+    
+    task_id2 = db.add_task(
+        title="学习PyQt5",
+        description="学习PyQt5的窗口和动画功能",
+        due_date="2025-10-20 12:00:00",
+        priority=2,
+        category="study"
+    )
+    
+    # 测试获取所有任务
+    print("\n所有任务：")
+    tasks = db.get_all_tasks()
+    for task in tasks:
+        print(f"  [{task['id']}] {task['title']} - 优先级:{task['priority']}")
+    
+    # 测试更新任务
+    print("\n更新任务...")
+    db.update_task(task_id1, status="completed")
+    
+    # 测试统计
+    print("\n任务统计：")
+    stats = db.get_statistics()
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
+    
+    # 测试搜索
+    print("\n搜索'PyQt'：")
+    results = db.search_tasks("PyQt")
+    for task in results:
+        print(f"  [{task['id']}] {task['title']}")
+    
+    # 关闭数据库
+    db.close()
+    
+    print("\n" + "=" * 60)
+    print("测试完成！")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
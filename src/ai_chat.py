@@ -170,10 +170,10 @@ class AIChatManager(QObject):
         if not self.database or not self.pet_id:
             return
         
-        history = self.database.get_chat_history(self.pet_id, limit=self.max_history)
+        history = self.database.get_chat_records(self.pet_id, limit=self.max_history)
         
         self.conversation_history = [
-            {'role': msg['role'], 'content': msg['message']}
+            {'role': msg.role, 'content': msg.message}
             for msg in history
         ]
         
@@ -200,7 +200,7 @@ class AIChatManager(QObject):
         
         # 保存到数据库
         if self.database and self.pet_id:
-            self.database.add_chat_message(self.pet_id, 'user', message)
+            self.database.add_chat_message_async(self.pet_id, 'user', message)
         
         # 发送信号
         self.message_received.emit('user', message)
@@ -242,7 +242,7 @@ class AIChatManager(QObject):
         
         # 保存到数据库
         if self.database and self.pet_id:
-            self.database.add_chat_message(self.pet_id, 'assistant', response)
+            self.database.add_chat_message_async(self.pet_id, 'assistant', response)
         
         # 发送信号
         self.message_received.emit('assistant', response)
@@ -51,12 +51,9 @@ class CalendarView(QWidget):
         if not self.database:
             return
         
-        # 获取所有任务
-        tasks = self.database.get_all_tasks()
-        
-        # 标记有任务的日期
+        # 标记有任务的日期（逐条读取任务）
         task_dates = {}
-        for task in tasks:
+        for task in self.database.get_all_tasks_iter():
             if task.get('due_date'):
                 try:
                     date_str = task['due_date'][:10]  # 只取日期部分
@@ -80,9 +77,8 @@ class CalendarView(QWidget):
         date_str = date.toString("yyyy-MM-dd")
         
         # 获取该日期的任务
-        tasks = self.database.get_all_tasks()
         day_tasks = [
-            t for t in tasks 
+            t for t in self.database.get_all_tasks_iter()
             if t.get('due_date') and t['due_date'].startswith(date_str)
         ]
         
@@ -120,10 +120,7 @@ class DataExporter:
                 if not file_path:
                     return False
             
-            # 获取所有任务
-            tasks = self.database.get_all_tasks()
-            
-            # 写入CSV
+            # 写入CSV（任务逐条读取，边读边写）
             with open(file_path, 'w', newline='', encoding='utf-8-sig') as f:
                 writer = csv.writer(f)
                 
@@ -134,7 +131,7 @@ class DataExporter:
                 ])
                 
                 # 数据行
-                for task in tasks:
+                for task in self.database.get_all_tasks_iter():
                     writer.writerow([
                         task.get('id', ''),
                         task.get('title', ''),
@@ -188,15 +185,12 @@ class DataExporter:
                 if not file_path:
                     return False
             
-            # 获取所有便签
-            notes = self.database.get_all_notes()
-            
-            # 写入TXT
+            # 写入TXT（便签逐条读取，边读边写）
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(f"便签导出 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write("=" * 60 + "\n\n")
                 
-                for note in notes:
+                for note in self.database.get_all_notes_iter():
                     f.write(f"标题: {note.get('title', '无标题')}\n")
                     f.write(f"创建时间: {note.get('created_at', '')}\n")
                     f.write(f"更新时间: {note.get('updated_at', '')}\n")
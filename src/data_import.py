@@ -85,39 +85,43 @@ class DataImporter:
             
             imported_count = 0
             
-            # 导入标签
+            # 导入标签（一次事务提交）
             if 'tags' in data:
-                for tag in data['tags']:
-                    self.database.add_tag(tag.get('name', ''), tag.get('color', '#4CAF50'))
-                    imported_count += 1
-                    progress.setValue(int(imported_count / len(data.get('tags', [])) * 30))
+                with self.database.transaction():
+                    for tag in data['tags']:
+                        self.database.add_tag(tag.get('name', ''), tag.get('color', '#4CAF50'))
+                        imported_count += 1
+                        progress.setValue(int(imported_count / len(data.get('tags', [])) * 30))
             
-            # 导入任务
+            # 导入任务（批量写入，一次提交）
             if 'tasks' in data:
-                for task in data['tasks']:
-                    task_id = self.database.add_task(
-                        title=task.get('title', ''),
-                        description=task.get('description', ''),
-                        due_date=task.get('due_date'),
-                        priority=task.get('priority', 1),
-                        category=task.get('category', 'general'),
-                        remind_time=task.get('remind_time')
-                    )
-                    imported_count += 1
-                    progress.setValue(30 + int(imported_count / len(data.get('tasks', [])) * 50))
-            
-            # 导入便签
+                task_ids = self.database.add_tasks_bulk([
+                    {
+                        'title': task.get('title', ''),
+                        'description': task.get('description', ''),
+                        'due_date': task.get('due_date'),
+                        'priority': task.get('priority', 1),
+                        'category': task.get('category', 'general'),
+                        'remind_time': task.get('remind_time'),
+                    }
+                    for task in data['tasks']
+                ])
+                imported_count += len(task_ids)
+                progress.setValue(80)
+            
+            # 导入便签（一次事务提交）
             if 'notes' in data:
-                for note in data['notes']:
-                    self.database.add_note(
-                        title=note.get('title', ''),
-                        content=note.get('content', ''),
-                        color=note.get('color', '#FFFFFF'),
-                        is_pinned=note.get('is_pinned', False),
-                        is_locked=note.get('is_locked', False)
-                    )
-                    imported_count += 1
-                    progress.setValue(80 + int(imported_count / len(data.get('notes', [])) * 20))
+                with self.database.transaction():
+                    for note in data['notes']:
+                        self.database.add_note(
+                            title=note.get('title', ''),
+                            content=note.get('content', ''),
+                            color=note.get('color', '#FFFFFF'),
+                            is_pinned=note.get('is_pinned', False),
+                            is_locked=note.get('is_locked', False)
+                        )
+                        imported_count += 1
+                        progress.setValue(80 + int(imported_count / len(data.get('notes', [])) * 20))
             
             progress.setValue(100)
             progress.close()
@@ -183,8 +187,8 @@ class DataImporter:
             if reply != QMessageBox.Yes:
                 return False
             
-            # 导入任务
-            imported_count = 0
+            # 导入任务（批量写入，一次提交）
+            rows = []
             for task in tasks:
                 try:
                     priority = int(task.get('优先级', 1))
@@ -193,18 +197,15 @@ class DataImporter:
                 except:
                     priority = 1
                 
-                task_id = self.database.add_task(
-                    title=task.get('标题', ''),
-                    description=task.get('描述', ''),
-                    due_date=task.get('截止日期'),
-                    priority=priority,
-                    category=task.get('分类', 'general')
-                )
-                
-                if task_id > 0:
-                    imported_count += 1
-            else:
-                pass
+                rows.append({
+                    'title': task.get('标题', ''),
+                    'description': task.get('描述', ''),
+                    'due_date': task.get('截止日期'),
+                    'priority': priority,
+                    'category': task.get('分类', 'general'),
+                })
+            
+            imported_count = len(self.database.add_tasks_bulk(rows))
             
             QMessageBox.information(
                 parent_widget, "导入成功", 
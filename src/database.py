@@ -7,9 +7,722 @@ Database Module - 负责待办事项的数据存储和管理
 
 import sqlite3
 import os
-import shutil
+import threading
+import functools
+import logging
+import queue
+import time
+import zlib
+from contextlib import contextmanager
+from concurrent.futures import Future
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from itertools import repeat
+from pathlib import Path
+from typing import List, Dict, Optional, Iterator, Iterable
+
+
+# 数据库日志器（挂在应用日志器 DesktopPet 下，级别由应用日志配置决定）
+# 调试日志使用 %s 参数，级别未开启时在 isEnabledFor 处即被丢弃，不做任何格式化
+logger = logging.getLogger("DesktopPet.Database")
+
+# INSERT/UPDATE ... RETURNING 需要 SQLite 3.35+；旧版本（部分 Python 3.8 发行包自带）
+# 改为读取 lastrowid 或再查询一次
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
+# SQLite端生成的本地时间字符串（与 datetime.now().strftime("%Y-%m-%d %H:%M:%S") 格式一致）
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')"
+
+# 布尔值统一按 0/1 整数写入（is_pinned、is_locked、is_default 等标志列），
+# 调用方可以直接传 bool，查询条件与存储值类型一致
+sqlite3.register_adapter(bool, int)
+
+# 每个连接建立后执行一次的PRAGMA：WAL日志 + NORMAL同步减少每次提交的fsync，
+# 读写互不阻塞；busy_timeout 让后台写线程与主连接竞争写锁时等待而不是直接报错。
+# foreign_keys 需要每个连接单独开启，删除任务/标签/宠物时由SQLite按外键级联清理关联行。
+# 运行期间由 wal_autocheckpoint 在WAL超过1000页后的提交时做 PASSIVE 检查点（不等待读者），
+# 只在 close() 时做 TRUNCATE 检查点。
+# 只读连接只需要缓存/临时表/mmap和等待锁的设置，与写入相关的PRAGMA不重复执行。
+_WAL_PRAGMA = "PRAGMA journal_mode=WAL;"
+_READER_PRAGMAS = """
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=268435456;
+"""
+_CONNECTION_PRAGMAS = _READER_PRAGMAS + """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA foreign_keys=ON;
+    PRAGMA wal_autocheckpoint=1000;
+"""
+
+# 后台写线程一次攒批的最长等待时间（秒）
+WRITE_BATCH_WINDOW = 0.01
+
+# SQLite rowid 的最大值，keyset 分页未指定起点时作为上界
+_MAX_ROWID = 2 ** 63 - 1
+
+# 流式读取时每批从游标取出的行数
+FETCH_CHUNK_SIZE = 256
+
+
+# 单条SQL中绑定参数数量的上限（兼容旧版SQLite默认的999）
+MAX_SQL_VARIABLES = 999
+
+# 每个连接缓存的预编译语句数量（sqlite3默认128）
+CACHED_STATEMENTS = 256
+
+# 长文本（对话消息、图片识别结果）超过该字节数时压缩存储
+COMPRESS_THRESHOLD = 512
+_ZLIB_HEADER = b"\x01"  # 压缩值的首字节，标记编码方式
+
+# 高频查询的SQL文本（sqlite3按SQL字符串缓存预编译语句，固定文本保证每次命中缓存）
+_SQL_GET_BACKUP_RECORDS = "SELECT * FROM backup_records ORDER BY backup_time DESC LIMIT ?"
+_SQL_GET_REMINDER_TEMPLATES = "SELECT * FROM reminder_templates ORDER BY usage_count DESC, created_at DESC"
+_SQL_GET_VIEW_SETTINGS = "SELECT * FROM view_settings WHERE view_type = ? AND user_id = ?"
+_SQL_GET_TASK = "SELECT * FROM tasks WHERE id = ?"
+_SQL_DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+_SQL_ADD_TASK = f"""
+    INSERT INTO tasks (title, description, due_date, priority, 
+                     category, remind_time, repeat_type, 
+                     created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, {_NOW_SQL}, {_NOW_SQL})
+"""
+_SQL_ADD_TASK_RETURNING = _SQL_ADD_TASK + "RETURNING id"
+_SQL_ADD_POMODORO_SESSION = f"""
+    INSERT INTO pomodoro_sessions 
+    (task_id, start_time, duration, session_type, created_at)
+    VALUES (?, {_NOW_SQL}, ?, ?, {_NOW_SQL})
+"""
+_SQL_ADD_POMODORO_SESSION_RETURNING = _SQL_ADD_POMODORO_SESSION + "RETURNING id"
+_SQL_COMPLETE_POMODORO_SESSION = f"UPDATE pomodoro_sessions SET completed = 1, end_time = {_NOW_SQL} WHERE id = ?"
+_SQL_ADD_EXPERIENCE = "UPDATE pets SET experience = experience + ? WHERE id = ?"
+
+
+def _with_returning(sql: str, column: str = "id") -> str:
+    """SQLite支持时在语句末尾追加 RETURNING 子句"""
+    return f"{sql} RETURNING {column}" if _HAS_RETURNING else sql
+
+
+def _inserted_id(cursor) -> int:
+    """读取单行INSERT的新行ID（RETURNING 结果行，或旧版SQLite的 lastrowid）"""
+    return cursor.fetchone()[0] if _HAS_RETURNING else cursor.lastrowid
+
+
+@functools.lru_cache(maxsize=64)
+def _insert_sql(table: str, columns: tuple, now_columns: tuple = (),
+                returning: bool = False) -> str:
+    """
+    生成插入一行的INSERT语句（按列组合缓存）
+    
+    Args:
+        table: 表名
+        columns: 以 ? 绑定参数写入的列名
+        now_columns: 由SQLite写入当前本地时间的列名
+        returning: 是否追加 RETURNING id（单行插入用，executemany 不需要）
+    """
+    names = ", ".join(columns + now_columns)
+    values = ", ".join(["?"] * len(columns) + [_NOW_SQL] * len(now_columns))
+    sql = f"INSERT INTO {table} ({names}) VALUES ({values})"
+    return sql + " RETURNING id" if returning else sql
+
+
+# 对话和图片识别记录的固定写入语句（异步/批量写入复用同一字符串，命中语句缓存）
+_SQL_ADD_CHAT_MESSAGE = _insert_sql(
+    "chat_history", ("pet_id", "role", "message", "tokens_used"), ("timestamp",))
+_SQL_ADD_IMAGE_TASK = _insert_sql(
+    "image_tasks", ("image_path", "image_hash", "recognition_result", "task_id"), ("created_at",))
+
+# 最近N条对话：全部宠物 / 指定宠物（该宠物与无宠物两部分各沿索引取N条再合并）
+_SQL_RECENT_CHAT = """
+    SELECT * FROM chat_history 
+    WHERE id < :before_id
+    ORDER BY id DESC
+    LIMIT :limit
+"""
+_SQL_RECENT_PET_CHAT = """
+    SELECT * FROM (
+        SELECT * FROM chat_history 
+        WHERE pet_id = :pet_id AND id < :before_id
+        ORDER BY id DESC
+        LIMIT :limit
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT * FROM chat_history 
+        WHERE pet_id IS NULL AND id < :before_id
+        ORDER BY id DESC
+        LIMIT :limit
+    )
+    ORDER BY id DESC
+    LIMIT :limit
+"""
+
+
+@functools.lru_cache(maxsize=8)
+def _chat_history_sql(columns: str, by_pet: bool) -> str:
+    """生成按正序返回最近N条对话的查询语句（按列和是否筛选宠物缓存）"""
+    recent = _SQL_RECENT_PET_CHAT if by_pet else _SQL_RECENT_CHAT
+    return f"SELECT {columns} FROM ({recent}) ORDER BY id ASC"
+
+
+# 通过 **kwargs 动态更新时允许出现的列（列名会拼接进SQL，必须先校验）
+_UPDATABLE_COLUMNS = {
+    "tasks": frozenset({
+        "title", "description", "due_date", "priority", "status", "category",
+        "remind_time", "repeat_type", "created_at", "updated_at", "completed_date",
+        "pomodoro_count", "notes", "template_id", "repeat_rule", "reminder_times",
+    }),
+    "pets": frozenset({
+        "name", "pet_type", "level", "experience", "hunger", "happiness", "health",
+        "energy", "is_active", "position_x", "position_y", "skin", "character_pack",
+        "pack_overrides", "evolution_stage", "created_at", "last_fed_at", "last_played_at",
+    }),
+    "notes": frozenset({
+        "title", "content", "category_id", "is_pinned", "is_locked", "color",
+        "created_at", "updated_at",
+    }),
+    "subtasks": frozenset({
+        "task_id", "title", "description", "status", "priority", "sort_order",
+        "created_at", "completed_at",
+    }),
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _update_sql(table: str, columns: tuple, extra_assignments: tuple = ()) -> str:
+    """
+    生成按ID更新指定列的UPDATE语句（按列组合缓存，重复调用直接复用同一字符串）
+    
+    Args:
+        table: 表名
+        columns: 以 ? 绑定参数更新的列名
+        extra_assignments: 额外的赋值表达式（如由SQLite生成的更新时间）
+    
+    Raises:
+        ValueError: 列名不在 _UPDATABLE_COLUMNS 白名单中
+    """
+    unknown = set(columns) - _UPDATABLE_COLUMNS[table]
+    if unknown:
+        raise ValueError(f"{table} 表不允许更新的列: {', '.join(sorted(unknown))}")
+    
+    assignments = [f"{column} = ?" for column in columns] + list(extra_assignments)
+    return f"UPDATE {table} SET {', '.join(assignments)} WHERE id = ?"
+
+
+# 数据库表结构（整体作为一个脚本执行）
+_SCHEMA_SQL = f"""
+-- 创建任务表
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    due_date TEXT,
+    priority INTEGER DEFAULT 1,
+    status TEXT DEFAULT 'pending',
+    category TEXT DEFAULT 'general',
+    remind_time TEXT,
+    repeat_type TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+-- 创建配置表
+CREATE TABLE IF NOT EXISTS config (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- 创建标签表 [v0.3.0]
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    color TEXT DEFAULT '#4CAF50',
+    created_at TEXT NOT NULL
+);
+
+-- 创建任务标签关联表 [v0.3.0]
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY (task_id, tag_id),
+    FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+    FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+);
+
+-- 创建番茄钟会话表 [v0.4.0]
+CREATE TABLE IF NOT EXISTS pomodoro_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    duration INTEGER NOT NULL,
+    completed BOOLEAN DEFAULT 0,
+    session_type TEXT DEFAULT 'work',
+    created_at TEXT NOT NULL,
+    FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE SET NULL
+);
+
+-- 创建宠物数据表 [v0.4.0]
+CREATE TABLE IF NOT EXISTS pets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    pet_type TEXT DEFAULT 'cat',
+    level INTEGER DEFAULT 1,
+    experience INTEGER DEFAULT 0,
+    hunger INTEGER DEFAULT 100,
+    happiness INTEGER DEFAULT 100,
+    health INTEGER DEFAULT 100,
+    energy INTEGER DEFAULT 100,
+    is_active BOOLEAN DEFAULT 1,
+    position_x INTEGER DEFAULT 100,
+    position_y INTEGER DEFAULT 100,
+    skin TEXT DEFAULT 'default',
+    character_pack TEXT DEFAULT 'default',
+    pack_overrides TEXT,
+    evolution_stage INTEGER DEFAULT 1,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    last_fed_at TEXT,
+    last_played_at TEXT
+);
+
+-- 创建成就表 [v0.4.0]
+CREATE TABLE IF NOT EXISTS achievements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pet_id INTEGER NOT NULL,
+    achievement_type TEXT NOT NULL,
+    achievement_name TEXT NOT NULL,
+    description TEXT,
+    icon TEXT,
+    unlocked_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE CASCADE
+);
+
+-- 创建道具背包表 [v0.4.0]
+CREATE TABLE IF NOT EXISTS inventory (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pet_id INTEGER NOT NULL,
+    item_name TEXT NOT NULL,
+    item_type TEXT NOT NULL,
+    item_effect TEXT,
+    quantity INTEGER DEFAULT 1,
+    acquired_at TEXT NOT NULL,
+    FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE CASCADE
+);
+
+-- 创建AI对话历史表 [v0.4.0]
+CREATE TABLE IF NOT EXISTS chat_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pet_id INTEGER,
+    role TEXT NOT NULL,
+    message TEXT NOT NULL,
+    timestamp TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    tokens_used INTEGER DEFAULT 0,
+    FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE SET NULL
+);
+
+-- 创建图片识别任务表 [v0.4.0]
+CREATE TABLE IF NOT EXISTS image_tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    image_path TEXT NOT NULL,
+    image_hash TEXT,
+    recognition_result TEXT,
+    task_id INTEGER,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE SET NULL
+);
+
+-- 创建便签表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT,
+    category_id INTEGER,
+    is_pinned BOOLEAN DEFAULT 0,
+    is_locked BOOLEAN DEFAULT 0,
+    color TEXT DEFAULT '#FFFFFF',
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    updated_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    FOREIGN KEY (category_id) REFERENCES note_categories(id) ON DELETE SET NULL
+);
+
+-- 创建便签分类表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS note_categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    color TEXT DEFAULT '#4CAF50',
+    icon TEXT,
+    parent_id INTEGER,
+    sort_order INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    FOREIGN KEY (parent_id) REFERENCES note_categories(id) ON DELETE CASCADE
+);
+
+-- 创建附件表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS attachments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity_type TEXT NOT NULL,
+    entity_id INTEGER NOT NULL,
+    file_name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    file_size INTEGER,
+    file_type TEXT,
+    thumbnail_path TEXT,
+    upload_time TEXT NOT NULL DEFAULT ({_NOW_SQL})
+);
+
+-- 创建子任务表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS subtasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'pending',
+    priority INTEGER DEFAULT 1,
+    sort_order INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    completed_at TEXT,
+    FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE
+);
+
+-- 创建任务依赖表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    depends_on_task_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+    FOREIGN KEY (depends_on_task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+    UNIQUE(task_id, depends_on_task_id)
+);
+
+-- 创建任务模板表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS task_templates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    category TEXT,
+    priority INTEGER DEFAULT 1,
+    template_data TEXT,
+    usage_count INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    updated_at TEXT NOT NULL DEFAULT ({_NOW_SQL})
+);
+
+-- 创建提醒历史表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS reminder_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER,
+    reminder_time TEXT NOT NULL,
+    triggered_time TEXT,
+    status TEXT DEFAULT 'pending',
+    user_action TEXT,
+    snooze_count INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE SET NULL
+);
+
+-- 创建提醒模板表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS reminder_templates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    remind_before_minutes INTEGER,
+    repeat_type TEXT,
+    repeat_rule TEXT,
+    usage_count INTEGER DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL})
+);
+
+-- 创建视图设置表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS view_settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    view_type TEXT NOT NULL,
+    user_id TEXT DEFAULT 'default',
+    settings_data TEXT NOT NULL,
+    is_default BOOLEAN DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    updated_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    UNIQUE(view_type, user_id)
+);
+
+-- 创建备份记录表 [v0.5.0]
+CREATE TABLE IF NOT EXISTS backup_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    backup_file_path TEXT NOT NULL,
+    backup_type TEXT DEFAULT 'manual',
+    file_size INTEGER,
+    record_count INTEGER,
+    backup_time TEXT NOT NULL DEFAULT ({_NOW_SQL}),
+    description TEXT
+);
+
+-- 索引 [v0.5.0]
+CREATE INDEX IF NOT EXISTS idx_notes_category ON notes(category_id);
+CREATE INDEX IF NOT EXISTS idx_notes_created ON notes(created_at);
+CREATE INDEX IF NOT EXISTS idx_notes_pinned ON notes(is_pinned);
+CREATE INDEX IF NOT EXISTS idx_attachments_entity ON attachments(entity_type, entity_id);
+CREATE INDEX IF NOT EXISTS idx_subtasks_task ON subtasks(task_id);
+CREATE INDEX IF NOT EXISTS idx_subtasks_status ON subtasks(status);
+CREATE INDEX IF NOT EXISTS idx_dependencies_task ON task_dependencies(task_id);
+CREATE INDEX IF NOT EXISTS idx_dependencies_depends ON task_dependencies(depends_on_task_id);
+-- (task_id, reminder_time) 复合索引同时覆盖按任务筛选和按时间倒序取前N条
+DROP INDEX IF EXISTS idx_reminder_history_task;
+CREATE INDEX IF NOT EXISTS idx_reminder_history_task_time ON reminder_history(task_id, reminder_time DESC);
+CREATE INDEX IF NOT EXISTS idx_reminder_history_time ON reminder_history(reminder_time);
+CREATE INDEX IF NOT EXISTS idx_pomodoro_created ON pomodoro_sessions(created_at);
+CREATE INDEX IF NOT EXISTS idx_backup_records_time ON backup_records(backup_time DESC);
+CREATE INDEX IF NOT EXISTS idx_reminder_templates_usage ON reminder_templates(usage_count DESC, created_at DESC);
+
+-- 任务、标签、宠物相关的高频查询
+CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks(status, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_remind ON tasks(status, remind_time) WHERE remind_time IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks(due_date);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag_id, task_id);
+-- 对话历史按宠物筛选后沿 id 倒序翻页
+CREATE INDEX IF NOT EXISTS idx_chat_pet_id ON chat_history(pet_id, id DESC);
+-- 按图片哈希查找已有的识别结果
+CREATE INDEX IF NOT EXISTS idx_image_hash ON image_tasks(image_hash);
+"""
+
+# 任务全文索引（外部内容表，由触发器与 tasks 保持同步），与主表结构分开创建：
+# SQLite未编译FTS5或低于3.34（没有 trigram 分词）时建表失败，只影响搜索
+_FTS_SCHEMA_SQL = """
+-- trigram 分词支持中文等无空格文本的子串匹配
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+    title, description,
+    content='tasks', content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO tasks_fts(rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+"""
+
+# 表结构版本（PRAGMA user_version），用于只执行一次迁移
+SCHEMA_VERSION = 4
+
+# 旧数据库的结构迁移，按版本分组（低于当前 user_version 的版本依次执行）
+_MIGRATIONS = {
+    1: [
+        # 宠物表新字段
+        "ALTER TABLE pets ADD COLUMN character_pack TEXT DEFAULT 'default'",
+        "ALTER TABLE pets ADD COLUMN pack_overrides TEXT",
+        # 任务表新字段 [v0.4.0]
+        "ALTER TABLE tasks ADD COLUMN completed_date TEXT",
+        "ALTER TABLE tasks ADD COLUMN pomodoro_count INTEGER DEFAULT 0",
+        # 任务表新字段 [v0.5.0]
+        "ALTER TABLE tasks ADD COLUMN notes TEXT",
+        "ALTER TABLE tasks ADD COLUMN template_id INTEGER",
+        "ALTER TABLE tasks ADD COLUMN repeat_rule TEXT",
+        "ALTER TABLE tasks ADD COLUMN reminder_times TEXT",
+    ],
+    2: [
+        # 背包同名道具合并为一行（数量累加到最早的一行），之后加唯一约束供 UPSERT 使用
+        """UPDATE inventory SET quantity = (
+               SELECT SUM(i2.quantity) FROM inventory i2
+               WHERE i2.pet_id = inventory.pet_id AND i2.item_name = inventory.item_name)
+           WHERE id IN (SELECT MIN(id) FROM inventory GROUP BY pet_id, item_name HAVING COUNT(*) > 1)""",
+        """DELETE FROM inventory WHERE id NOT IN (
+               SELECT MIN(id) FROM inventory GROUP BY pet_id, item_name)""",
+        "DROP INDEX IF EXISTS idx_inventory_pet_item",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_unique ON inventory(pet_id, item_name)",
+        # 重复解锁的成就只保留最早的一条
+        """DELETE FROM achievements WHERE id NOT IN (
+               SELECT MIN(id) FROM achievements GROUP BY pet_id, achievement_name)""",
+        "DROP INDEX IF EXISTS idx_achievements_pet_name",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_achievements_unique ON achievements(pet_id, achievement_name)",
+    ],
+    3: [
+        # 为已有任务建立全文索引
+        "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+    ],
+    4: [
+        # 旧版 task_tags 的外键误写为 task_id -> tags(id)：按正确定义重建，只保留两端都存在的关联
+        """CREATE TABLE task_tags_new (
+               task_id INTEGER NOT NULL,
+               tag_id INTEGER NOT NULL,
+               PRIMARY KEY (task_id, tag_id),
+               FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+               FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+           )""",
+        """INSERT INTO task_tags_new (task_id, tag_id)
+           SELECT task_id, tag_id FROM task_tags
+           WHERE task_id IN (SELECT id FROM tasks) AND tag_id IN (SELECT id FROM tags)""",
+        "DROP TABLE task_tags",
+        "ALTER TABLE task_tags_new RENAME TO task_tags",
+        "CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags(tag_id, task_id)",
+        # 外键未开启期间留下的孤立行：按各外键的 ON DELETE 动作补做清理
+        "DELETE FROM subtasks WHERE task_id NOT IN (SELECT id FROM tasks)",
+        """DELETE FROM task_dependencies WHERE task_id NOT IN (SELECT id FROM tasks)
+               OR depends_on_task_id NOT IN (SELECT id FROM tasks)""",
+        "UPDATE pomodoro_sessions SET task_id = NULL WHERE task_id NOT IN (SELECT id FROM tasks)",
+        "UPDATE image_tasks SET task_id = NULL WHERE task_id NOT IN (SELECT id FROM tasks)",
+        "UPDATE reminder_history SET task_id = NULL WHERE task_id NOT IN (SELECT id FROM tasks)",
+        "DELETE FROM achievements WHERE pet_id NOT IN (SELECT id FROM pets)",
+        "DELETE FROM inventory WHERE pet_id NOT IN (SELECT id FROM pets)",
+        "UPDATE chat_history SET pet_id = NULL WHERE pet_id NOT IN (SELECT id FROM pets)",
+        "UPDATE notes SET category_id = NULL WHERE category_id NOT IN (SELECT id FROM note_categories)",
+        """DELETE FROM note_categories WHERE parent_id IS NOT NULL
+               AND parent_id NOT IN (SELECT id FROM note_categories)""",
+    ],
+}
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    """将列表按固定大小切分（用于拆分 IN (...) 查询的参数）"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _pack_text(text: Optional[str]):
+    """
+    长文本写入前压缩
+    
+    超过 COMPRESS_THRESHOLD 且压缩后确实更小时，以 首字节标记 + zlib 数据 的 BLOB 存入原 TEXT 列
+    （SQLite 不会转换 BLOB 的存储类型）；短文本和无法压缩的文本原样保存。
+    """
+    if text is None:
+        return None
+    data = text.encode("utf-8")
+    if len(data) <= COMPRESS_THRESHOLD:
+        return text
+    packed = _ZLIB_HEADER + zlib.compress(data)
+    return packed if len(packed) < len(data) else text
+
+
+def _unpack_text(value) -> Optional[str]:
+    """读取由 _pack_text 写入的值（兼容未压缩的旧数据）"""
+    if isinstance(value, bytes):
+        if value[:1] == _ZLIB_HEADER:
+            return zlib.decompress(value[1:]).decode("utf-8")
+        return value.decode("utf-8")
+    return value
+
+
+def _fetch_dicts(cursor) -> List[Dict]:
+    """
+    取出游标的全部结果并转换为字典列表
+    
+    列名只解析一次，每行用 zip 组装字典，比逐行 dict(row) 少一次按列名的映射构建。
+    读取时临时关闭游标的 row_factory，直接拿到元组，不再为每行额外创建 sqlite3.Row。
+    """
+    keys = [d[0] for d in cursor.description]
+    row_factory = cursor.row_factory
+    cursor.row_factory = None
+    try:
+        rows = cursor.fetchall()
+    finally:
+        cursor.row_factory = row_factory
+    return list(map(dict, map(zip, repeat(keys), rows)))
+
+
+def _iter_dicts(cursor, chunk_size: int = FETCH_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    按批次从游标读取结果并逐行生成字典
+    
+    列名只在查询开始时解析一次，避免对每一行重复执行 Row -> dict 的转换。
+    
+    Args:
+        cursor: 已执行查询的游标（不可与其他方法共享）
+        chunk_size: 每批读取的行数
+    """
+    keys = [d[0] for d in cursor.description]
+    cursor.row_factory = None  # 游标为本次查询独占，直接读取元组
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield from map(dict, map(zip, repeat(keys), rows))
+
+
+# ========== 轻量记录类型 ==========
+# 固定字段布局（__slots__），由查询结果元组直接按位置构造，不做逐行哈希；
+# 适合只读遍历的场景。需要修改或序列化时使用 as_dict()。
+
+
+@dataclass
+class Note:
+    """便签记录"""
+    __slots__ = ('id', 'title', 'content', 'category_id', 'is_pinned', 'is_locked',
+                 'color', 'created_at', 'updated_at')
+    id: int
+    title: str
+    content: Optional[str]
+    category_id: Optional[int]
+    is_pinned: int
+    is_locked: int
+    color: str
+    created_at: str
+    updated_at: str
+    
+    def as_dict(self) -> Dict:
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class Subtask:
+    """子任务记录"""
+    __slots__ = ('id', 'task_id', 'title', 'description', 'status', 'priority',
+                 'sort_order', 'created_at', 'completed_at')
+    id: int
+    task_id: int
+    title: str
+    description: Optional[str]
+    status: str
+    priority: int
+    sort_order: int
+    created_at: str
+    completed_at: Optional[str]
+    
+    def as_dict(self) -> Dict:
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class ChatMessage:
+    """对话消息记录"""
+    __slots__ = ('id', 'pet_id', 'role', 'message', 'timestamp', 'tokens_used')
+    id: int
+    pet_id: Optional[int]
+    role: str
+    message: str
+    timestamp: str
+    tokens_used: int
+    
+    def as_dict(self) -> Dict:
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _record_columns(record_type) -> str:
+    """生成与记录类型字段顺序一致的列清单"""
+    return ", ".join(f.name for f in fields(record_type))
+
+
+def _synchronized(method):
+    """在数据库实例锁内执行方法（共享连接和游标的跨线程访问保护）"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class Database:
@@ -29,386 +742,323 @@ class Database:
         if db_dir and not os.path.exists(db_dir):
             os.makedirs(db_dir)
         
-        # 创建数据库连接
+        # 数据库连接在进程生命周期内保持打开，所有方法共享
         self.conn = None
         self.cursor = None
+        self._lock = threading.RLock()
+        self._tx_owner = None  # 持有显式写事务的线程ID
+        self._fts_enabled = False  # 任务全文索引是否可用（init_database 中检测）
+        
+        # 只读连接（文件数据库每个线程一个，WAL 下与写连接并发读取）
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()  # 不与写锁共用，打开只读连接时不等待写事务
+        
+        # 后台写线程（首次提交异步写操作时启动）
+        self._write_queue = queue.Queue()
+        self._writer_thread = None
         
-        # 初始化数据库
+        # 初始化数据库（同时建立连接）
         self.init_database()
     
+    @_synchronized
     def connect(self):
-        """连接数据库"""
-        if not self.conn:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row  # 使查询结果可以通过列名访问
-            self.cursor = self.conn.cursor()
+        """连接数据库（已连接时直接返回）"""
+        if self.conn is not None:
+            return
+        
+        # 允许跨线程使用同一连接，并发访问由 self._lock 串行化
+        # isolation_level=None：自动提交模式，只读查询不会隐式开启事务，
+        # 需要原子写入的多条语句通过 transaction() 显式 BEGIN/COMMIT
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                    isolation_level=None,
+                                    cached_statements=CACHED_STATEMENTS)
+        self.conn.row_factory = sqlite3.Row  # 使查询结果可以通过列名访问
+        self._configure_connection(self.conn)
+        self.cursor = self.conn.cursor()
+    
+    def _configure_connection(self, conn):
+        """为新建的连接设置PRAGMA（内存数据库不支持WAL，跳过）"""
+        if self.db_path != ":memory:":
+            conn.execute(_WAL_PRAGMA)
+        conn.executescript(_CONNECTION_PRAGMAS)
+    
+    def _open_reader(self):
+        """为当前线程打开只读连接"""
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                               isolation_level=None,
+                               cached_statements=CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_READER_PRAGMAS)
+        with self._readers_lock:
+            self._readers.append(conn)
+        self._local.conn = conn
+        return conn
+    
+    def _thread_reader(self):
+        """当前线程的只读连接；内存数据库或当前线程处于自己的写事务中时返回 None"""
+        if self.db_path == ":memory:" or self._tx_owner == threading.get_ident():
+            return None
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_reader()
+        return conn
+    
+    @contextmanager
+    def _read_connection(self):
+        """
+        只读查询使用的连接
+        
+        文件数据库为每个线程缓存一个只读连接，多个线程的查询互不阻塞，也不等待写锁；
+        内存数据库，或当前线程正处于自己的写事务中（需要读到未提交的写入）时，
+        退回到加锁的共享连接。
+        """
+        conn = self._thread_reader()
+        if conn is not None:
+            yield conn
+            return
+        
+        with self._lock:
+            self.connect()
+            yield self.conn
     
+    def _stream_connection(self):
+        """
+        流式读取（生成器）使用的连接
+        
+        生成器在调用方消费期间保持挂起，不能持有实例锁；没有线程只读连接时
+        与其他 *_iter 方法一样直接在共享连接上新建游标。
+        """
+        conn = self._thread_reader()
+        if conn is None:
+            self.connect()
+            conn = self.conn
+        return conn
+    
+    @_synchronized
     def close(self):
         """关闭数据库连接"""
+        self._stop_writer()
+        with self._readers_lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers = []
+            self._local = threading.local()
         if self.conn:
+            # 退出前让查询规划器按需更新统计信息，并把WAL完整写回主文件后截断，
+            # 下次启动时不必先回放积压的WAL
+            try:
+                self.conn.execute("PRAGMA optimize")
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                logger.warning("关闭前整理数据库失败: %s", e)
             self.conn.close()
             self.conn = None
             self.cursor = None
     
-    def init_database(self):
-        """初始化数据库表结构"""
-        self.connect()
-        
-        # 创建任务表
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                description TEXT,
-                due_date TEXT,
-                priority INTEGER DEFAULT 1,
-                status TEXT DEFAULT 'pending',
-                category TEXT DEFAULT 'general',
-                remind_time TEXT,
-                repeat_type TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-        """)
-        
-        # 创建配置表
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS config (
-                key TEXT PRIMARY KEY,
-                value TEXT
-            )
-        """)
-        
-        # 创建标签表 [v0.3.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tags (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                color TEXT DEFAULT '#4CAF50',
-                created_at TEXT NOT NULL
-            )
-        """)
-        
-        # 创建任务标签关联表 [v0.3.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS task_tags (
-                task_id INTEGER NOT NULL,
-                tag_id INTEGER NOT NULL,
-                PRIMARY KEY (task_id, tag_id),
-                FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
-                FOREIGN KEY (task_id) REFERENCES tags(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # ========== v0.4.0 新增表 ==========
-        
-        # 创建番茄钟会话表 [v0.4.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pomodoro_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER,
-                start_time TEXT NOT NULL,
-                end_time TEXT,
-                duration INTEGER NOT NULL,
-                completed BOOLEAN DEFAULT 0,
-                session_type TEXT DEFAULT 'work',
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE SET NULL
-            )
-        """)
-        
-        # 创建宠物数据表 [v0.4.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                pet_type TEXT DEFAULT 'cat',
-                level INTEGER DEFAULT 1,
-                experience INTEGER DEFAULT 0,
-                hunger INTEGER DEFAULT 100,
-                happiness INTEGER DEFAULT 100,
-                health INTEGER DEFAULT 100,
-                energy INTEGER DEFAULT 100,
-                is_active BOOLEAN DEFAULT 1,
-                position_x INTEGER DEFAULT 100,
-                position_y INTEGER DEFAULT 100,
-                skin TEXT DEFAULT 'default',
-                character_pack TEXT DEFAULT 'default',
-                pack_overrides TEXT,
-                evolution_stage INTEGER DEFAULT 1,
-                created_at TEXT NOT NULL,
-                last_fed_at TEXT,
-                last_played_at TEXT
-            )
-        """)
-        
-        # 创建成就表 [v0.4.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS achievements (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pet_id INTEGER NOT NULL,
-                achievement_type TEXT NOT NULL,
-                achievement_name TEXT NOT NULL,
-                description TEXT,
-                icon TEXT,
-                unlocked_at TEXT NOT NULL,
-                FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE CASCADE
-            )
-        """)
+    @contextmanager
+    def transaction(self):
+        """
+        显式事务：BEGIN ... COMMIT，块内抛出异常时回滚
         
-        # 创建道具背包表 [v0.4.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS inventory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pet_id INTEGER NOT NULL,
-                item_name TEXT NOT NULL,
-                item_type TEXT NOT NULL,
-                item_effect TEXT,
-                quantity INTEGER DEFAULT 1,
-                acquired_at TEXT NOT NULL,
-                FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE CASCADE
-            )
-        """)
+        连接处于自动提交模式，单条写操作各自即时生效；需要连续执行多次写入
+        （批量打标签、循环加经验等）时用 ``with db.transaction():`` 包住整个循环，
+        所有写入只提交一次。嵌套使用时并入最外层事务。
+        """
+        with self._lock:
+            self.connect()
+            if self.conn.in_transaction:
+                yield self.conn
+                return
+            self.conn.execute("BEGIN")
+            self._tx_owner = threading.get_ident()
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.rollback()
+                raise
+            else:
+                self.conn.commit()
+            finally:
+                self._tx_owner = None
+    
+    def __enter__(self):
+        """支持 with 语句：连接在整个代码块内复用，退出时关闭"""
+        self.connect()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    # ========== 后台写线程 ==========
+    
+    def submit_write(self, sql: str, params=()) -> Future:
+        """
+        提交一条写操作到后台写线程执行，不阻塞调用方（例如UI线程）
         
-        # 创建AI对话历史表 [v0.4.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS chat_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                pet_id INTEGER,
-                role TEXT NOT NULL,
-                message TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                tokens_used INTEGER DEFAULT 0,
-                FOREIGN KEY (pet_id) REFERENCES pets(id) ON DELETE SET NULL
-            )
-        """)
+        写线程使用独立连接，把等待窗口内的多条写操作放在同一个事务中提交。
         
-        # 补充宠物表新字段（向后兼容）
-        try:
-            self.cursor.execute("ALTER TABLE pets ADD COLUMN character_pack TEXT DEFAULT 'default'")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            self.cursor.execute("ALTER TABLE pets ADD COLUMN pack_overrides TEXT")
-        except sqlite3.OperationalError:
-            pass
-
-        # 创建图片识别任务表 [v0.4.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS image_tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                image_path TEXT NOT NULL,
-                image_hash TEXT,
-                recognition_result TEXT,
-                task_id INTEGER,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE SET NULL
-            )
-        """)
+        Args:
+            sql: 写操作SQL
+            params: 绑定参数
         
-        # 添加任务表新字段（如果不存在）[v0.4.0]
+        Returns:
+            Future，结果为 {'lastrowid': ..., 'rowcount': ...}
+        """
+        future = Future()
+        with self._lock:
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="DatabaseWriter", daemon=True
+                )
+                self._writer_thread.start()
+            self._write_queue.put((sql, params, future))
+        return future
+    
+    def flush_writes(self):
+        """等待所有已提交的异步写操作完成"""
+        if self._writer_thread is not None:
+            self._write_queue.join()
+    
+    def _stop_writer(self):
+        """写完剩余操作后停止后台写线程"""
+        if self._writer_thread is not None:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+    
+    def _writer_loop(self):
+        """后台写线程主循环：攒批 -> 单事务执行 -> 提交"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None,
+                               cached_statements=CACHED_STATEMENTS)
+        self._configure_connection(conn)
         try:
-            self.cursor.execute("ALTER TABLE tasks ADD COLUMN completed_date TEXT")
-        except sqlite3.OperationalError:
-            pass  # 字段已存在
-        
+            running = True
+            while running:
+                item = self._write_queue.get()
+                if item is None:
+                    self._write_queue.task_done()
+                    break
+                
+                # 在时间窗口内尽量多取一些操作
+                batch = [item]
+                deadline = time.monotonic() + WRITE_BATCH_WINDOW
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._write_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        running = False
+                        self._write_queue.task_done()
+                        break
+                    batch.append(item)
+                
+                self._execute_write_batch(conn, batch)
+                for _ in batch:
+                    self._write_queue.task_done()
+        finally:
+            conn.close()
+    
+    def _execute_write_batch(self, conn, batch):
+        """在一个事务中执行一批写操作并设置各自的Future结果"""
+        results = []
         try:
-            self.cursor.execute("ALTER TABLE tasks ADD COLUMN pomodoro_count INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass  # 字段已存在
-        
-        # ========== v0.5.0 敬业签功能新增表 ==========
-        
-        # 创建便签表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT,
-                category_id INTEGER,
-                is_pinned BOOLEAN DEFAULT 0,
-                is_locked BOOLEAN DEFAULT 0,
-                color TEXT DEFAULT '#FFFFFF',
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL,
-                FOREIGN KEY (category_id) REFERENCES note_categories(id) ON DELETE SET NULL
-            )
-        """)
-        
-        # 创建便签分类表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS note_categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                color TEXT DEFAULT '#4CAF50',
-                icon TEXT,
-                parent_id INTEGER,
-                sort_order INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (parent_id) REFERENCES note_categories(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # 创建附件表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS attachments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                entity_type TEXT NOT NULL,
-                entity_id INTEGER NOT NULL,
-                file_name TEXT NOT NULL,
-                file_path TEXT NOT NULL,
-                file_size INTEGER,
-                file_type TEXT,
-                thumbnail_path TEXT,
-                upload_time TEXT NOT NULL
-            )
-        """)
-        
-        # 创建子任务表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS subtasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                status TEXT DEFAULT 'pending',
-                priority INTEGER DEFAULT 1,
-                sort_order INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL,
-                completed_at TEXT,
-                FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE
-            )
-        """)
-        
-        # 创建任务依赖表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS task_dependencies (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER NOT NULL,
-                depends_on_task_id INTEGER NOT NULL,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
-                FOREIGN KEY (depends_on_task_id) REFERENCES tasks(id) ON DELETE CASCADE,
-                UNIQUE(task_id, depends_on_task_id)
-            )
-        """)
-        
-        # 创建任务模板表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS task_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                category TEXT,
-                priority INTEGER DEFAULT 1,
-                template_data TEXT,
-                usage_count INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-        """)
-        
-        # 创建提醒历史表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reminder_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                task_id INTEGER,
-                reminder_time TEXT NOT NULL,
-                triggered_time TEXT,
-                status TEXT DEFAULT 'pending',
-                user_action TEXT,
-                snooze_count INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE SET NULL
-            )
-        """)
-        
-        # 创建提醒模板表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reminder_templates (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                remind_before_minutes INTEGER,
-                repeat_type TEXT,
-                repeat_rule TEXT,
-                usage_count INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL
-            )
-        """)
-        
-        # 创建视图设置表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS view_settings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                view_type TEXT NOT NULL,
-                user_id TEXT DEFAULT 'default',
-                settings_data TEXT NOT NULL,
-                is_default BOOLEAN DEFAULT 0,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL,
-                UNIQUE(view_type, user_id)
-            )
-        """)
-        
-        # 创建备份记录表 [v0.5.0]
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS backup_records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                backup_file_path TEXT NOT NULL,
-                backup_type TEXT DEFAULT 'manual',
-                file_size INTEGER,
-                record_count INTEGER,
-                backup_time TEXT NOT NULL,
-                description TEXT
-            )
-        """)
+            conn.execute("BEGIN")
+            for sql, params, future in batch:
+                try:
+                    cursor = conn.execute(sql, params)
+                    results.append((future, {'lastrowid': cursor.lastrowid,
+                                             'rowcount': cursor.rowcount}))
+                except Exception as e:
+                    future.set_exception(e)
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.exception("后台批量写入失败: %s", e)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for future, _ in results:
+                future.set_exception(e)
+            return
         
-        # 扩展tasks表字段 [v0.5.0]
-        try:
-            self.cursor.execute("ALTER TABLE tasks ADD COLUMN notes TEXT")
-        except sqlite3.OperationalError:
-            pass  # 字段已存在
+        for future, result in results:
+            future.set_result(result)
+    
+    @_synchronized
+    def init_database(self):
+        """初始化数据库表结构"""
+        self.connect()
         
+        # 所有建表/建索引语句在一个事务中执行
         try:
-            self.cursor.execute("ALTER TABLE tasks ADD COLUMN template_id INTEGER")
-        except sqlite3.OperationalError:
-            pass  # 字段已存在
+            self.conn.executescript("BEGIN;\n" + _SCHEMA_SQL + "\nCOMMIT;")
+        except sqlite3.Error:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            raise
         
-        try:
-            self.cursor.execute("ALTER TABLE tasks ADD COLUMN repeat_rule TEXT")
-        except sqlite3.OperationalError:
-            pass  # 字段已存在
+        self._init_fts()
+        self._migrate()
         
+        logger.info("初始化成功: %s", self.db_path)
+    
+    def _init_fts(self):
+        """创建任务全文索引；当前SQLite不支持时关闭全文搜索，search_tasks 改用 LIKE"""
+        existed = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone()
         try:
-            self.cursor.execute("ALTER TABLE tasks ADD COLUMN reminder_times TEXT")
-        except sqlite3.OperationalError:
-            pass  # 字段已存在
-        
-        # 创建索引 [v0.5.0]
-        indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_notes_category ON notes(category_id)",
-            "CREATE INDEX IF NOT EXISTS idx_notes_created ON notes(created_at)",
-            "CREATE INDEX IF NOT EXISTS idx_notes_pinned ON notes(is_pinned)",
-            "CREATE INDEX IF NOT EXISTS idx_attachments_entity ON attachments(entity_type, entity_id)",
-            "CREATE INDEX IF NOT EXISTS idx_subtasks_task ON subtasks(task_id)",
-            "CREATE INDEX IF NOT EXISTS idx_subtasks_status ON subtasks(status)",
-            "CREATE INDEX IF NOT EXISTS idx_dependencies_task ON task_dependencies(task_id)",
-            "CREATE INDEX IF NOT EXISTS idx_dependencies_depends ON task_dependencies(depends_on_task_id)",
-            "CREATE INDEX IF NOT EXISTS idx_reminder_history_task ON reminder_history(task_id)",
-            "CREATE INDEX IF NOT EXISTS idx_reminder_history_time ON reminder_history(reminder_time)",
-        ]
-        
-        for index_sql in indexes:
-            try:
-                self.cursor.execute(index_sql)
-            except sqlite3.OperationalError as e:
-                print(f"[数据库] 创建索引失败: {e}")
+            self.conn.executescript("BEGIN;\n" + _FTS_SCHEMA_SQL + "\nCOMMIT;")
+            if not existed:
+                # 新建的索引（如升级SQLite后首次可用）补上已有任务
+                self.conn.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError as e:
+            if self.conn.in_transaction:
+                self.conn.rollback()
+            self._fts_enabled = False
+            logger.warning("全文索引不可用，搜索改用 LIKE: %s", e)
+        else:
+            self._fts_enabled = True
+    
+    def _migrate(self):
+        """执行旧数据库的结构迁移（按 user_version 只执行一次）"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        
+        with self.transaction():
+            for target in range(version + 1, SCHEMA_VERSION + 1):
+                for migration_sql in _MIGRATIONS.get(target, []):
+                    if not self._fts_enabled and "tasks_fts" in migration_sql:
+                        continue  # 全文索引不可用
+                    try:
+                        self.conn.execute(migration_sql)
+                    except sqlite3.OperationalError as e:
+                        if "duplicate column" not in str(e):
+                            raise
+                        # 字段已存在（新建的表已包含该字段）
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def _insert(self, table: str, now_columns: tuple = (), **values) -> int:
+        """
+        插入一行并返回新行ID
         
-        self.conn.commit()
-        print(f"[数据库] 初始化成功: {self.db_path}")
+        Args:
+            table: 表名
+            now_columns: 由SQLite写入当前本地时间的列名（创建/更新时间等）
+            **values: 列名和对应的值
+        """
+        self.connect()
+        # RETURNING 让新ID随INSERT语句一起返回；旧版SQLite读取 lastrowid
+        self.cursor.execute(_insert_sql(table, tuple(values), now_columns, _HAS_RETURNING),
+                            tuple(values.values()))
+        return _inserted_id(self.cursor)
     
+    @_synchronized
     def add_task(self, title: str, description: str = "", due_date: str = None,
                  priority: int = 1, category: str = "general", 
                  remind_time: str = None, repeat_type: str = None) -> int:
@@ -430,27 +1080,48 @@ class Database:
         try:
             self.connect()
             
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO tasks (title, description, due_date, priority, 
-                                 category, remind_time, repeat_type, 
-                                 created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (title, description, due_date, priority, category, 
-                  remind_time, repeat_type, now, now))
+            self.cursor.execute(_SQL_ADD_TASK_RETURNING if _HAS_RETURNING else _SQL_ADD_TASK,
+                                (title, description, due_date, priority, category,
+                                 remind_time, repeat_type))
             
-            self.conn.commit()
-            task_id = self.cursor.lastrowid
+            task_id = _inserted_id(self.cursor)
             
-            print(f"[数据库] 添加任务成功: ID={task_id}, 标题={title}")
+            logger.debug("添加任务成功: ID=%s, 标题=%s", task_id, title)
             return task_id
         except Exception as e:
-            print(f"[数据库] 添加任务失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加任务失败: %s", e)
             return -1
     
+    @_synchronized
+    def add_tasks_bulk(self, tasks: Iterable[Dict]) -> List[int]:
+        """
+        批量添加任务（单个事务，一次提交，适合导入数据）
+        
+        Args:
+            tasks: 任务字典列表，键与 add_task 的参数相同
+        
+        Returns:
+            新任务的ID列表（与输入顺序一致），失败时全部回滚并返回空列表
+        """
+        try:
+            task_ids = []
+            
+            # 逐行执行同一条预编译语句以取得每行的ID，只在最后提交一次
+            sql = _SQL_ADD_TASK_RETURNING if _HAS_RETURNING else _SQL_ADD_TASK
+            with self.transaction():
+                for task in tasks:
+                    self.cursor.execute(sql, (task['title'], task.get('description', ""), task.get('due_date'),
+                          task.get('priority', 1), task.get('category', "general"),
+                          task.get('remind_time'), task.get('repeat_type')))
+                    task_ids.append(_inserted_id(self.cursor))
+            
+            logger.debug("批量添加任务: %s 个", len(task_ids))
+            return task_ids
+        except Exception as e:
+            logger.exception("批量添加任务失败: %s", e)
+            return []
+    
+    @_synchronized
     def get_task(self, task_id: int) -> Optional[Dict]:
         """
         获取指定任务
@@ -463,7 +1134,7 @@ class Database:
         """
         self.connect()
         
-        self.cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
+        self.cursor.execute(_SQL_GET_TASK, (task_id,))
         row = self.cursor.fetchone()
         
         if row:
@@ -482,8 +1153,21 @@ class Database:
         Returns:
             任务列表
         """
-        self.connect()
+        return list(self.get_all_tasks_iter(status, category, tag_id))
+    
+    def get_all_tasks_iter(self, status: str = None, category: str = None,
+                           tag_id: int = None) -> Iterator[Dict]:
+        """
+        逐条获取任务（流式读取，任务较多时不必一次取出全部结果）
         
+        Args:
+            status: 状态筛选 (pending, completed, expired)
+            category: 分类筛选
+            tag_id: 标签ID筛选
+        
+        Yields:
+            任务字典
+        """
         # 构建SQL查询
         conditions = []
         params = []
@@ -510,33 +1194,34 @@ class Database:
                 WHERE {where_clause}
                 ORDER BY t.due_date
             """
-            self.cursor.execute(sql, [tag_id] + params)
+            params = [tag_id] + params
         else:
             # 普通查询
             sql = "SELECT * FROM tasks"
             if conditions:
                 sql += " WHERE " + " AND ".join(conditions)
             sql += " ORDER BY due_date"
-            self.cursor.execute(sql, params)
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        yield from _iter_dicts(self._stream_connection().execute(sql, params))
     
+    @_synchronized
     def get_today_tasks(self) -> List[Dict]:
         """获取今日任务"""
         self.connect()
         
-        today = datetime.now().strftime("%Y-%m-%d")
+        # 半开区间 [今天, 明天) 可以直接使用 (status, due_date) 索引
+        today = datetime.now().date()
+        tomorrow = today + timedelta(days=1)
         
         self.cursor.execute("""
             SELECT * FROM tasks 
-            WHERE date(due_date) = ? AND status = 'pending'
+            WHERE status = 'pending' AND due_date >= ? AND due_date < ?
             ORDER BY due_date
-        """, (today,))
+        """, (today.isoformat(), tomorrow.isoformat()))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def get_pending_reminders(self) -> List[Dict]:
         """获取待提醒的任务"""
         self.connect()
@@ -551,9 +1236,9 @@ class Database:
             ORDER BY remind_time
         """, (now,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def update_task(self, task_id: int, **kwargs) -> bool:
         """
         更新任务
@@ -567,26 +1252,23 @@ class Database:
         """
         self.connect()
         
-        # 添加更新时间
-        kwargs['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # 更新时间由SQLite生成
+        kwargs.pop('updated_at', None)
         
-        # 构建SQL语句
-        fields = ", ".join([f"{k} = ?" for k in kwargs.keys()])
+        # 构建SQL语句（相同的列组合复用同一条语句）
+        sql = _update_sql("tasks", tuple(kwargs), (f"updated_at = {_NOW_SQL}",))
         values = list(kwargs.values()) + [task_id]
         
-        self.cursor.execute(
-            f"UPDATE tasks SET {fields} WHERE id = ?",
-            values
-        )
+        self.cursor.execute(sql, values)
         
-        self.conn.commit()
         success = self.cursor.rowcount > 0
         
         if success:
-            print(f"[数据库] 更新任务成功: ID={task_id}")
+            logger.debug("更新任务成功: ID=%s", task_id)
         
         return success
     
+    @_synchronized
     def delete_task(self, task_id: int) -> bool:
         """
         删除任务
@@ -599,20 +1281,21 @@ class Database:
         """
         self.connect()
         
-        self.cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        self.conn.commit()
+        self.cursor.execute(_SQL_DELETE_TASK, (task_id,))
         
         success = self.cursor.rowcount > 0
         
         if success:
-            print(f"[数据库] 删除任务成功: ID={task_id}")
+            logger.debug("删除任务成功: ID=%s", task_id)
         
         return success
     
+    @_synchronized
     def mark_completed(self, task_id: int) -> bool:
         """标记任务为已完成"""
         return self.update_task(task_id, status='completed')
     
+    @_synchronized
     def mark_expired(self, task_id: int) -> bool:
         """标记任务为已过期"""
         return self.update_task(task_id, status='expired')
@@ -627,42 +1310,45 @@ class Database:
         Returns:
             匹配的任务列表
         """
-        self.connect()
-        
-        pattern = f"%{keyword}%"
-        
-        self.cursor.execute("""
-            SELECT * FROM tasks 
-            WHERE title LIKE ? OR description LIKE ?
-            ORDER BY due_date
-        """, (pattern, pattern))
-        
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        with self._read_connection() as conn:
+            if self._fts_enabled and len(keyword) >= 3:
+                # 通过全文索引查找（trigram 按子串匹配，大小写不敏感）
+                phrase = '"' + keyword.replace('"', '""') + '"'
+                cursor = conn.execute("""
+                    SELECT t.* FROM tasks t
+                    JOIN tasks_fts f ON f.rowid = t.id
+                    WHERE tasks_fts MATCH ?
+                    ORDER BY t.due_date
+                """, (phrase,))
+            else:
+                # trigram 至少需要3个字符，更短的关键词（或全文索引不可用时）按 LIKE 扫描
+                pattern = f"%{keyword}%"
+                cursor = conn.execute("""
+                    SELECT * FROM tasks 
+                    WHERE title LIKE ? OR description LIKE ?
+                    ORDER BY due_date
+                """, (pattern, pattern))
+            
+            return _fetch_dicts(cursor)
     
     def get_statistics(self) -> Dict:
         """获取任务统计信息"""
-        self.connect()
-        
-        stats = {}
-        
-        # 总任务数
-        self.cursor.execute("SELECT COUNT(*) FROM tasks")
-        stats['total'] = self.cursor.fetchone()[0]
-        
-        # 待完成
-        self.cursor.execute("SELECT COUNT(*) FROM tasks WHERE status = 'pending'")
-        stats['pending'] = self.cursor.fetchone()[0]
-        
-        # 已完成
-        self.cursor.execute("SELECT COUNT(*) FROM tasks WHERE status = 'completed'")
-        stats['completed'] = self.cursor.fetchone()[0]
-        
-        # 已过期
-        self.cursor.execute("SELECT COUNT(*) FROM tasks WHERE status = 'expired'")
-        stats['expired'] = self.cursor.fetchone()[0]
-        
-        return stats
+        # 条件聚合：一次扫描同时得到总数和各状态计数
+        with self._read_connection() as conn:
+            row = conn.execute("""
+                SELECT COUNT(*),
+                       COUNT(*) FILTER (WHERE status = 'pending'),
+                       COUNT(*) FILTER (WHERE status = 'completed'),
+                       COUNT(*) FILTER (WHERE status = 'expired')
+                FROM tasks
+            """).fetchone()
+        
+        return {
+            'total': row[0],
+            'pending': row[1],
+            'completed': row[2],
+            'expired': row[3],
+        }
     
     def auto_backup(self, backup_dir="backups", keep_days=7) -> bool:
         """
@@ -683,26 +1369,24 @@ class Database:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_file = os.path.join(backup_dir, f"tasks_backup_{timestamp}.db")
             
-            # 关闭当前连接
-            if self.conn:
-                self.conn.close()
-                self.conn = None
+            # SQLite在线备份：从当前线程的只读连接按已提交的快照逐页复制（含WAL中的内容），
+            # 不关闭连接，也不阻塞其他线程的写入
+            with self._read_connection() as conn:
+                target = sqlite3.connect(backup_file)
+                try:
+                    conn.backup(target)
+                finally:
+                    target.close()
             
-            # 复制数据库文件
-            if os.path.exists(self.db_path):
-                shutil.copy2(self.db_path, backup_file)
-                print(f"[数据库] 备份成功: {backup_file}")
-                
-                # 清理旧备份
-                self.clean_old_backups(backup_dir, keep_days)
-                
-                return True
-            else:
-                print(f"[数据库] 数据库文件不存在: {self.db_path}")
-                return False
+            logger.info("备份成功: %s", backup_file)
+            
+            # 清理旧备份
+            self.clean_old_backups(backup_dir, keep_days)
+            
+            return True
                 
         except Exception as e:
-            print(f"[数据库] 备份失败: {e}")
+            logger.exception("备份失败: %s", e)
             return False
     
     def clean_old_backups(self, backup_dir, keep_days=7):
@@ -717,27 +1401,27 @@ class Database:
             if not os.path.exists(backup_dir):
                 return
             
-            # 计算过期时间
-            cutoff_time = datetime.now() - timedelta(days=keep_days)
+            # 计算过期时间（直接与文件修改时间戳比较）
+            cutoff_ts = (datetime.now() - timedelta(days=keep_days)).timestamp()
             
-            # 遍历备份文件
-            for filename in os.listdir(backup_dir):
-                if filename.startswith("tasks_backup_") and filename.endswith(".db"):
-                    filepath = os.path.join(backup_dir, filename)
-                    
-                    # 获取文件修改时间
-                    file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
+            # 遍历备份文件（scandir 的目录项自带类型信息，stat 结果按项缓存）
+            with os.scandir(backup_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith("tasks_backup_") and name.endswith(".db")):
+                        continue
                     
                     # 删除过期备份
-                    if file_time < cutoff_time:
-                        os.remove(filepath)
-                        print(f"[数据库] 删除旧备份: {filename}")
+                    if entry.stat().st_mtime < cutoff_ts:
+                        os.remove(entry.path)
+                        logger.info("删除旧备份: %s", name)
                         
         except Exception as e:
-            print(f"[数据库] 清理备份失败: {e}")
+            logger.exception("清理备份失败: %s", e)
     
     # ========== 标签管理方法 [v0.3.0] ==========
     
+    @_synchronized
     def add_tag(self, name: str, color: str = '#4CAF50') -> Optional[int]:
         """
         添加新标签
@@ -750,38 +1434,29 @@ class Database:
             标签ID，失败返回None
         """
         try:
-            self.connect()
-            created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO tags (name, color, created_at)
-                VALUES (?, ?, ?)
-            """, (name, color, created_at))
-            
-            self.conn.commit()
-            tag_id = self.cursor.lastrowid
-            print(f"[数据库] 添加标签成功: ID={tag_id}, 名称={name}")
+            tag_id = self._insert("tags", ("created_at",), name=name, color=color)
+            logger.debug("添加标签成功: ID=%s, 名称=%s", tag_id, name)
             return tag_id
             
         except sqlite3.IntegrityError:
-            print(f"[数据库] 标签已存在: {name}")
+            logger.debug("标签已存在: %s", name)
             # 返回现有标签的ID
             self.cursor.execute("SELECT id FROM tags WHERE name = ?", (name,))
             row = self.cursor.fetchone()
             return row[0] if row else None
         except Exception as e:
-            print(f"[数据库] 添加标签失败: {e}")
-            self.conn.rollback()
+            logger.exception("添加标签失败: %s", e)
             return None
     
+    @_synchronized
     def get_all_tags(self) -> List[Dict]:
         """获取所有标签"""
         self.connect()
         
         self.cursor.execute("SELECT * FROM tags ORDER BY name")
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def get_tag_by_name(self, name: str) -> Optional[Dict]:
         """根据名称获取标签"""
         self.connect()
@@ -790,6 +1465,7 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @_synchronized
     def delete_tag(self, tag_id: int) -> bool:
         """
         删除标签
@@ -805,16 +1481,15 @@ class Database:
             
             # 删除标签（关联关系会自动删除）
             self.cursor.execute("DELETE FROM tags WHERE id = ?", (tag_id,))
-            self.conn.commit()
             
-            print(f"[数据库] 删除标签成功: ID={tag_id}")
+            logger.debug("删除标签成功: ID=%s", tag_id)
             return True
             
         except Exception as e:
-            print(f"[数据库] 删除标签失败: {e}")
-            self.conn.rollback()
+            logger.exception("删除标签失败: %s", e)
             return False
     
+    @_synchronized
     def add_task_tag(self, task_id: int, tag_id: int) -> bool:
         """
         为任务添加标签
@@ -834,15 +1509,14 @@ class Database:
                 VALUES (?, ?)
             """, (task_id, tag_id))
             
-            self.conn.commit()
-            print(f"[数据库] 添加任务标签成功: task_id={task_id}, tag_id={tag_id}")
+            logger.debug("添加任务标签成功: task_id=%s, tag_id=%s", task_id, tag_id)
             return True
             
         except Exception as e:
-            print(f"[数据库] 添加任务标签失败: {e}")
-            self.conn.rollback()
+            logger.exception("添加任务标签失败: %s", e)
             return False
     
+    @_synchronized
     def remove_task_tag(self, task_id: int, tag_id: int) -> bool:
         """
         移除任务标签
@@ -862,15 +1536,14 @@ class Database:
                 WHERE task_id = ? AND tag_id = ?
             """, (task_id, tag_id))
             
-            self.conn.commit()
-            print(f"[数据库] 移除任务标签成功: task_id={task_id}, tag_id={tag_id}")
+            logger.debug("移除任务标签成功: task_id=%s, tag_id=%s", task_id, tag_id)
             return True
             
         except Exception as e:
-            print(f"[数据库] 移除任务标签失败: {e}")
-            self.conn.rollback()
+            logger.exception("移除任务标签失败: %s", e)
             return False
     
+    @_synchronized
     def get_task_tags(self, task_id: int) -> List[Dict]:
         """
         获取任务的所有标签
@@ -890,9 +1563,38 @@ class Database:
             ORDER BY t.name
         """, (task_id,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
+    
+    @_synchronized
+    def get_tags_for_tasks(self, task_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+        """
+        批量获取多个任务的标签（列表视图一次查询取出所有行的标签）
+        
+        Args:
+            task_ids: 任务ID列表
+        
+        Returns:
+            {task_id: 标签列表}，没有标签的任务对应空列表
+        """
+        self.connect()
+        ids = list(dict.fromkeys(task_ids))
+        tags_by_task = {tid: [] for tid in ids}
+        
+        for chunk in _chunks(ids, MAX_SQL_VARIABLES):
+            placeholders = ", ".join("?" * len(chunk))
+            self.cursor.execute(f"""
+                SELECT tt.task_id, t.* FROM tags t
+                INNER JOIN task_tags tt ON t.id = tt.tag_id
+                WHERE tt.task_id IN ({placeholders})
+                ORDER BY t.name
+            """, chunk)
+            
+            for tag in _fetch_dicts(self.cursor):
+                tags_by_task[tag.pop('task_id')].append(tag)
+        
+        return tags_by_task
     
+    @_synchronized
     def get_tasks_by_tag(self, tag_id: int) -> List[Dict]:
         """
         获取具有指定标签的所有任务
@@ -912,13 +1614,13 @@ class Database:
             ORDER BY t.due_date
         """, (tag_id,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
     # ========== v0.4.0 新增方法 ==========
     
     # --- 番茄钟相关 ---
     
+    @_synchronized
     def add_pomodoro_session(self, task_id: Optional[int], duration: int, 
                             session_type: str = 'work') -> int:
         """
@@ -934,47 +1636,63 @@ class Database:
         """
         try:
             self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            self.cursor.execute("""
-                INSERT INTO pomodoro_sessions 
-                (task_id, start_time, duration, session_type, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (task_id, now, duration, session_type, now))
-            
-            self.conn.commit()
-            session_id = self.cursor.lastrowid
-            print(f"[数据库] 添加番茄钟会话: ID={session_id}")
+            self.cursor.execute(_SQL_ADD_POMODORO_SESSION_RETURNING if _HAS_RETURNING
+                                else _SQL_ADD_POMODORO_SESSION,
+                                (task_id, duration, session_type))
+            
+            session_id = _inserted_id(self.cursor)
+            logger.debug("添加番茄钟会话: ID=%s", session_id)
             return session_id
         except Exception as e:
-            print(f"[数据库] 添加番茄钟会话失败: {e}")
-            self.conn.rollback()
+            logger.exception("添加番茄钟会话失败: %s", e)
             return 0
     
+    @_synchronized
+    def add_pomodoro_sessions_bulk(self, sessions: Iterable[Dict]) -> int:
+        """
+        批量添加番茄钟会话记录（单个事务，一次提交）
+        
+        Args:
+            sessions: 会话字典列表，键与 add_pomodoro_session 的参数相同
+        
+        Returns:
+            添加的记录数量，失败返回-1
+        """
+        try:
+            rows = [
+                (s.get('task_id'), s['duration'], s.get('session_type', 'work'))
+                for s in sessions
+            ]
+            
+            with self.transaction():
+                self.cursor.executemany(_SQL_ADD_POMODORO_SESSION, rows)
+            
+            return len(rows)
+        except Exception as e:
+            logger.exception("批量添加番茄钟会话失败: %s", e)
+            return -1
+    
+    @_synchronized
     def complete_pomodoro_session(self, session_id: int) -> bool:
         """完成番茄钟会话"""
         try:
             self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            self.cursor.execute("""
-                UPDATE pomodoro_sessions 
-                SET completed = 1, end_time = ?
-                WHERE id = ?
-            """, (now, session_id))
+            self.cursor.execute(_SQL_COMPLETE_POMODORO_SESSION, (session_id,))
             
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 完成番茄钟会话失败: {e}")
-            self.conn.rollback()
+            logger.exception("完成番茄钟会话失败: %s", e)
             return False
     
+    @_synchronized
     def get_pomodoro_stats(self, days: int = 7) -> Dict:
         """获取番茄钟统计数据"""
         self.connect()
         
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        # 直接比较created_at字符串（不包裹DATE函数），可以使用索引范围扫描
+        cutoff_time = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d 00:00:00")
         
         self.cursor.execute("""
             SELECT 
@@ -983,14 +1701,15 @@ class Database:
                 SUM(CASE WHEN session_type = 'work' THEN duration ELSE 0 END) as work_time,
                 SUM(CASE WHEN session_type = 'break' THEN duration ELSE 0 END) as break_time
             FROM pomodoro_sessions
-            WHERE DATE(created_at) >= ?
-        """, (cutoff_date,))
+            WHERE created_at >= ?
+        """, (cutoff_time,))
         
         row = self.cursor.fetchone()
         return dict(row) if row else {}
     
     # --- 宠物相关 ---
     
+    @_synchronized
     def create_pet(self, name: str, pet_type: str = 'cat', character_pack: str = 'default',
                    pack_overrides: Optional[str] = None) -> int:
         """
@@ -1004,24 +1723,16 @@ class Database:
             宠物ID
         """
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO pets 
-                (name, pet_type, character_pack, pack_overrides, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (name, pet_type, character_pack, pack_overrides, now))
-            
-            self.conn.commit()
-            pet_id = self.cursor.lastrowid
-            print(f"[数据库] 创建宠物: ID={pet_id}, 名称={name}")
+            pet_id = self._insert("pets", ("created_at",), name=name, pet_type=pet_type,
+                                  character_pack=character_pack,
+                                  pack_overrides=pack_overrides)
+            logger.debug("创建宠物: ID=%s, 名称=%s", pet_id, name)
             return pet_id
         except Exception as e:
-            print(f"[数据库] 创建宠物失败: {e}")
-            self.conn.rollback()
+            logger.exception("创建宠物失败: %s", e)
             return 0
     
+    @_synchronized
     def get_pet(self, pet_id: int) -> Optional[Dict]:
         """获取宠物信息"""
         self.connect()
@@ -1030,6 +1741,7 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @_synchronized
     def get_active_pet(self) -> Optional[Dict]:
         """获取当前激活的宠物"""
         self.connect()
@@ -1038,313 +1750,367 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @_synchronized
     def get_all_pets(self) -> List[Dict]:
         """获取所有宠物"""
         self.connect()
         
         self.cursor.execute("SELECT * FROM pets ORDER BY created_at")
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
+    
+    @staticmethod
+    def _build_pet_update(pet_id: int, kwargs: Dict):
+        """构建宠物更新语句，返回 (sql, values)"""
+        values = list(kwargs.values())
+        values.append(pet_id)
+        return _update_sql("pets", tuple(kwargs)), values
     
+    @_synchronized
     def update_pet(self, pet_id: int, **kwargs) -> bool:
         """更新宠物信息"""
         try:
             self.connect()
             
-            # 构建更新语句
-            fields = []
-            values = []
-            for key, value in kwargs.items():
-                fields.append(f"{key} = ?")
-                values.append(value)
-            
-            if not fields:
+            if not kwargs:
                 return False
             
-            values.append(pet_id)
-            query = f"UPDATE pets SET {', '.join(fields)} WHERE id = ?"
-            
+            query, values = self._build_pet_update(pet_id, kwargs)
             self.cursor.execute(query, values)
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 更新宠物失败: {e}")
-            self.conn.rollback()
+            logger.exception("更新宠物失败: %s", e)
             return False
     
+    def update_pet_async(self, pet_id: int, **kwargs) -> Optional[Future]:
+        """异步更新宠物信息（由后台写线程执行，适合定时器等高频调用）"""
+        if not kwargs:
+            return None
+        query, values = self._build_pet_update(pet_id, kwargs)
+        return self.submit_write(query, values)
+    
+    @_synchronized
     def add_experience(self, pet_id: int, exp: int) -> bool:
         """增加宠物经验值"""
         try:
             self.connect()
             
-            self.cursor.execute("""
-                UPDATE pets 
-                SET experience = experience + ?
-                WHERE id = ?
-            """, (exp, pet_id))
+            self.cursor.execute(_SQL_ADD_EXPERIENCE, (exp, pet_id))
             
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 增加经验失败: {e}")
-            self.conn.rollback()
+            logger.exception("增加经验失败: %s", e)
             return False
     
     # --- 成就相关 ---
     
+    @_synchronized
     def unlock_achievement(self, pet_id: int, achievement_type: str, 
                           achievement_name: str, description: str = "") -> int:
         """解锁成就"""
         try:
             self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # 检查是否已解锁
-            self.cursor.execute("""
-                SELECT id FROM achievements 
-                WHERE pet_id = ? AND achievement_name = ?
-            """, (pet_id, achievement_name))
-            
-            if self.cursor.fetchone():
-                return 0  # 已解锁
             
-            self.cursor.execute("""
-                INSERT INTO achievements 
+            # 唯一约束 (pet_id, achievement_name) 保证不会重复插入
+            self.cursor.execute(_with_returning(f"""
+                INSERT OR IGNORE INTO achievements 
                 (pet_id, achievement_type, achievement_name, description, unlocked_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (pet_id, achievement_type, achievement_name, description, now))
+                VALUES (?, ?, ?, ?, {_NOW_SQL})
+            """), (pet_id, achievement_type, achievement_name, description))
+            
+            # 被忽略时没有结果行（旧版SQLite的 lastrowid 也不会更新，按影响行数判断）
+            if _HAS_RETURNING:
+                row = self.cursor.fetchone()
+                achievement_id = row[0] if row else 0
+            else:
+                achievement_id = self.cursor.lastrowid if self.cursor.rowcount > 0 else 0
             
-            self.conn.commit()
-            achievement_id = self.cursor.lastrowid
-            print(f"[数据库] 解锁成就: {achievement_name}")
+            if not achievement_id:
+                return 0  # 已解锁
+            logger.debug("解锁成就: %s", achievement_name)
             return achievement_id
         except Exception as e:
-            print(f"[数据库] 解锁成就失败: {e}")
-            self.conn.rollback()
+            logger.exception("解锁成就失败: %s", e)
             return 0
     
     def get_pet_achievements(self, pet_id: int) -> List[Dict]:
         """获取宠物的所有成就"""
-        self.connect()
-        
-        self.cursor.execute("""
+        return list(self.get_pet_achievements_iter(pet_id))
+    
+    def get_pet_achievements_iter(self, pet_id: int) -> Iterator[Dict]:
+        """逐条获取宠物的成就（流式读取）"""
+        cursor = self._stream_connection().execute("""
             SELECT * FROM achievements 
             WHERE pet_id = ?
             ORDER BY unlocked_at DESC
         """, (pet_id,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        yield from _iter_dicts(cursor)
     
     # --- 道具相关 ---
     
+    @_synchronized
     def add_item(self, pet_id: int, item_name: str, item_type: str, 
                 item_effect: str = "", quantity: int = 1) -> int:
         """添加道具到背包"""
         try:
             self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # 检查是否已有该道具
-            self.cursor.execute("""
-                SELECT id, quantity FROM inventory 
-                WHERE pet_id = ? AND item_name = ?
-            """, (pet_id, item_name))
             
-            row = self.cursor.fetchone()
-            if row:
-                # 增加数量
-                new_quantity = row['quantity'] + quantity
-                self.cursor.execute("""
-                    UPDATE inventory 
-                    SET quantity = ?
-                    WHERE id = ?
-                """, (new_quantity, row['id']))
-                item_id = row['id']
+            # 已有该道具则累加数量，否则新增（依赖唯一约束 (pet_id, item_name)）
+            self.cursor.execute(_with_returning(f"""
+                INSERT INTO inventory 
+                (pet_id, item_name, item_type, item_effect, quantity, acquired_at)
+                VALUES (?, ?, ?, ?, ?, {_NOW_SQL})
+                ON CONFLICT(pet_id, item_name) DO UPDATE SET
+                    quantity = inventory.quantity + excluded.quantity
+            """), (pet_id, item_name, item_type, item_effect, quantity))
+            if _HAS_RETURNING:
+                item_id = self.cursor.fetchone()[0]
             else:
-                # 新增道具
-                self.cursor.execute("""
-                    INSERT INTO inventory 
-                    (pet_id, item_name, item_type, item_effect, quantity, acquired_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (pet_id, item_name, item_type, item_effect, quantity, now))
-                item_id = self.cursor.lastrowid
-            
-            self.conn.commit()
-            print(f"[数据库] 添加道具: {item_name} x{quantity}")
+                # 走 DO UPDATE 分支时 lastrowid 不是该行，按唯一键查回ID
+                item_id = self.cursor.execute(
+                    "SELECT id FROM inventory WHERE pet_id = ? AND item_name = ?",
+                    (pet_id, item_name)).fetchone()[0]
+            
+            logger.debug("添加道具: %s x%s", item_name, quantity)
             return item_id
         except Exception as e:
-            print(f"[数据库] 添加道具失败: {e}")
-            self.conn.rollback()
+            logger.exception("添加道具失败: %s", e)
             return 0
     
+    @_synchronized
     def use_item(self, pet_id: int, item_name: str, quantity: int = 1) -> bool:
         """使用道具"""
         try:
-            self.connect()
-            
-            self.cursor.execute("""
-                SELECT id, quantity FROM inventory 
-                WHERE pet_id = ? AND item_name = ?
-            """, (pet_id, item_name))
-            
-            row = self.cursor.fetchone()
-            if not row or row['quantity'] < quantity:
-                return False
-            
-            new_quantity = row['quantity'] - quantity
-            if new_quantity > 0:
+            # 读取和扣减在同一事务中完成
+            with self.transaction():
                 self.cursor.execute("""
-                    UPDATE inventory 
-                    SET quantity = ?
-                    WHERE id = ?
-                """, (new_quantity, row['id']))
-            else:
-                self.cursor.execute("DELETE FROM inventory WHERE id = ?", (row['id'],))
+                    SELECT id, quantity FROM inventory 
+                    WHERE pet_id = ? AND item_name = ?
+                """, (pet_id, item_name))
+                
+                row = self.cursor.fetchone()
+                if not row or row['quantity'] < quantity:
+                    return False
+                
+                new_quantity = row['quantity'] - quantity
+                if new_quantity > 0:
+                    self.cursor.execute("""
+                        UPDATE inventory 
+                        SET quantity = ?
+                        WHERE id = ?
+                    """, (new_quantity, row['id']))
+                else:
+                    self.cursor.execute("DELETE FROM inventory WHERE id = ?", (row['id'],))
             
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 使用道具失败: {e}")
-            self.conn.rollback()
+            logger.exception("使用道具失败: %s", e)
             return False
     
     def get_inventory(self, pet_id: int) -> List[Dict]:
         """获取宠物背包"""
-        self.connect()
-        
-        self.cursor.execute("""
+        return list(self.get_inventory_iter(pet_id))
+    
+    def get_inventory_iter(self, pet_id: int) -> Iterator[Dict]:
+        """逐条获取宠物背包中的道具（流式读取）"""
+        cursor = self._stream_connection().execute("""
             SELECT * FROM inventory 
             WHERE pet_id = ?
             ORDER BY acquired_at DESC
         """, (pet_id,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        yield from _iter_dicts(cursor)
     
     # --- 对话相关 ---
     
+    @_synchronized
     def add_chat_message(self, pet_id: Optional[int], role: str, message: str, 
                         tokens_used: int = 0) -> int:
         """添加对话消息"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO chat_history 
-                (pet_id, role, message, timestamp, tokens_used)
-                VALUES (?, ?, ?, ?, ?)
-            """, (pet_id, role, message, now, tokens_used))
-            
-            self.conn.commit()
-            return self.cursor.lastrowid
+            return self._insert("chat_history", ("timestamp",), pet_id=pet_id, role=role,
+                                message=_pack_text(message), tokens_used=tokens_used)
         except Exception as e:
-            print(f"[数据库] 添加对话消息失败: {e}")
-            self.conn.rollback()
+            logger.exception("添加对话消息失败: %s", e)
             return 0
     
-    def get_chat_history(self, pet_id: Optional[int] = None, limit: int = 50) -> List[Dict]:
-        """获取对话历史"""
-        self.connect()
+    def add_chat_message_async(self, pet_id: Optional[int], role: str, message: str,
+                               tokens_used: int = 0) -> Future:
+        """异步添加对话消息（由后台写线程执行，不阻塞UI线程）"""
+        return self.submit_write(_SQL_ADD_CHAT_MESSAGE,
+                                 (pet_id, role, _pack_text(message), tokens_used))
+    
+    @_synchronized
+    def add_chat_messages_bulk(self, messages: Iterable[Dict]) -> int:
+        """
+        批量添加对话消息（单个事务，一次提交）
         
-        if pet_id is not None:
-            self.cursor.execute("""
-                SELECT * FROM chat_history 
-                WHERE pet_id = ? OR pet_id IS NULL
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (pet_id, limit))
-        else:
-            self.cursor.execute("""
-                SELECT * FROM chat_history 
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
+        Args:
+            messages: 消息字典列表，键与 add_chat_message 的参数相同
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in reversed(rows)]  # 返回正序
+        Returns:
+            添加的消息数量，失败返回-1
+        """
+        try:
+            rows = [
+                (m.get('pet_id'), m['role'], _pack_text(m['message']), m.get('tokens_used', 0))
+                for m in messages
+            ]
+            
+            with self.transaction():
+                self.cursor.executemany(_SQL_ADD_CHAT_MESSAGE, rows)
+            
+            return len(rows)
+        except Exception as e:
+            logger.exception("批量添加对话消息失败: %s", e)
+            return -1
     
+    def _query_chat_history(self, conn, columns: str, pet_id: Optional[int], limit: int,
+                            before_id: Optional[int]):
+        """在给定连接上执行对话历史查询并返回游标"""
+        # 按自增 id 做 keyset 分页：沿主键/idx_chat_pet_id 倒序取到 LIMIT 条即停止，
+        # 不需要对整张表排序；before_id 为上一页最早一条消息的 id。
+        # 指定宠物时不用 OR 条件（会先取出该宠物的全部消息再排序）
+        return conn.execute(_chat_history_sql(columns, pet_id is not None), {
+            'pet_id': pet_id, 'limit': limit,
+            'before_id': _MAX_ROWID if before_id is None else before_id})
+    
+    def get_chat_history(self, pet_id: Optional[int] = None, limit: int = 50,
+                         before_id: Optional[int] = None) -> List[Dict]:
+        """获取对话历史（before_id 不为空时取该消息之前的一页）"""
+        with self._read_connection() as conn:
+            messages = _fetch_dicts(self._query_chat_history(conn, "*", pet_id, limit, before_id))
+        for msg in messages:
+            msg['message'] = _unpack_text(msg['message'])
+        return messages
+    
+    def get_chat_records(self, pet_id: Optional[int] = None, limit: int = 50,
+                         before_id: Optional[int] = None) -> List[ChatMessage]:
+        """获取对话历史（只读记录对象）"""
+        with self._read_connection() as conn:
+            cursor = self._query_chat_history(conn, _record_columns(ChatMessage),
+                                              pet_id, limit, before_id)
+            records = [ChatMessage(*row) for row in cursor.fetchall()]
+        for record in records:
+            record.message = _unpack_text(record.message)
+        return records
+    
+    @_synchronized
     def clear_chat_history(self, pet_id: Optional[int] = None) -> bool:
         """清除对话历史"""
         try:
             self.connect()
+            # 先写完队列中尚未执行的异步消息，避免清除后又被写入
+            self.flush_writes()
             
+            # 指定宠物时按 idx_chat_pet_id 定位要删除的行；
+            # 清空全部时不带 WHERE，chat_history 没有触发器也不被外键引用，
+            # SQLite 走 truncate 优化直接释放整张表的页，不逐行删除
             if pet_id is not None:
                 self.cursor.execute("DELETE FROM chat_history WHERE pet_id = ?", (pet_id,))
             else:
                 self.cursor.execute("DELETE FROM chat_history")
             
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 清除对话历史失败: {e}")
-            self.conn.rollback()
+            logger.exception("清除对话历史失败: %s", e)
             return False
     
     # --- 图片识别相关 ---
     
+    @_synchronized
     def add_image_task(self, image_path: str, recognition_result: str, 
                       task_id: Optional[int] = None, image_hash: str = "") -> int:
         """添加图片识别记录"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO image_tasks 
-                (image_path, image_hash, recognition_result, task_id, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (image_path, image_hash, recognition_result, task_id, now))
-            
-            self.conn.commit()
-            return self.cursor.lastrowid
+            return self._insert("image_tasks", ("created_at",), image_path=image_path,
+                                image_hash=image_hash,
+                                recognition_result=_pack_text(recognition_result),
+                                task_id=task_id)
         except Exception as e:
-            print(f"[数据库] 添加图片识别记录失败: {e}")
-            self.conn.rollback()
+            logger.exception("添加图片识别记录失败: %s", e)
             return 0
     
-    def get_image_tasks(self, limit: int = 20) -> List[Dict]:
-        """获取图片识别记录"""
-        self.connect()
+    def add_image_task_async(self, image_path: str, recognition_result: str,
+                             task_id: Optional[int] = None, image_hash: str = "") -> Future:
+        """异步添加图片识别记录（由后台写线程执行，不阻塞UI线程）"""
+        return self.submit_write(_SQL_ADD_IMAGE_TASK,
+                                 (image_path, image_hash, _pack_text(recognition_result), task_id))
+    
+    @_synchronized
+    def add_image_tasks_bulk(self, image_tasks: Iterable[Dict]) -> int:
+        """
+        批量添加图片识别记录（单个事务，一次提交）
         
-        self.cursor.execute("""
-            SELECT * FROM image_tasks 
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,))
+        Args:
+            image_tasks: 记录字典列表，键与 add_image_task 的参数相同
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        Returns:
+            添加的记录数量，失败返回-1
+        """
+        try:
+            rows = [
+                (t['image_path'], t.get('image_hash', ""),
+                 _pack_text(t['recognition_result']), t.get('task_id'))
+                for t in image_tasks
+            ]
+            
+            with self.transaction():
+                self.cursor.executemany(_SQL_ADD_IMAGE_TASK, rows)
+            
+            return len(rows)
+        except Exception as e:
+            logger.exception("批量添加图片识别记录失败: %s", e)
+            return -1
+    
+    def get_image_tasks(self, limit: int = 20, before_id: Optional[int] = None) -> List[Dict]:
+        """获取图片识别记录（按 id 倒序，before_id 不为空时取该记录之前的一页）"""
+        with self._read_connection() as conn:
+            image_tasks = _fetch_dicts(conn.execute("""
+                SELECT * FROM image_tasks 
+                WHERE id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, (_MAX_ROWID if before_id is None else before_id, limit)))
+        for item in image_tasks:
+            item['recognition_result'] = _unpack_text(item['recognition_result'])
+        return image_tasks
+    
+    def get_image_task_by_hash(self, image_hash: str) -> Optional[Dict]:
+        """按图片哈希获取最近一次的识别记录（用于复用识别结果）"""
+        with self._read_connection() as conn:
+            row = conn.execute("""
+                SELECT * FROM image_tasks 
+                WHERE image_hash = ?
+                ORDER BY id DESC
+                LIMIT 1
+            """, (image_hash,)).fetchone()
+        if not row:
+            return None
+        item = dict(row)
+        item['recognition_result'] = _unpack_text(item['recognition_result'])
+        return item
     
     # ========== v0.5.0 敬业签功能新增方法 ==========
     
     # --- 便签相关 ---
     
+    @_synchronized
     def add_note(self, title: str, content: str = "", category_id: int = None,
                  color: str = "#FFFFFF", is_pinned: bool = False, 
                  is_locked: bool = False) -> int:
         """添加便签"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO notes (title, content, category_id, color, 
-                                 is_pinned, is_locked, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (title, content, category_id, color, is_pinned, is_locked, now, now))
-            
-            self.conn.commit()
-            note_id = self.cursor.lastrowid
-            print(f"[数据库] 添加便签成功: ID={note_id}, 标题={title}")
+            note_id = self._insert("notes", ("created_at", "updated_at"), title=title,
+                                   content=content, category_id=category_id, color=color,
+                                   is_pinned=is_pinned, is_locked=is_locked)
+            logger.debug("添加便签成功: ID=%s, 标题=%s", note_id, title)
             return note_id
         except Exception as e:
-            print(f"[数据库] 添加便签失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加便签失败: %s", e)
             return -1
     
+    @_synchronized
     def get_note(self, note_id: int) -> Optional[Dict]:
         """获取便签"""
         self.connect()
@@ -1354,68 +2120,109 @@ class Database:
     
     def get_all_notes(self, category_id: int = None, is_pinned: bool = None) -> List[Dict]:
         """获取所有便签"""
-        self.connect()
+        return list(self.get_all_notes_iter(category_id, is_pinned))
+    
+    def get_all_notes_iter(self, category_id: int = None,
+                           is_pinned: bool = None) -> Iterator[Dict]:
+        """
+        逐条获取便签（流式读取，适合便签数量较多的场景）
+        
+        Args:
+            category_id: 分类ID筛选
+            is_pinned: 置顶状态筛选
         
+        Yields:
+            便签字典
+        """
+        conn = self._stream_connection()
+        
+        # 使用独立游标，迭代过程中不影响其他查询
         if category_id is not None:
-            self.cursor.execute("""
+            cursor = conn.execute("""
                 SELECT * FROM notes WHERE category_id = ? 
                 ORDER BY is_pinned DESC, updated_at DESC
             """, (category_id,))
         elif is_pinned is not None:
-            self.cursor.execute("""
+            cursor = conn.execute("""
                 SELECT * FROM notes WHERE is_pinned = ? 
                 ORDER BY updated_at DESC
-            """, (1 if is_pinned else 0,))
+            """, (is_pinned,))
         else:
-            self.cursor.execute("""
+            cursor = conn.execute("""
                 SELECT * FROM notes 
                 ORDER BY is_pinned DESC, updated_at DESC
             """)
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        yield from _iter_dicts(cursor)
+    
+    def iter_note_records(self, category_id: int = None) -> Iterator[Note]:
+        """
+        逐条获取便签（只读记录对象）
+        
+        Args:
+            category_id: 分类ID筛选
+        
+        Yields:
+            Note记录
+        """
+        conn = self._stream_connection()
+        columns = _record_columns(Note)
+        
+        if category_id is not None:
+            cursor = conn.execute(f"""
+                SELECT {columns} FROM notes WHERE category_id = ? 
+                ORDER BY is_pinned DESC, updated_at DESC
+            """, (category_id,))
+        else:
+            cursor = conn.execute(f"""
+                SELECT {columns} FROM notes 
+                ORDER BY is_pinned DESC, updated_at DESC
+            """)
+        
+        while True:
+            rows = cursor.fetchmany(FETCH_CHUNK_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield Note(*row)
     
+    @_synchronized
     def update_note(self, note_id: int, **kwargs) -> bool:
         """更新便签"""
         try:
             self.connect()
-            kwargs['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            kwargs.pop('id', None)  # 调用方可能直接传入整条便签数据，ID由 note_id 指定
+            kwargs.pop('updated_at', None)
             
-            fields = ", ".join([f"{k} = ?" for k in kwargs.keys()])
+            # 更新时间由SQLite生成
+            sql = _update_sql("notes", tuple(kwargs), (f"updated_at = {_NOW_SQL}",))
             values = list(kwargs.values()) + [note_id]
             
-            self.cursor.execute(
-                f"UPDATE notes SET {fields} WHERE id = ?",
-                values
-            )
+            self.cursor.execute(sql, values)
             
-            self.conn.commit()
             success = self.cursor.rowcount > 0
             if success:
-                print(f"[数据库] 更新便签成功: ID={note_id}")
+                logger.debug("更新便签成功: ID=%s", note_id)
             return success
         except Exception as e:
-            print(f"[数据库] 更新便签失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("更新便签失败: %s", e)
             return False
     
+    @_synchronized
     def delete_note(self, note_id: int) -> bool:
         """删除便签"""
         try:
             self.connect()
             self.cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
-            self.conn.commit()
             success = self.cursor.rowcount > 0
             if success:
-                print(f"[数据库] 删除便签成功: ID={note_id}")
+                logger.debug("删除便签成功: ID=%s", note_id)
             return success
         except Exception as e:
-            print(f"[数据库] 删除便签失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("删除便签失败: %s", e)
             return False
     
+    @_synchronized
     def search_notes(self, keyword: str) -> List[Dict]:
         """搜索便签"""
         self.connect()
@@ -1427,40 +2234,31 @@ class Database:
             ORDER BY updated_at DESC
         """, (pattern, pattern))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
     # --- 便签分类相关 ---
     
+    @_synchronized
     def add_note_category(self, name: str, color: str = "#4CAF50", 
                          icon: str = None, parent_id: int = None,
                          sort_order: int = 0) -> int:
         """添加便签分类"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO note_categories (name, color, icon, parent_id, 
-                                           sort_order, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (name, color, icon, parent_id, sort_order, now))
-            
-            self.conn.commit()
-            category_id = self.cursor.lastrowid
-            print(f"[数据库] 添加便签分类成功: ID={category_id}, 名称={name}")
+            category_id = self._insert("note_categories", ("created_at",), name=name,
+                                       color=color, icon=icon, parent_id=parent_id,
+                                       sort_order=sort_order)
+            logger.debug("添加便签分类成功: ID=%s, 名称=%s", category_id, name)
             return category_id
         except sqlite3.IntegrityError:
-            print(f"[数据库] 便签分类已存在: {name}")
+            logger.debug("便签分类已存在: %s", name)
             self.cursor.execute("SELECT id FROM note_categories WHERE name = ?", (name,))
             row = self.cursor.fetchone()
             return row[0] if row else -1
         except Exception as e:
-            print(f"[数据库] 添加便签分类失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加便签分类失败: %s", e)
             return -1
     
+    @_synchronized
     def get_all_note_categories(self) -> List[Dict]:
         """获取所有便签分类"""
         self.connect()
@@ -1468,50 +2266,39 @@ class Database:
             SELECT * FROM note_categories 
             ORDER BY sort_order, name
         """)
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def delete_note_category(self, category_id: int) -> bool:
         """删除便签分类"""
         try:
             self.connect()
             self.cursor.execute("DELETE FROM note_categories WHERE id = ?", (category_id,))
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 删除便签分类失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("删除便签分类失败: %s", e)
             return False
     
     # --- 附件相关 ---
     
+    @_synchronized
     def add_attachment(self, entity_type: str, entity_id: int, file_name: str,
                       file_path: str, file_size: int = None, file_type: str = None,
                       thumbnail_path: str = None) -> int:
         """添加附件"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO attachments 
-                (entity_type, entity_id, file_name, file_path, file_size, 
-                 file_type, thumbnail_path, upload_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (entity_type, entity_id, file_name, file_path, file_size,
-                  file_type, thumbnail_path, now))
-            
-            self.conn.commit()
-            attachment_id = self.cursor.lastrowid
-            print(f"[数据库] 添加附件成功: ID={attachment_id}")
+            attachment_id = self._insert("attachments", ("upload_time",),
+                                         entity_type=entity_type, entity_id=entity_id,
+                                         file_name=file_name, file_path=file_path,
+                                         file_size=file_size, file_type=file_type,
+                                         thumbnail_path=thumbnail_path)
+            logger.debug("添加附件成功: ID=%s", attachment_id)
             return attachment_id
         except Exception as e:
-            print(f"[数据库] 添加附件失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加附件失败: %s", e)
             return -1
     
+    @_synchronized
     def get_attachments(self, entity_type: str, entity_id: int) -> List[Dict]:
         """获取实体的附件列表"""
         self.connect()
@@ -1521,47 +2308,36 @@ class Database:
             ORDER BY upload_time DESC
         """, (entity_type, entity_id))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def delete_attachment(self, attachment_id: int) -> bool:
         """删除附件"""
         try:
             self.connect()
             self.cursor.execute("DELETE FROM attachments WHERE id = ?", (attachment_id,))
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 删除附件失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("删除附件失败: %s", e)
             return False
     
     # --- 子任务相关 ---
     
+    @_synchronized
     def add_subtask(self, task_id: int, title: str, description: str = "",
                    priority: int = 1, sort_order: int = 0) -> int:
         """添加子任务"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO subtasks 
-                (task_id, title, description, priority, sort_order, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (task_id, title, description, priority, sort_order, now))
-            
-            self.conn.commit()
-            subtask_id = self.cursor.lastrowid
-            print(f"[数据库] 添加子任务成功: ID={subtask_id}")
+            subtask_id = self._insert("subtasks", ("created_at",), task_id=task_id,
+                                      title=title, description=description,
+                                      priority=priority, sort_order=sort_order)
+            logger.debug("添加子任务成功: ID=%s", subtask_id)
             return subtask_id
         except Exception as e:
-            print(f"[数据库] 添加子任务失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加子任务失败: %s", e)
             return -1
     
+    @_synchronized
     def get_subtasks(self, task_id: int) -> List[Dict]:
         """获取任务的子任务列表"""
         self.connect()
@@ -1571,78 +2347,80 @@ class Database:
             ORDER BY sort_order, created_at
         """, (task_id,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
+    
+    @_synchronized
+    def get_subtask_records(self, task_id: int) -> List[Subtask]:
+        """获取任务的子任务列表（只读记录对象）"""
+        self.connect()
+        self.cursor.execute(f"""
+            SELECT {_record_columns(Subtask)} FROM subtasks 
+            WHERE task_id = ?
+            ORDER BY sort_order, created_at
+        """, (task_id,))
+        
+        return [Subtask(*row) for row in self.cursor.fetchall()]
     
+    @_synchronized
     def update_subtask(self, subtask_id: int, **kwargs) -> bool:
         """更新子任务"""
         try:
             self.connect()
             
+            assignments = []
             if 'status' in kwargs and kwargs['status'] == 'completed':
-                kwargs['completed_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                kwargs.pop('completed_at', None)
+                assignments.append(f"completed_at = {_NOW_SQL}")
             elif 'status' in kwargs and kwargs['status'] == 'pending':
                 kwargs['completed_at'] = None
             
-            fields = ", ".join([f"{k} = ?" for k in kwargs.keys()])
+            sql = _update_sql("subtasks", tuple(kwargs), tuple(assignments))
             values = list(kwargs.values()) + [subtask_id]
             
-            self.cursor.execute(
-                f"UPDATE subtasks SET {fields} WHERE id = ?",
-                values
-            )
+            self.cursor.execute(sql, values)
             
-            self.conn.commit()
             return self.cursor.rowcount > 0
         except Exception as e:
-            print(f"[数据库] 更新子任务失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("更新子任务失败: %s", e)
             return False
     
+    @_synchronized
     def delete_subtask(self, subtask_id: int) -> bool:
         """删除子任务"""
         try:
             self.connect()
             self.cursor.execute("DELETE FROM subtasks WHERE id = ?", (subtask_id,))
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 删除子任务失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("删除子任务失败: %s", e)
             return False
     
     # --- 任务依赖相关 ---
     
+    @_synchronized
     def add_task_dependency(self, task_id: int, depends_on_task_id: int) -> bool:
         """添加任务依赖"""
         try:
             self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
             # 检查是否依赖自己
             if task_id == depends_on_task_id:
-                print("[数据库] 不能依赖自己")
+                logger.warning("不能依赖自己: task_id=%s", task_id)
                 return False
             
-            self.cursor.execute("""
-                INSERT INTO task_dependencies (task_id, depends_on_task_id, created_at)
-                VALUES (?, ?, ?)
-            """, (task_id, depends_on_task_id, now))
+            self._insert("task_dependencies", ("created_at",), task_id=task_id,
+                         depends_on_task_id=depends_on_task_id)
             
-            self.conn.commit()
-            print(f"[数据库] 添加任务依赖成功: task_id={task_id}, depends_on={depends_on_task_id}")
+            logger.debug("添加任务依赖成功: task_id=%s, depends_on=%s", task_id, depends_on_task_id)
             return True
         except sqlite3.IntegrityError:
-            print(f"[数据库] 任务依赖已存在")
+            logger.debug("任务依赖已存在")
             return False
         except Exception as e:
-            print(f"[数据库] 添加任务依赖失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加任务依赖失败: %s", e)
             return False
     
+    @_synchronized
     def get_task_dependencies(self, task_id: int) -> List[Dict]:
         """获取任务的依赖列表"""
         self.connect()
@@ -1651,9 +2429,9 @@ class Database:
             WHERE task_id = ?
         """, (task_id,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def get_dependent_tasks(self, task_id: int) -> List[Dict]:
         """获取依赖该任务的任务列表"""
         self.connect()
@@ -1662,9 +2440,9 @@ class Database:
             WHERE depends_on_task_id = ?
         """, (task_id,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def delete_task_dependency(self, task_id: int, depends_on_task_id: int) -> bool:
         """删除任务依赖"""
         try:
@@ -1674,62 +2452,87 @@ class Database:
                 WHERE task_id = ? AND depends_on_task_id = ?
             """, (task_id, depends_on_task_id))
             
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 删除任务依赖失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("删除任务依赖失败: %s", e)
             return False
     
+    @_synchronized
+    def get_all_task_relations(self, task_ids: Iterable[int]) -> Dict[int, Dict[str, List[int]]]:
+        """
+        批量获取多个任务的依赖关系（一次查询同时取出正向和反向依赖）
+        
+        Args:
+            task_ids: 任务ID列表
+        
+        Returns:
+            {task_id: {'depends_on': [被依赖的任务ID], 'dependents': [依赖它的任务ID]}}
+        """
+        self.connect()
+        ids = list(dict.fromkeys(task_ids))
+        relations = {tid: {'depends_on': [], 'dependents': []} for tid in ids}
+        
+        # 每个ID在SQL中出现两次
+        for chunk in _chunks(ids, MAX_SQL_VARIABLES // 2):
+            placeholders = ", ".join("?" * len(chunk))
+            self.cursor.execute(f"""
+                SELECT task_id, depends_on_task_id FROM task_dependencies 
+                WHERE task_id IN ({placeholders}) OR depends_on_task_id IN ({placeholders})
+            """, chunk + chunk)
+            
+            for task_id, depends_on_id in self.cursor.fetchall():
+                if task_id in relations and depends_on_id not in relations[task_id]['depends_on']:
+                    relations[task_id]['depends_on'].append(depends_on_id)
+                if depends_on_id in relations and task_id not in relations[depends_on_id]['dependents']:
+                    relations[depends_on_id]['dependents'].append(task_id)
+        
+        return relations
+    
+    @_synchronized
     def check_circular_dependency(self, task_id: int, depends_on_task_id: int) -> bool:
-        """检查是否形成循环依赖（使用DFS）"""
+        """检查是否形成循环依赖（按层BFS，每层一次批量查询）"""
         self.connect()
         visited = set()
+        frontier = [depends_on_task_id]
         
-        def dfs(current_id: int) -> bool:
-            if current_id == task_id:
+        while frontier:
+            if task_id in frontier:
                 return True  # 发现循环
-            if current_id in visited:
-                return False
-            visited.add(current_id)
+            visited.update(frontier)
             
-            # 获取当前任务的所有依赖
-            deps = self.get_task_dependencies(current_id)
-            for dep in deps:
-                if dfs(dep['depends_on_task_id']):
-                    return True
-            return False
+            # 一次取出当前层所有任务的依赖
+            next_level = []
+            for chunk in _chunks(frontier, MAX_SQL_VARIABLES):
+                placeholders = ", ".join("?" * len(chunk))
+                self.cursor.execute(f"""
+                    SELECT DISTINCT depends_on_task_id FROM task_dependencies 
+                    WHERE task_id IN ({placeholders})
+                """, chunk)
+                next_level.extend(row[0] for row in self.cursor.fetchall())
+            
+            frontier = [tid for tid in dict.fromkeys(next_level) if tid not in visited]
         
-        return dfs(depends_on_task_id)
+        return False
     
     # --- 任务模板相关 ---
     
+    @_synchronized
     def add_task_template(self, name: str, title: str, description: str = "",
                          category: str = None, priority: int = 1,
                          template_data: str = None) -> int:
         """添加任务模板"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO task_templates 
-                (name, title, description, category, priority, template_data, 
-                 created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (name, title, description, category, priority, template_data, now, now))
-            
-            self.conn.commit()
-            template_id = self.cursor.lastrowid
-            print(f"[数据库] 添加任务模板成功: ID={template_id}, 名称={name}")
+            template_id = self._insert("task_templates", ("created_at", "updated_at"),
+                                       name=name, title=title, description=description,
+                                       category=category, priority=priority,
+                                       template_data=template_data)
+            logger.debug("添加任务模板成功: ID=%s, 名称=%s", template_id, name)
             return template_id
         except Exception as e:
-            print(f"[数据库] 添加任务模板失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加任务模板失败: %s", e)
             return -1
     
+    @_synchronized
     def get_all_task_templates(self) -> List[Dict]:
         """获取所有任务模板"""
         self.connect()
@@ -1737,9 +2540,9 @@ class Database:
             SELECT * FROM task_templates 
             ORDER BY usage_count DESC, updated_at DESC
         """)
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return _fetch_dicts(self.cursor)
     
+    @_synchronized
     def get_task_template(self, template_id: int) -> Optional[Dict]:
         """获取任务模板"""
         self.connect()
@@ -1747,59 +2550,48 @@ class Database:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    @_synchronized
     def update_task_template_usage(self, template_id: int) -> bool:
         """更新模板使用次数"""
         try:
             self.connect()
-            self.cursor.execute("""
+            self.cursor.execute(f"""
                 UPDATE task_templates 
                 SET usage_count = usage_count + 1,
-                    updated_at = ?
+                    updated_at = {_NOW_SQL}
                 WHERE id = ?
-            """, (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), template_id))
+            """, (template_id,))
             
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 更新模板使用次数失败: {e}")
+            logger.exception("更新模板使用次数失败: %s", e)
             return False
     
+    @_synchronized
     def delete_task_template(self, template_id: int) -> bool:
         """删除任务模板"""
         try:
             self.connect()
             self.cursor.execute("DELETE FROM task_templates WHERE id = ?", (template_id,))
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 删除任务模板失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("删除任务模板失败: %s", e)
             return False
     
     # --- 提醒历史相关 ---
     
+    @_synchronized
     def add_reminder_history(self, task_id: int, reminder_time: str,
                             status: str = 'pending') -> int:
         """添加提醒历史记录"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO reminder_history 
-                (task_id, reminder_time, status, created_at)
-                VALUES (?, ?, ?, ?)
-            """, (task_id, reminder_time, status, now))
-            
-            self.conn.commit()
-            return self.cursor.lastrowid
+            return self._insert("reminder_history", ("created_at",), task_id=task_id,
+                                reminder_time=reminder_time, status=status)
         except Exception as e:
-            print(f"[数据库] 添加提醒历史失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加提醒历史失败: %s", e)
             return -1
     
+    @_synchronized
     def update_reminder_history(self, history_id: int, triggered_time: str = None,
                                status: str = None, user_action: str = None,
                                snooze_count: int = None) -> bool:
@@ -1831,227 +2623,212 @@ class Database:
                 values
             )
             
-            self.conn.commit()
             return True
         except Exception as e:
-            print(f"[数据库] 更新提醒历史失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("更新提醒历史失败: %s", e)
             return False
     
     def get_reminder_history(self, task_id: int = None, limit: int = 50) -> List[Dict]:
         """获取提醒历史"""
-        self.connect()
+        return list(self.get_reminder_history_iter(task_id, limit))
+    
+    def get_reminder_history_iter(self, task_id: int = None, limit: int = 50) -> Iterator[Dict]:
+        """逐条获取提醒历史（流式读取）"""
+        conn = self._stream_connection()
         
         if task_id:
-            self.cursor.execute("""
+            cursor = conn.execute("""
                 SELECT * FROM reminder_history 
                 WHERE task_id = ?
                 ORDER BY reminder_time DESC
                 LIMIT ?
             """, (task_id, limit))
         else:
-            self.cursor.execute("""
+            cursor = conn.execute("""
                 SELECT * FROM reminder_history 
                 ORDER BY reminder_time DESC
                 LIMIT ?
             """, (limit,))
         
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        yield from _iter_dicts(cursor)
     
     # --- 提醒模板相关 ---
     
+    @_synchronized
     def add_reminder_template(self, name: str, remind_before_minutes: int = None,
                              repeat_type: str = None, repeat_rule: str = None) -> int:
         """添加提醒模板"""
         try:
-            self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO reminder_templates 
-                (name, remind_before_minutes, repeat_type, repeat_rule, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (name, remind_before_minutes, repeat_type, repeat_rule, now))
-            
-            self.conn.commit()
-            template_id = self.cursor.lastrowid
-            print(f"[数据库] 添加提醒模板成功: ID={template_id}, 名称={name}")
+            template_id = self._insert("reminder_templates", ("created_at",), name=name,
+                                       remind_before_minutes=remind_before_minutes,
+                                       repeat_type=repeat_type, repeat_rule=repeat_rule)
+            logger.debug("添加提醒模板成功: ID=%s, 名称=%s", template_id, name)
             return template_id
         except Exception as e:
-            print(f"[数据库] 添加提醒模板失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("添加提醒模板失败: %s", e)
+            return -1
+    
+    @_synchronized
+    def add_reminder_templates_bulk(self, templates: Iterable[Dict]) -> int:
+        """
+        批量添加提醒模板（单个事务，一次提交）
+        
+        Args:
+            templates: 模板字典列表，键与 add_reminder_template 的参数相同
+        
+        Returns:
+            添加的模板数量，失败返回-1
+        """
+        try:
+            self.connect()
+            rows = [
+                (t['name'], t.get('remind_before_minutes'), t.get('repeat_type'),
+                 t.get('repeat_rule'))
+                for t in templates
+            ]
+            
+            with self.transaction():
+                self.cursor.executemany(_insert_sql(
+                    "reminder_templates",
+                    ("name", "remind_before_minutes", "repeat_type", "repeat_rule"),
+                    ("created_at",)), rows)
+            
+            logger.debug("批量添加提醒模板: %s 个", len(rows))
+            return len(rows)
+        except Exception as e:
+            logger.exception("批量添加提醒模板失败: %s", e)
             return -1
     
     def get_all_reminder_templates(self) -> List[Dict]:
         """获取所有提醒模板"""
-        self.connect()
-        self.cursor.execute("""
-            SELECT * FROM reminder_templates 
-            ORDER BY usage_count DESC, created_at DESC
-        """)
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
+        return list(self.get_all_reminder_templates_iter())
+    
+    def get_all_reminder_templates_iter(self) -> Iterator[Dict]:
+        """逐条获取提醒模板（流式读取）"""
+        conn = self._stream_connection()
+        yield from _iter_dicts(conn.execute(_SQL_GET_REMINDER_TEMPLATES))
     
-    def update_reminder_template_usage(self, template_id: int) -> bool:
-        """更新提醒模板使用次数"""
+    @_synchronized
+    def update_reminder_template_usage(self, template_id: int) -> int:
+        """
+        更新提醒模板使用次数
+        
+        Returns:
+            更新后的使用次数；模板不存在或失败时返回0
+        """
         try:
             self.connect()
-            self.cursor.execute("""
-                UPDATE reminder_templates 
-                SET usage_count = usage_count + 1
-                WHERE id = ?
-            """, (template_id,))
-            
-            self.conn.commit()
-            return True
+            with self.transaction():
+                self.cursor.execute(_with_returning("""
+                    UPDATE reminder_templates 
+                    SET usage_count = usage_count + 1
+                    WHERE id = ?
+                """, "usage_count"), (template_id,))
+                if _HAS_RETURNING:
+                    row = self.cursor.fetchone()
+                else:
+                    row = self.cursor.execute(
+                        "SELECT usage_count FROM reminder_templates WHERE id = ?",
+                        (template_id,)).fetchone()
+            return row[0] if row else 0
         except Exception as e:
-            print(f"[数据库] 更新提醒模板使用次数失败: {e}")
-            return False
+            logger.exception("更新提醒模板使用次数失败: %s", e)
+            return 0
     
     # --- 视图设置相关 ---
     
+    @_synchronized
     def save_view_settings(self, view_type: str, settings_data: str,
                           is_default: bool = False, user_id: str = 'default') -> int:
         """保存视图设置"""
         try:
             self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             
-            # 检查是否已存在
-            self.cursor.execute("""
-                SELECT id FROM view_settings 
-                WHERE view_type = ? AND user_id = ?
-            """, (view_type, user_id))
+            flag = 1 if is_default else 0
             
-            row = self.cursor.fetchone()
-            if row:
-                # 更新
-                self.cursor.execute("""
-                    UPDATE view_settings 
-                    SET settings_data = ?, is_default = ?, updated_at = ?
-                    WHERE id = ?
-                """, (settings_data, is_default, now, row[0]))
-                self.conn.commit()
-                return row[0]
-            else:
-                # 插入
-                self.cursor.execute("""
+            # 单条UPSERT：不存在则插入，已存在则更新（依赖 UNIQUE(view_type, user_id)）
+            with self.transaction():
+                self.cursor.execute(_with_returning(f"""
                     INSERT INTO view_settings 
                     (view_type, user_id, settings_data, is_default, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (view_type, user_id, settings_data, is_default, now, now))
-                self.conn.commit()
-                return self.cursor.lastrowid
+                    VALUES (?, ?, ?, ?, {_NOW_SQL}, {_NOW_SQL})
+                    ON CONFLICT(view_type, user_id) DO UPDATE SET
+                        settings_data = excluded.settings_data,
+                        is_default = excluded.is_default,
+                        updated_at = excluded.updated_at
+                """), (view_type, user_id, settings_data, flag))
+                if _HAS_RETURNING:
+                    settings_id = self.cursor.fetchone()[0]
+                else:
+                    # 走 DO UPDATE 分支时 lastrowid 不是该行，按唯一键查回ID
+                    settings_id = self.cursor.execute(
+                        "SELECT id FROM view_settings WHERE view_type = ? AND user_id = ?",
+                        (view_type, user_id)).fetchone()[0]
+            return settings_id
         except Exception as e:
-            print(f"[数据库] 保存视图设置失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("保存视图设置失败: %s", e)
             return -1
     
+    @_synchronized
     def get_view_settings(self, view_type: str, user_id: str = 'default') -> Optional[Dict]:
         """获取视图设置"""
         self.connect()
-        self.cursor.execute("""
-            SELECT * FROM view_settings 
-            WHERE view_type = ? AND user_id = ?
-        """, (view_type, user_id))
+        self.cursor.execute(_SQL_GET_VIEW_SETTINGS, (view_type, user_id))
         
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
     # --- 备份记录相关 ---
     
+    @_synchronized
     def add_backup_record(self, backup_file_path: str, backup_type: str = 'manual',
                          file_size: int = None, record_count: int = None,
                          description: str = None) -> int:
         """添加备份记录"""
+        try:
+            return self._insert("backup_records", ("backup_time",),
+                                backup_file_path=backup_file_path, backup_type=backup_type,
+                                file_size=file_size, record_count=record_count,
+                                description=description)
+        except Exception as e:
+            logger.exception("添加备份记录失败: %s", e)
+            return -1
+    
+    @_synchronized
+    def add_backup_records_bulk(self, records: Iterable[Dict]) -> int:
+        """
+        批量添加备份记录（单个事务，一次提交）
+        
+        Args:
+            records: 记录字典列表，键与 add_backup_record 的参数相同
+        
+        Returns:
+            添加的记录数量，失败返回-1
+        """
         try:
             self.connect()
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            self.cursor.execute("""
-                INSERT INTO backup_records 
-                (backup_file_path, backup_type, file_size, record_count, 
-                 backup_time, description)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (backup_file_path, backup_type, file_size, record_count, now, description))
-            
-            self.conn.commit()
-            return self.cursor.lastrowid
+            rows = [
+                (r['backup_file_path'], r.get('backup_type', 'manual'), r.get('file_size'),
+                 r.get('record_count'), r.get('description'))
+                for r in records
+            ]
+            
+            with self.transaction():
+                self.cursor.executemany(_insert_sql(
+                    "backup_records",
+                    ("backup_file_path", "backup_type", "file_size", "record_count", "description"),
+                    ("backup_time",)), rows)
+            
+            return len(rows)
         except Exception as e:
-            print(f"[数据库] 添加备份记录失败: {e}")
-            if self.conn:
-                self.conn.rollback()
+            logger.exception("批量添加备份记录失败: %s", e)
             return -1
     
     def get_backup_records(self, limit: int = 20) -> List[Dict]:
         """获取备份记录"""
-        self.connect()
-        self.cursor.execute("""
-            SELECT * FROM backup_records 
-            ORDER BY backup_time DESC
-            LIMIT ?
-        """, (limit,))
-        
-        rows = self.cursor.fetchall()
-        return [dict(row) for row in rows]
-
-
-# 测试代码
-if __name__ == "__main__":
-    print("=" * 60)
-    print("数据库模块测试")
-    print("=" * 60)
-    
-    # 创建数据库实例
-    db = Database("data/test_tasks.db")
-    
-    # 测试添加任务
-    task_id1 = db.add_task(
-        title="完成项目文档",
-        description="编写桌面灵宠的开发文档",
-        due_date="2025-10-15 18:00:00",
-        priority=3,
-        category="work"
-    )
+        return list(self.get_backup_records_iter(limit))
     
-    task_id2 = db.add_task(
-        title="学习PyQt5",
-        description="学习PyQt5的窗口和动画功能",
-        due_date="2025-10-20 12:00:00",
-        priority=2,
-        category="study"
-    )
-    
-    # 测试获取所有任务
-    print("\n所有任务：")
-    tasks = db.get_all_tasks()
-    for task in tasks:
-        print(f"  [{task['id']}] {task['title']} - 优先级:{task['priority']}")
-    
-    # 测试更新任务
-    print("\n更新任务...")
-    db.update_task(task_id1, status="completed")
-    
-    # 测试统计
-    print("\n任务统计：")
-    stats = db.get_statistics()
-    for key, value in stats.items():
-        print(f"  {key}: {value}")
-    
-    # 测试搜索
-    print("\n搜索'PyQt'：")
-    results = db.search_tasks("PyQt")
-    for task in results:
-        print(f"  [{task['id']}] {task['title']}")
-    
-    # 关闭数据库
-    db.close()
-    
-    print("\n" + "=" * 60)
-    print("测试完成！")
-    print("=" * 60)
-
+    def get_backup_records_iter(self, limit: int = 20) -> Iterator[Dict]:
+        """逐条获取备份记录（流式读取）"""
+        conn = self._stream_connection()
+        yield from _iter_dicts(conn.execute(_SQL_GET_BACKUP_RECORDS, (limit,)))
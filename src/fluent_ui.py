@@ -13,126 +13,136 @@ import sys
 class FluentCard(QFrame):
     """Fluent Design卡片组件"""
     
+    _QSS = """
+        FluentCard {
+            background-color: rgba(255, 255, 255, 0.8);
+            border-radius: 8px;
+            border: 1px solid rgba(255, 255, 255, 0.2);
+            padding: 16px;
+            backdrop-filter: blur(20px);
+        }
+        FluentCard:hover {
+            background-color: rgba(255, 255, 255, 0.9);
+            border-color: rgba(0, 120, 212, 0.3);
+        }
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFrameStyle(QFrame.NoFrame)
         self.setAttribute(Qt.WA_StyledBackground, True)
-        self.setStyleSheet("""
-            FluentCard {
-                background-color: rgba(255, 255, 255, 0.8);
-                border-radius: 8px;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                padding: 16px;
-                backdrop-filter: blur(20px);
-            }
-            FluentCard:hover {
-                background-color: rgba(255, 255, 255, 0.9);
-                border-color: rgba(0, 120, 212, 0.3);
-            }
-        """)
+        self.setStyleSheet(self._QSS)
 
 class FluentButton(QPushButton):
     """Fluent Design按钮组件"""
     
+    _QSS = """
+        FluentButton[styleType="primary"] {
+            background-color: #0078D4;
+            color: white;
+            border: none;
+            border-radius: 2px;
+            padding: 8px 16px;
+            font-weight: 400;
+            font-size: 14px;
+        }
+        FluentButton[styleType="primary"]:hover {
+            background-color: #106EBE;
+        }
+        FluentButton[styleType="primary"]:pressed {
+            background-color: #005A9E;
+        }
+        FluentButton[styleType="secondary"] {
+            background-color: transparent;
+            color: #0078D4;
+            border: 1px solid #0078D4;
+            border-radius: 2px;
+            padding: 8px 16px;
+            font-weight: 400;
+            font-size: 14px;
+        }
+        FluentButton[styleType="secondary"]:hover {
+            background-color: rgba(0, 120, 212, 0.1);
+        }
+    """
+    
     def __init__(self, text="", parent=None, style="primary"):
         super().__init__(text, parent)
         self.style_type = style
         self.setMinimumHeight(32)
         self.setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet(self._QSS)
         self.apply_style()
     
     def apply_style(self):
-        if self.style_type == "primary":
-            self.setStyleSheet("""
-                FluentButton {
-                    background-color: #0078D4;
-                    color: white;
-                    border: none;
-                    border-radius: 2px;
-                    padding: 8px 16px;
-                    font-weight: 400;
-                    font-size: 14px;
-                }
-                FluentButton:hover {
-                    background-color: #106EBE;
-                }
-                FluentButton:pressed {
-                    background-color: #005A9E;
-                }
-            """)
-        elif self.style_type == "secondary":
-            self.setStyleSheet("""
-                FluentButton {
-                    background-color: transparent;
-                    color: #0078D4;
-                    border: 1px solid #0078D4;
-                    border-radius: 2px;
-                    padding: 8px 16px;
-                    font-weight: 400;
-                    font-size: 14px;
-                }
-                FluentButton:hover {
-                    background-color: rgba(0, 120, 212, 0.1);
-                }
-            """)
+        # 样式表按 styleType 属性匹配变体，修改后需要重新polish
+        self.setProperty("styleType", self.style_type)
+        self.style().unpolish(self)
+        self.style().polish(self)
 
 class FluentInput(QLineEdit):
     """Fluent Design输入框组件"""
     
+    _QSS = """
+        FluentInput {
+            border: 1px solid #8A8886;
+            border-radius: 2px;
+            padding: 8px 12px;
+            font-size: 14px;
+            background-color: white;
+        }
+        FluentInput:focus {
+            border-color: #0078D4;
+            outline: none;
+        }
+        FluentInput:hover {
+            border-color: #323130;
+        }
+    """
+    
     def __init__(self, placeholder="", parent=None):
         super().__init__(parent)
         self.setPlaceholderText(placeholder)
         self.setMinimumHeight(32)
-        self.setStyleSheet("""
-            FluentInput {
-                border: 1px solid #8A8886;
-                border-radius: 2px;
-                padding: 8px 12px;
-                font-size: 14px;
-                background-color: white;
-            }
-            FluentInput:focus {
-                border-color: #0078D4;
-                outline: none;
-            }
-            FluentInput:hover {
-                border-color: #323130;
-            }
-        """)
+        self.setStyleSheet(self._QSS)
 
 class FluentProgressBar(QProgressBar):
     """Fluent Design进度条组件"""
     
+    _QSS = """
+        FluentProgressBar {
+            border: none;
+            border-radius: 2px;
+            background-color: #E1DFDD;
+        }
+        FluentProgressBar::chunk {
+            background-color: #0078D4;
+            border-radius: 2px;
+        }
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(4)
         self.setTextVisible(False)
-        self.setStyleSheet("""
-            FluentProgressBar {
-                border: none;
-                border-radius: 2px;
-                background-color: #E1DFDD;
-            }
-            FluentProgressBar::chunk {
-                background-color: #0078D4;
-                border-radius: 2px;
-            }
-        """)
+        self.setStyleSheet(self._QSS)
 
 class FluentAcrylicWindow(QWidget):
     """Fluent Design毛玻璃窗口"""
     
+    _QSS = """
+        FluentAcrylicWindow {
+            background-color: rgba(243, 242, 241, 0.8);
+            backdrop-filter: blur(20px);
+            color: #323130;
+        }
+    """
+    
     def __init__(self, title="", parent=None):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.setAttribute(Qt.WA_TranslucentBackground, True)
-        self.setStyleSheet("""
-            FluentAcrylicWindow {
-                background-color: rgba(243, 242, 241, 0.8);
-                backdrop-filter: blur(20px);
-                color: #323130;
-            }
-        """)
+        self.setStyleSheet(self._QSS)
 
 class FluentPetWindow(FluentAcrylicWindow):
     """Fluent Design宠物窗口"""
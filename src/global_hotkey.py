@@ -5,6 +5,7 @@
 Global Hotkey Module - 注册全局快捷键
 """
 
+import re
 import sys
 from typing import Dict, Callable, Optional
 
@@ -23,6 +24,9 @@ except ImportError:
     QObject = object
     pyqtSignal = None
 
+# 单独的 win 键名统一写成 windows（已写成 windows 的不重复替换）
+_WIN_KEY_RE = re.compile(r'\bwin\b')
+
 
 class GlobalHotkeyManager(QObject if 'QObject' in globals() else object):
     """全局快捷键管理器"""
@@ -113,16 +117,7 @@ class GlobalHotkeyManager(QObject if 'QObject' in globals() else object):
         Returns:
             标准化后的快捷键
         """
-        # 转换为小写
-        hotkey = hotkey.lower()
-        
-        # 替换常见格式
-        hotkey = hotkey.replace('ctrl', 'ctrl')
-        hotkey = hotkey.replace('alt', 'alt')
-        hotkey = hotkey.replace('shift', 'shift')
-        hotkey = hotkey.replace('win', 'windows')
-        
-        return hotkey
+        return _WIN_KEY_RE.sub('windows', hotkey.lower())
     
     def register_default_hotkeys(self, callbacks: Dict[str, Callable]):
         """
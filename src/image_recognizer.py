@@ -6,10 +6,14 @@ Image Recognizer Module - 使用OpenAI Vision API识别图片并生成任务
 """
 
 import os
+import io
+import re
+import atexit
 import base64
 import hashlib
-from PyQt5.QtCore import QObject, pyqtSignal, QThread
-from typing import Optional, Dict
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool
+from typing import Optional, Dict, Tuple
 import json
 
 # API集成
@@ -25,27 +29,173 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
 
-class ImageRecognitionWorker(QThread):
-    """图片识别工作线程"""
+# 识别结果的JSON编解码（优先使用 orjson，未安装时使用标准库）
+try:
+    import orjson
     
-    # 信号
-    recognition_completed = pyqtSignal(str, dict)  # 识别完成（图片路径，结果）
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+    
+    loads = orjson.loads
+except ImportError:
+    def dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+    
+    loads = json.loads
+
+# 回复中的代码块（```json ... ``` 或 ``` ... ```），取其中的内容解析JSON
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+# 超过该大小的图片先缩小再上传（Vision API 本身会把图片缩放到 2048px 以内）
+DOWNSCALE_THRESHOLD = 2 * 1024 * 1024
+MAX_IMAGE_SIDE = 2048
+
+# 读取图片时每次读取的字节数（3的倍数，分块base64编码不产生中间填充）
+IMAGE_READ_CHUNK = 3 * 256 * 1024
+
+
+# 各识别线程共用的HTTP会话（复用到API的TCP/TLS连接），首次请求时创建
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def detect_image_kind(image_path: str) -> Optional[str]:
+    """
+    按文件头判断图片格式（不依赖扩展名）
+    
+    Returns:
+        'jpeg'、'png'、'gif'、'bmp'、'webp'，无法识别时返回 None
+    """
+    with open(image_path, 'rb') as f:
+        head = f.read(12)
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if head.startswith(b'BM'):
+        return 'bmp'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+
+def get_http_session():
+    """获取共用的 requests.Session，退出程序时自动关闭"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = requests.Session()
+            atexit.register(_http_session.close)
+        return _http_session
+
+
+def read_image_base64(image_path: str) -> str:
+    """分块读取图片并编码为base64字符串"""
+    parts = []
+    rest = b""
+    with open(image_path, 'rb') as f:
+        while chunk := f.read(IMAGE_READ_CHUNK):
+            # 不足3字节的尾部留到下一块一起编码
+            chunk = rest + chunk
+            cut = len(chunk) - len(chunk) % 3
+            parts.append(base64.b64encode(chunk[:cut]))
+            rest = chunk[cut:]
+    parts.append(base64.b64encode(rest))
+    return b"".join(parts).decode('ascii')
+
+
+def image_md5(image_path: str) -> str:
+    """计算图片的MD5哈希（作为识别结果的去重键）"""
+    with open(image_path, 'rb') as f:
+        # Python 3.11+ 的 file_digest 直接 readinto 复用缓冲区，并在计算时释放GIL
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        md5 = hashlib.md5()
+        while chunk := f.read(IMAGE_READ_CHUNK):
+            md5.update(chunk)
+        return md5.hexdigest()
+
+
+def encode_image(image_path: str, image_kind: str = 'jpeg') -> Tuple[str, str]:
+    """
+    生成上传用的base64编码
+    
+    大图在本地缩小到 MAX_IMAGE_SIDE 以内并重新编码为JPEG，
+    避免把二十多MB的base64字符串放进请求体。
+    
+    Args:
+        image_path: 图片路径
+        image_kind: 原图格式（detect_image_kind 的结果）
+    
+    Returns:
+        (base64字符串, 上传内容的图片格式)
+    """
+    if PIL_AVAILABLE and os.path.getsize(image_path) > DOWNSCALE_THRESHOLD:
+        with Image.open(image_path) as img:
+            if max(img.size) > MAX_IMAGE_SIDE:
+                img.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+                buffer = io.BytesIO()
+                img.convert('RGB').save(buffer, 'JPEG', quality=90)
+                return base64.b64encode(buffer.getbuffer()).decode('ascii'), 'jpeg'
+    return read_image_base64(image_path), image_kind
+
+
+# 同时进行的识别请求数上限（API有速率限制）
+MAX_CONCURRENT_RECOGNITIONS = 4
+
+
+class RecognitionSignals(QObject):
+    """识别任务的信号（QRunnable 本身不能定义信号）"""
+    
+    recognition_completed = pyqtSignal(str, dict, str, str)  # 识别完成（图片路径，结果，图片哈希，结果JSON）
+    cached_result = pyqtSignal(str, dict)  # 复用已有识别结果（图片路径，结果）
     error_occurred = pyqtSignal(str)  # 错误
+
+
+class ImageRecognitionWorker(QRunnable):
+    """图片识别任务（在线程池中执行）"""
     
-    def __init__(self, api_key: str, image_path: str):
+    def __init__(self, api_key: str, image_path: str, image_kind: str = 'jpeg',
+                 database=None):
         super().__init__()
+        self.signals = RecognitionSignals()
         self.api_key = api_key
         self.image_path = image_path
+        self.image_kind = image_kind
+        self.database = database
+    
+    def load_cached_result(self, image_hash: str) -> Optional[Dict]:
+        """按图片哈希查找数据库中已有的识别结果"""
+        if not self.database:
+            return None
+        cached = self.database.get_image_task_by_hash(image_hash)
+        if not cached or not cached.get('recognition_result'):
+            return None
+        try:
+            result = loads(cached['recognition_result'])
+        except json.JSONDecodeError:
+            return None
+        return result if isinstance(result, dict) else None
     
     def run(self):
         """执行识别"""
         try:
-            # 读取并编码图片
-            with open(self.image_path, 'rb') as f:
-                image_data = f.read()
+            # 先按原文件哈希查找已有结果，命中时不再解码/缩放/编码图片，也不调用API
+            image_hash = image_md5(self.image_path)
+            cached = self.load_cached_result(image_hash)
+            if cached is not None:
+                self.signals.cached_result.emit(self.image_path, cached)
+                return
             
-            base64_image = base64.b64encode(image_data).decode('utf-8')
+            base64_image, image_kind = encode_image(self.image_path, self.image_kind)
             
             # 调用OpenAI Vision API
             headers = {
@@ -78,7 +228,7 @@ class ImageRecognitionWorker(QThread):
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
+                                    "url": f"data:image/{image_kind};base64,{base64_image}"
                                 }
                             }
                         ]
@@ -87,7 +237,7 @@ class ImageRecognitionWorker(QThread):
                 "max_tokens": 1000
             }
             
-            response = requests.post(
+            response = get_http_session().post(
                 "https://api.openai.com/v1/chat/completions",
                 headers=headers,
                 json=payload,
@@ -101,18 +251,10 @@ class ImageRecognitionWorker(QThread):
                 # 尝试解析JSON
                 try:
                     # 提取JSON部分（可能包含在代码块中）
-                    if '```json' in content:
-                        json_start = content.find('```json') + 7
-                        json_end = content.find('```', json_start)
-                        json_str = content[json_start:json_end].strip()
-                    elif '```' in content:
-                        json_start = content.find('```') + 3
-                        json_end = content.find('```', json_start)
-                        json_str = content[json_start:json_end].strip()
-                    else:
-                        json_str = content
+                    match = _FENCE_RE.search(content)
+                    json_str = match.group(1).strip() if match else content
                     
-                    recognition_result = json.loads(json_str)
+                    recognition_result = loads(json_str)
                 except json.JSONDecodeError:
                     # 如果不是JSON格式，创建简单结果
                     recognition_result = {
@@ -120,15 +262,17 @@ class ImageRecognitionWorker(QThread):
                         'tasks': [],
                         'category': '其他'
                     }
+                    json_str = dumps(recognition_result)
                 
-                self.recognition_completed.emit(self.image_path, recognition_result)
+                # 原始JSON文本随结果一起传出，保存时不再重新序列化
+                self.signals.recognition_completed.emit(self.image_path, recognition_result, image_hash, json_str)
             else:
-                self.error_occurred.emit(f"API调用失败: {response.status_code} - {response.text}")
+                self.signals.error_occurred.emit(f"API调用失败: {response.status_code} - {response.text}")
                 
         except FileNotFoundError:
-            self.error_occurred.emit(f"图片文件不存在: {self.image_path}")
+            self.signals.error_occurred.emit(f"图片文件不存在: {self.image_path}")
         except Exception as e:
-            self.error_occurred.emit(f"识别失败: {str(e)}")
+            self.signals.error_occurred.emit(f"识别失败: {str(e)}")
 
 
 class ImageRecognizer(QObject):
@@ -144,7 +288,10 @@ class ImageRecognizer(QObject):
         
         self.database = database
         self.api_key = self.load_api_key()
-        self.worker = None
+        
+        # 识别任务在线程池中执行，多张图片可以同时识别，线程可复用
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(MAX_CONCURRENT_RECOGNITIONS)
         
         print("[图片识别] 初始化完成")
     
@@ -189,36 +336,46 @@ class ImageRecognizer(QObject):
             self.error_occurred.emit("图片文件过大（最大20MB）")
             return
         
+        # 按文件头检查实际格式，扩展名与内容不符或文件损坏时不再调用API
+        image_kind = detect_image_kind(image_path)
+        if image_kind is None:
+            self.error_occurred.emit(f"不支持的图片格式: {image_path}")
+            return
+        
         print(f"[图片识别] 开始识别: {image_path}")
         
-        # 创建工作线程
-        self.worker = ImageRecognitionWorker(self.api_key, image_path)
-        self.worker.recognition_completed.connect(self.on_recognition_completed)
-        self.worker.error_occurred.connect(self.on_error)
-        self.worker.start()
+        # 提交到线程池（读图、算哈希和查已有结果都在工作线程中完成）
+        worker = ImageRecognitionWorker(self.api_key, image_path, image_kind, self.database)
+        worker.signals.recognition_completed.connect(self.on_recognition_completed)
+        worker.signals.cached_result.connect(self.on_cached_result)
+        worker.signals.error_occurred.connect(self.on_error)
+        self.thread_pool.start(worker)
     
-    def on_recognition_completed(self, image_path: str, result: Dict):
+    def on_recognition_completed(self, image_path: str, result: Dict, image_hash: str,
+                                 result_json: str):
         """识别完成"""
         print(f"[图片识别] 识别完成")
         print(f"  摘要: {result.get('summary', '')}")
         print(f"  任务数: {len(result.get('tasks', []))}")
         
-        # 计算图片哈希
-        try:
-            with open(image_path, 'rb') as f:
-                image_hash = hashlib.md5(f.read()).hexdigest()
-        except:
-            image_hash = ""
-        
         # 保存识别结果到数据库
         if self.database:
-            self.database.add_image_task(
+            self.database.add_image_task_async(
                 image_path=image_path,
                 image_hash=image_hash,
-                recognition_result=json.dumps(result, ensure_ascii=False),
+                recognition_result=result_json,
                 task_id=None
             )
         
+        self.emit_result(result)
+    
+    def on_cached_result(self, image_path: str, result: Dict):
+        """复用已有识别结果"""
+        print(f"[图片识别] 使用已有识别结果: {image_path}")
+        self.emit_result(result)
+    
+    def emit_result(self, result: Dict):
+        """发送识别结果和生成的任务"""
         # 发送信号
         self.recognition_completed.emit(result)
         
@@ -240,7 +397,12 @@ class ImageRecognizer(QObject):
     def is_supported_image(self, file_path: str) -> bool:
         """检查是否支持的图片格式"""
         ext = os.path.splitext(file_path)[1].lower()
-        return ext in self.get_supported_formats()
+        if ext not in self.get_supported_formats():
+            return False
+        try:
+            return detect_image_kind(file_path) is not None
+        except OSError:
+            return False
 
 
 # 测试代码
@@ -5,13 +5,16 @@
 Jingyeqian UI Module - 提供扁平化现代化界面组件
 """
 
-from PyQt5.QtWidgets import *
-from PyQt5.QtCore import *
-from PyQt5.QtGui import *
-import sys
+from types import MappingProxyType
 
-# 扁平化设计颜色方案
-JYQ_COLORS = {
+from PyQt5.QtWidgets import (QFrame, QPushButton, QLineEdit,
+                             QTextEdit, QComboBox, QListWidget, QTableWidget,
+                             QLabel, QSizePolicy)
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QIcon, QFont, QColor, QPainter
+
+# 扁平化设计颜色方案（只读：组件样式表在导入时按这些颜色生成一次）
+JYQ_COLORS = MappingProxyType({
     # 主色调
     'primary': '#007AFF',           # 蓝色
     'primary_dark': '#0051D5',      # 深蓝
@@ -39,333 +42,364 @@ JYQ_COLORS = {
     
     # 阴影
     'shadow': 'rgba(0, 0, 0, 0.1)', # 阴影
-}
+})
+
+
+def _repolish(widget):
+    """动态属性改变后重新匹配样式（只影响该组件本身）"""
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
 
 class JYQCard(QFrame):
     """扁平化卡片组件"""
     
+    _QSS = f"""
+        JYQCard {{
+            background-color: {JYQ_COLORS['surface']};
+            border-radius: 12px;
+            border: 1px solid {JYQ_COLORS['border']};
+            padding: 16px;
+        }}
+    """
+    
     def __init__(self, parent=None, elevation=0):
         super().__init__(parent)
+        self.setStyleSheet(self._QSS)
         self.elevation = elevation
         self.setFrameStyle(QFrame.NoFrame)
-        self.setAttribute(Qt.WA_StyledBackground, True)
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        shadow = ""
-        if self.elevation > 0:
-            shadow = f"box-shadow: 0 {self.elevation}px {self.elevation * 2}px {JYQ_COLORS['shadow']};"
-        
-        self.setStyleSheet(f"""
-            JYQCard {{
-                background-color: {JYQ_COLORS['surface']};
-                border-radius: 12px;
-                border: 1px solid {JYQ_COLORS['border']};
-                padding: 16px;
-                {shadow}
-            }}
-        """)
 
 class JYQButton(QPushButton):
     """扁平化按钮组件"""
     
+    _QSS = f"""
+        JYQButton {{
+            background-color: {JYQ_COLORS['surface']};
+            color: {JYQ_COLORS['text_primary']};
+            border: none;
+            border-radius: 8px;
+            padding: 10px 20px;
+            font-size: 15px;
+            font-weight: 500;
+        }}
+        JYQButton:hover {{
+            background-color: {JYQ_COLORS['background']};
+        }}
+        JYQButton:pressed {{
+            opacity: 0.8;
+        }}
+        JYQButton[styleType="primary"] {{
+            background-color: {JYQ_COLORS['primary']};
+            color: #FFFFFF;
+        }}
+        JYQButton[styleType="primary"]:hover {{
+            background-color: {JYQ_COLORS['primary_dark']};
+        }}
+        JYQButton[styleType="secondary"] {{
+            background-color: {JYQ_COLORS['surface']};
+            color: {JYQ_COLORS['primary']};
+        }}
+        JYQButton[styleType="secondary"]:hover {{
+            background-color: {JYQ_COLORS['background']};
+        }}
+        JYQButton[styleType="danger"] {{
+            background-color: {JYQ_COLORS['error']};
+            color: #FFFFFF;
+        }}
+        JYQButton[styleType="danger"]:hover {{
+            background-color: #D70015;
+        }}
+        JYQButton[sizeType="small"] {{
+            padding: 6px 12px;
+            font-size: 13px;
+        }}
+        JYQButton[sizeType="large"] {{
+            padding: 12px 24px;
+            font-size: 17px;
+        }}
+        JYQButton:disabled, JYQButton[styleType]:disabled {{
+            background-color: {JYQ_COLORS['divider']};
+            color: {JYQ_COLORS['text_tertiary']};
+        }}
+    """
+    
     def __init__(self, text="", parent=None, style="primary", size="medium"):
         super().__init__(text, parent)
+        self.setStyleSheet(self._QSS)
         self.style_type = style
         self.size_type = size
         self.setCursor(Qt.PointingHandCursor)
         self.update_style()
     
     def update_style(self):
-        """更新样式"""
-        # 根据样式选择颜色
-        if self.style_type == "primary":
-            bg_color = JYQ_COLORS['primary']
-            text_color = "#FFFFFF"
-            hover_color = JYQ_COLORS['primary_dark']
-        elif self.style_type == "secondary":
-            bg_color = JYQ_COLORS['surface']
-            text_color = JYQ_COLORS['primary']
-            hover_color = JYQ_COLORS['background']
-        elif self.style_type == "danger":
-            bg_color = JYQ_COLORS['error']
-            text_color = "#FFFFFF"
-            hover_color = "#D70015"
-        else:
-            bg_color = JYQ_COLORS['surface']
-            text_color = JYQ_COLORS['text_primary']
-            hover_color = JYQ_COLORS['background']
-        
-        # 根据尺寸选择大小
-        if self.size_type == "small":
-            padding = "6px 12px"
-            font_size = "13px"
-        elif self.size_type == "large":
-            padding = "12px 24px"
-            font_size = "17px"
-        else:  # medium
-            padding = "10px 20px"
-            font_size = "15px"
-        
-        self.setStyleSheet(f"""
-            JYQButton {{
-                background-color: {bg_color};
-                color: {text_color};
-                border: none;
-                border-radius: 8px;
-                padding: {padding};
-                font-size: {font_size};
-                font-weight: 500;
-            }}
-            JYQButton:hover {{
-                background-color: {hover_color};
-            }}
-            JYQButton:pressed {{
-                opacity: 0.8;
-            }}
-            JYQButton:disabled {{
-                background-color: {JYQ_COLORS['divider']};
-                color: {JYQ_COLORS['text_tertiary']};
-            }}
-        """)
+        """更新样式（按 style_type/size_type 设置动态属性）"""
+        self.setProperty("styleType", self.style_type)
+        self.setProperty("sizeType", self.size_type)
+        _repolish(self)
+    
+    def set_style_type(self, style):
+        """切换按钮样式（primary/secondary/danger），只重新匹配本按钮"""
+        self.style_type = style
+        self.setProperty("styleType", style)
+        _repolish(self)
+    
+    def set_size_type(self, size):
+        """切换按钮尺寸（small/medium/large）"""
+        self.size_type = size
+        self.setProperty("sizeType", size)
+        _repolish(self)
 
 class JYQInput(QLineEdit):
     """扁平化输入框组件"""
     
+    _QSS = f"""
+        JYQInput {{
+            background-color: {JYQ_COLORS['surface']};
+            border: 1px solid {JYQ_COLORS['border']};
+            border-radius: 8px;
+            padding: 10px 12px;
+            font-size: 15px;
+            color: {JYQ_COLORS['text_primary']};
+        }}
+        JYQInput:focus {{
+            border: 2px solid {JYQ_COLORS['primary']};
+            padding: 9px 11px;
+        }}
+        JYQInput::placeholder {{
+            color: {JYQ_COLORS['text_tertiary']};
+        }}
+    """
+    
     def __init__(self, placeholder="", parent=None):
         super().__init__(parent)
+        self.setStyleSheet(self._QSS)
         self.setPlaceholderText(placeholder)
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        self.setStyleSheet(f"""
-            JYQInput {{
-                background-color: {JYQ_COLORS['surface']};
-                border: 1px solid {JYQ_COLORS['border']};
-                border-radius: 8px;
-                padding: 10px 12px;
-                font-size: 15px;
-                color: {JYQ_COLORS['text_primary']};
-            }}
-            JYQInput:focus {{
-                border: 2px solid {JYQ_COLORS['primary']};
-                padding: 9px 11px;
-            }}
-            JYQInput::placeholder {{
-                color: {JYQ_COLORS['text_tertiary']};
-            }}
-        """)
 
 class JYQTextEdit(QTextEdit):
     """扁平化文本编辑框组件"""
     
+    _QSS = f"""
+        JYQTextEdit {{
+            background-color: {JYQ_COLORS['surface']};
+            border: 1px solid {JYQ_COLORS['border']};
+            border-radius: 8px;
+            padding: 10px 12px;
+            font-size: 15px;
+            color: {JYQ_COLORS['text_primary']};
+        }}
+        JYQTextEdit:focus {{
+            border: 2px solid {JYQ_COLORS['primary']};
+            padding: 9px 11px;
+        }}
+    """
+    
     def __init__(self, placeholder="", parent=None):
         super().__init__(parent)
+        self.setStyleSheet(self._QSS)
         self.setPlaceholderText(placeholder)
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        self.setStyleSheet(f"""
-            JYQTextEdit {{
-                background-color: {JYQ_COLORS['surface']};
-                border: 1px solid {JYQ_COLORS['border']};
-                border-radius: 8px;
-                padding: 10px 12px;
-                font-size: 15px;
-                color: {JYQ_COLORS['text_primary']};
-            }}
-            JYQTextEdit:focus {{
-                border: 2px solid {JYQ_COLORS['primary']};
-                padding: 9px 11px;
-            }}
-        """)
 
 class JYQComboBox(QComboBox):
     """扁平化下拉框组件"""
     
+    _QSS = f"""
+        JYQComboBox {{
+            background-color: {JYQ_COLORS['surface']};
+            border: 1px solid {JYQ_COLORS['border']};
+            border-radius: 8px;
+            padding: 10px 12px;
+            font-size: 15px;
+            color: {JYQ_COLORS['text_primary']};
+        }}
+        JYQComboBox:focus {{
+            border: 2px solid {JYQ_COLORS['primary']};
+            padding: 9px 11px;
+        }}
+        JYQComboBox::drop-down {{
+            border: none;
+            width: 30px;
+        }}
+        JYQComboBox QAbstractItemView {{
+            background-color: {JYQ_COLORS['surface']};
+            border: 1px solid {JYQ_COLORS['border']};
+            border-radius: 8px;
+            selection-background-color: {JYQ_COLORS['primary']};
+            selection-color: #FFFFFF;
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        self.setStyleSheet(f"""
-            JYQComboBox {{
-                background-color: {JYQ_COLORS['surface']};
-                border: 1px solid {JYQ_COLORS['border']};
-                border-radius: 8px;
-                padding: 10px 12px;
-                font-size: 15px;
-                color: {JYQ_COLORS['text_primary']};
-            }}
-            JYQComboBox:focus {{
-                border: 2px solid {JYQ_COLORS['primary']};
-                padding: 9px 11px;
-            }}
-            JYQComboBox::drop-down {{
-                border: none;
-                width: 30px;
-            }}
-            JYQComboBox QAbstractItemView {{
-                background-color: {JYQ_COLORS['surface']};
-                border: 1px solid {JYQ_COLORS['border']};
-                border-radius: 8px;
-                selection-background-color: {JYQ_COLORS['primary']};
-                selection-color: #FFFFFF;
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class JYQListWidget(QListWidget):
     """扁平化列表组件"""
     
+    _QSS = f"""
+        JYQListWidget {{
+            background-color: {JYQ_COLORS['surface']};
+            border: 1px solid {JYQ_COLORS['border']};
+            border-radius: 8px;
+            padding: 4px;
+        }}
+        JYQListWidget::item {{
+            border-radius: 6px;
+            padding: 8px;
+            margin: 2px;
+        }}
+        JYQListWidget::item:hover {{
+            background-color: {JYQ_COLORS['background']};
+        }}
+        JYQListWidget::item:selected {{
+            background-color: {JYQ_COLORS['primary']};
+            color: #FFFFFF;
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        self.setStyleSheet(f"""
-            JYQListWidget {{
-                background-color: {JYQ_COLORS['surface']};
-                border: 1px solid {JYQ_COLORS['border']};
-                border-radius: 8px;
-                padding: 4px;
-            }}
-            JYQListWidget::item {{
-                border-radius: 6px;
-                padding: 8px;
-                margin: 2px;
-            }}
-            JYQListWidget::item:hover {{
-                background-color: {JYQ_COLORS['background']};
-            }}
-            JYQListWidget::item:selected {{
-                background-color: {JYQ_COLORS['primary']};
-                color: #FFFFFF;
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class JYQTableWidget(QTableWidget):
     """扁平化表格组件"""
     
+    _QSS = f"""
+        JYQTableWidget {{
+            background-color: {JYQ_COLORS['surface']};
+            border: 1px solid {JYQ_COLORS['border']};
+            border-radius: 8px;
+            gridline-color: {JYQ_COLORS['divider']};
+        }}
+        JYQTableWidget::item {{
+            padding: 8px;
+        }}
+        JYQTableWidget::item:selected {{
+            background-color: {JYQ_COLORS['primary']};
+            color: #FFFFFF;
+        }}
+        JYQTableWidget QHeaderView::section {{
+            background-color: {JYQ_COLORS['background']};
+            color: {JYQ_COLORS['text_primary']};
+            padding: 10px;
+            border: none;
+            border-bottom: 2px solid {JYQ_COLORS['divider']};
+            font-weight: 600;
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        self.setStyleSheet(f"""
-            JYQTableWidget {{
-                background-color: {JYQ_COLORS['surface']};
-                border: 1px solid {JYQ_COLORS['border']};
-                border-radius: 8px;
-                gridline-color: {JYQ_COLORS['divider']};
-            }}
-            JYQTableWidget::item {{
-                padding: 8px;
-            }}
-            JYQTableWidget::item:selected {{
-                background-color: {JYQ_COLORS['primary']};
-                color: #FFFFFF;
-            }}
-            QHeaderView::section {{
-                background-color: {JYQ_COLORS['background']};
-                color: {JYQ_COLORS['text_primary']};
-                padding: 10px;
-                border: none;
-                border-bottom: 2px solid {JYQ_COLORS['divider']};
-                font-weight: 600;
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class JYQBadge(QLabel):
     """徽章组件"""
     
+    _QSS = f"""
+        JYQBadge {{
+            background-color: {JYQ_COLORS['text_secondary']};
+            color: #FFFFFF;
+            border-radius: 12px;
+            padding: 4px 8px;
+            font-size: 12px;
+            font-weight: 600;
+        }}
+        JYQBadge[badgeColor="primary"] {{
+            background-color: {JYQ_COLORS['primary']};
+        }}
+        JYQBadge[badgeColor="success"] {{
+            background-color: {JYQ_COLORS['success']};
+        }}
+        JYQBadge[badgeColor="warning"] {{
+            background-color: {JYQ_COLORS['warning']};
+        }}
+        JYQBadge[badgeColor="error"] {{
+            background-color: {JYQ_COLORS['error']};
+        }}
+    """
+    
     def __init__(self, text="", parent=None, color="primary"):
         super().__init__(text, parent)
+        self.setStyleSheet(self._QSS)
         self.badge_color = color
         self.setAlignment(Qt.AlignCenter)
         self.update_style()
     
     def update_style(self):
-        """更新样式"""
-        if self.badge_color == "primary":
-            bg = JYQ_COLORS['primary']
-        elif self.badge_color == "success":
-            bg = JYQ_COLORS['success']
-        elif self.badge_color == "warning":
-            bg = JYQ_COLORS['warning']
-        elif self.badge_color == "error":
-            bg = JYQ_COLORS['error']
-        else:
-            bg = JYQ_COLORS['text_secondary']
-        
-        self.setStyleSheet(f"""
-            JYQBadge {{
-                background-color: {bg};
-                color: #FFFFFF;
-                border-radius: 12px;
-                padding: 4px 8px;
-                font-size: 12px;
-                font-weight: 600;
-            }}
-        """)
+        """更新样式（按 badge_color 设置动态属性）"""
+        self.setProperty("badgeColor", self.badge_color)
+        _repolish(self)
+    
+    def set_color(self, color):
+        """切换徽章颜色，只重新匹配本徽章"""
+        self.badge_color = color
+        self.setProperty("badgeColor", color)
+        _repolish(self)
 
 class JYQDivider(QFrame):
-    """分割线组件"""
+    """分割线组件（纯色，直接填充，不走样式表绘制）"""
+    
+    _COLOR = QColor(JYQ_COLORS['divider'])
     
     def __init__(self, parent=None, orientation=Qt.Horizontal):
         super().__init__(parent)
+        self.setFrameStyle(QFrame.NoFrame)
         if orientation == Qt.Horizontal:
             self.setFixedHeight(1)
             self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         else:
             self.setFixedWidth(1)
             self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
-        
-        self.setStyleSheet(f"""
-            JYQDivider {{
-                background-color: {JYQ_COLORS['divider']};
-                border: none;
-            }}
-        """)
+    
+    def paintEvent(self, event):
+        """只画一块纯色；窗口主题的 QWidget 背景规则不会盖住分割线"""
+        QPainter(self).fillRect(self.rect(), self._COLOR)
 
 class JYQIconButton(QPushButton):
     """图标按钮组件"""
     
+    _QSS = f"""
+        JYQIconButton {{
+            background-color: transparent;
+            border: none;
+            border-radius: 8px;
+        }}
+        JYQIconButton:hover {{
+            background-color: {JYQ_COLORS['background']};
+        }}
+        JYQIconButton:pressed {{
+            background-color: {JYQ_COLORS['divider']};
+        }}
+    """
+    
+    # 同一图标文件/字号的所有按钮共用一个 QIcon/QFont
+    _icons = {}
+    _fonts = {}
+    
     def __init__(self, icon_path=None, icon_text="", parent=None, size=24):
         super().__init__(parent)
+        self.setStyleSheet(self._QSS)
         self.setCursor(Qt.PointingHandCursor)
         self.setFixedSize(size + 16, size + 16)
         
         if icon_path:
-            icon = QIcon(icon_path)
+            icon = self._icons.get(icon_path)
+            if icon is None:
+                icon = self._icons[icon_path] = QIcon(icon_path)
             self.setIcon(icon)
             self.setIconSize(QSize(size, size))
         elif icon_text:
-            self.setText(icon_text)
-            self.setFont(QFont("Arial", size // 2))
-        
-        self.update_style()
-    
-    def update_style(self):
-        """更新样式"""
-        self.setStyleSheet(f"""
-            JYQIconButton {{
-                background-color: transparent;
-                border: none;
-                border-radius: 8px;
-            }}
-            JYQIconButton:hover {{
-                background-color: {JYQ_COLORS['background']};
-            }}
-            JYQIconButton:pressed {{
-                background-color: {JYQ_COLORS['divider']};
-            }}
-        """)
+            font = self._fonts.get(size // 2)
+            if font is None:
+                font = self._fonts[size // 2] = QFont("Arial", size // 2)
+            self.setFont(font)
+
+
+# 亮色主题的窗口样式表；JYQ组件各自的样式表优先于窗口的 QWidget 规则，不会被窗口背景覆盖
+_JYQ_LIGHT_THEME_QSS = f"""
+    QWidget {{
+        background-color: {JYQ_COLORS['background']};
+        color: {JYQ_COLORS['text_primary']};
+    }}
+"""
+
 
 def apply_jyq_theme(widget, theme='light'):
     """应用敬业签主题到窗口"""
@@ -373,11 +407,5 @@ def apply_jyq_theme(widget, theme='light'):
         # 暗色主题（未来实现）
         pass
     else:
-        # 亮色主题
-        widget.setStyleSheet(f"""
-            QWidget {{
-                background-color: {JYQ_COLORS['background']};
-                color: {JYQ_COLORS['text_primary']};
-            }}
-        """)
+        widget.setStyleSheet(_JYQ_LIGHT_THEME_QSS)
 
@@ -3,12 +3,33 @@
 """
 日志系统模块
 Logger Module - 统一的日志管理
+
+带参数的日志用 %s 格式串传参，如 logger.info("任务完成: ID=%s", task_id)，
+级别未启用时 logging 不会格式化消息。
 """
 
+import atexit
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+
+@lru_cache(maxsize=1)
+def _log_path():
+    """日志文件路径（按启动日期命名，进程内只解析一次，同时确保日志目录存在）"""
+    log_dir = "logs"
+    os.makedirs(log_dir, exist_ok=True)
+    return os.path.join(log_dir, f"desktop_pet_{datetime.now():%Y%m%d}.log")
+
+
+@lru_cache(maxsize=128)
+def _child_logger(name):
+    """按模块名缓存子日志器，重复获取时不再拼接名称、不再进 logging 的全局锁"""
+    return logging.getLogger(f"DesktopPet.{name}")
 
 
 class Logger:
@@ -16,35 +37,49 @@ class Logger:
     
     _instance = None
     _initialized = False
+    _lock = threading.Lock()
     
     def __new__(cls):
         """单例模式"""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self):
-        """初始化日志系统"""
+        """初始化日志系统（多线程同时构造时也只初始化一次）"""
         if self._initialized:
             return
         
-        self._initialized = True
-        
-        # 确保日志目录存在
-        log_dir = "logs"
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # 创建日志文件名
-        log_file = os.path.join(log_dir, f"desktop_pet_{datetime.now().strftime('%Y%m%d')}.log")
+        with self._lock:
+            if self._initialized:
+                return
+            self._setup()
+            # 处理器全部挂好后才标记完成，其他线程在锁外看到的一定是完整的日志器
+            self._initialized = True
+    
+    def _setup(self):
+        """配置日志器和处理器"""
+        # 日志格式里不用线程/进程/源码位置信息，关掉后 makeRecord 不再逐条采集
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+        logging._srcfile = None
+        # 处理器写出失败时不打印回溯（日志错误不应打断界面）
+        logging.raiseExceptions = False
         
         # 配置根日志器
-        self.logger = logging.getLogger("DesktopPet")
-        self.logger.setLevel(logging.DEBUG)
+        self.logger = logger = logging.getLogger("DesktopPet")
         
         # 避免重复添加处理器
-        if self.logger.handlers:
+        if logger.handlers:
             return
         
+        logger.setLevel(logging.DEBUG)
+        # 记录只交给本日志器的处理器，不再向 root 日志器重复分发
+        logger.propagate = False
+        log_file = _log_path()
+        
         # 文件处理器（带轮转）
         file_handler = RotatingFileHandler(
             log_file,
@@ -71,14 +106,21 @@ class Logger:
         file_handler.setFormatter(detailed_formatter)
         console_handler.setFormatter(simple_formatter)
         
-        # 添加处理器
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # 添加处理器：日志器只往队列里放记录，由后台监听线程写文件和控制台，
+        # 调用方（包括GUI线程）不再等待磁盘I/O
+        log_queue = queue.Queue(-1)
+        logger.addHandler(QueueHandler(log_queue))
+        self._listener = QueueListener(
+            log_queue, file_handler, console_handler,
+            respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
         
-        self.logger.info("=" * 60)
-        self.logger.info("日志系统初始化成功")
-        self.logger.info(f"日志文件: {log_file}")
-        self.logger.info("=" * 60)
+        logger.info("=" * 60)
+        logger.info("日志系统初始化成功")
+        logger.info("日志文件: %s", log_file)
+        logger.info("=" * 60)
     
     def get_logger(self, name=None):
         """
@@ -91,7 +133,7 @@ class Logger:
             Logger对象
         """
         if name:
-            return logging.getLogger(f"DesktopPet.{name}")
+            return _child_logger(name)
         return self.logger
     
     def debug(self, message):
@@ -137,34 +179,55 @@ def get_logger(name=None):
         _logger_instance = Logger()
     
     if name:
-        return _logger_instance.get_logger(name)
+        return _child_logger(name)
     return _logger_instance.logger
 
 
-# 便捷函数
+# 便捷函数：首次调用时初始化日志器，并把这些模块级函数替换成日志器的绑定方法，
+# 之后通过 logger.debug(...) 等调用时直接进入 logging，不再经过 get_logger()
+def _bind_helpers():
+    """初始化日志器并绑定便捷函数"""
+    global debug, info, warning, error, critical, exception
+    root = get_logger()
+    debug, info, warning, error = root.debug, root.info, root.warning, root.error
+    critical, exception = root.critical, root.exception
+    return root
+
 def debug(message):
     """调试日志"""
-    get_logger().debug(message)
+    _bind_helpers().debug(message)
 
 def info(message):
     """信息日志"""
-    get_logger().info(message)
+    _bind_helpers().info(message)
 
 def warning(message):
     """警告日志"""
-    get_logger().warning(message)
+    _bind_helpers().warning(message)
 
 def error(message):
     """错误日志"""
-    get_logger().error(message)
+    _bind_helpers().error(message)
 
 def critical(message):
     """严重错误日志"""
-    get_logger().critical(message)
+    _bind_helpers().critical(message)
 
 def exception(message):
     """异常日志"""
-    get_logger().exception(message)
+    _bind_helpers().exception(message)
+
+def lazy_debug(fmt, *args):
+    """
+    调试日志（%s 风格格式串，仅在 DEBUG 级别启用时才格式化参数）
+    
+    Args:
+        fmt: 格式串，如 "x=%s"
+        *args: 格式参数
+    """
+    root = get_logger()
+    if root.isEnabledFor(logging.DEBUG):
+        root.debug(fmt, *args)
 
 
 # 测试代码
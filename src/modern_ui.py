@@ -10,6 +10,11 @@ from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 import sys
 
+try:
+    from src.utils import get_resource_path
+except ImportError:
+    from utils import get_resource_path
+
 # 现代化浅色主题颜色常量（类似 Clash Verge/Notion 风格）
 COLORS = {
     'background': '#ffffff',     # 主背景色（白色）
@@ -33,234 +38,284 @@ COLORS = {
     'shadow_light': '#ffffff',   # 不再使用阴影
 }
 
+# 复选框勾选图标（文件路径由Qt按路径缓存图片，不再每次解码内嵌的base64）
+_CHECK_ICON = get_resource_path("assets/icons/check.svg").replace("\\", "/")
+
+
+def _frame_interval_ms():
+    """主屏一帧的毫秒数（取不到刷新率时按 60Hz）"""
+    screen = QApplication.primaryScreen()
+    rate = screen.refreshRate() if screen else 0
+    return max(1, int(1000 / rate)) if rate > 0 else 16
+
+
+class ThrottledProgressBar(QProgressBar):
+    """合并高频 setValue 的进度条：每帧最多刷新一次"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending_value = 0
+        self._flush_pending = False
+    
+    def setValue(self, value):
+        """设置进度（同一帧内的多次调用合并为一次重绘）"""
+        # 与 QProgressBar 一致：超出范围的值直接忽略（最小值和最大值都为0时为忙碌状态，不检查）
+        if (self.minimum() or self.maximum()) and not self.minimum() <= value <= self.maximum():
+            return
+        self._pending_value = value
+        if not self._flush_pending:
+            self._flush_pending = True
+            QTimer.singleShot(_frame_interval_ms(), self._flush_value)
+    
+    def value(self):
+        """当前进度（包括尚未刷新到界面的值）"""
+        return self._pending_value if self._flush_pending else super().value()
+    
+    def _flush_value(self):
+        """把最新的进度刷新到界面"""
+        self._flush_pending = False
+        super().setValue(self._pending_value)
+
+
 class ModernCard(QFrame):
     """现代化卡片组件"""
     
+    _QSS = f"""
+        ModernCard {{
+            background-color: {COLORS['background']};
+            border-radius: 8px;
+            border: 1px solid {COLORS['border']};
+            padding: 20px;
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFrameStyle(QFrame.NoFrame)
         self.setAttribute(Qt.WA_StyledBackground, True)
-        self.setStyleSheet(f"""
-            ModernCard {{
-                background-color: {COLORS['background']};
-                border-radius: 8px;
-                border: 1px solid {COLORS['border']};
-                padding: 20px;
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernButton(QPushButton):
     """现代化按钮组件"""
     
+    # 各样式的表在类定义时生成一次，所有实例共用
+    _QSS_BY_STYLE = {
+        "primary": f"""
+            ModernButton {{
+                background: {COLORS['primary']};
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 12px 24px;
+                font-weight: 600;
+                font-size: 14px;
+            }}
+            ModernButton:hover {{
+                background: {COLORS['primary_dark']};
+            }}
+            ModernButton:pressed {{
+                background: {COLORS['primary_dark']};
+                opacity: 0.9;
+            }}
+        """,
+        "secondary": f"""
+            ModernButton {{
+                background: {COLORS['surface']};
+                color: {COLORS['text_primary']};
+                border: 1px solid {COLORS['border']};
+                border-radius: 8px;
+                padding: 12px 24px;
+                font-weight: 500;
+                font-size: 14px;
+            }}
+            ModernButton:hover {{
+                background: {COLORS['hover']};
+                border-color: {COLORS['primary']};
+            }}
+            ModernButton:pressed {{
+                background: {COLORS['border']};
+            }}
+        """,
+    }
+    
     def __init__(self, text="", parent=None, style="primary"):
         super().__init__(text, parent)
         self.style_type = style
         self.setMinimumHeight(40)
         self.setCursor(Qt.PointingHandCursor)
         self.apply_style()
-        # 添加点击动画效果
+        # 添加点击动画效果（动画对象只创建一次，每次点击只更新起止位置）
+        self.animation = QPropertyAnimation(self, b"geometry")
+        self.animation.setDuration(100)
+        self.animation.setEasingCurve(QEasingCurve.OutCubic)
         self.pressed.connect(self._on_pressed)
         self.released.connect(self._on_released)
     
     def _on_pressed(self):
-        """按下时的动画效果"""
-        from PyQt5.QtCore import QPropertyAnimation, QEasingCurve
-        self.animation = QPropertyAnimation(self, b"geometry")
-        self.animation.setDuration(100)
-        self.animation.setEasingCurve(QEasingCurve.OutCubic)
+        """按下时的动画效果（轻微缩小）"""
+        self._animate_geometry(1)
+    
+    def _on_released(self):
+        """释放时的动画效果（恢复原大小）"""
+        self._animate_geometry(-1)
+    
+    def _animate_geometry(self, inset):
+        """从当前几何位置向内收缩 inset 像素（负数为向外扩展），复用同一个动画对象"""
+        self.animation.stop()
         current_rect = self.geometry()
         self.animation.setStartValue(current_rect)
-        # 轻微缩小
-        self.animation.setEndValue(current_rect.adjusted(1, 1, -1, -1))
+        self.animation.setEndValue(current_rect.adjusted(inset, inset, -inset, -inset))
         self.animation.start()
     
-    def _on_released(self):
-        """释放时的动画效果"""
-        if hasattr(self, 'animation'):
-            from PyQt5.QtCore import QPropertyAnimation, QEasingCurve
-            self.animation = QPropertyAnimation(self, b"geometry")
-            self.animation.setDuration(100)
-            self.animation.setEasingCurve(QEasingCurve.OutCubic)
-            current_rect = self.geometry()
-            self.animation.setStartValue(current_rect)
-            # 恢复原大小
-            self.animation.setEndValue(current_rect.adjusted(-1, -1, 1, 1))
-            self.animation.start()
-    
     def apply_style(self):
-        if self.style_type == "primary":
-            self.setStyleSheet(f"""
-                ModernButton {{
-                    background: {COLORS['primary']};
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 12px 24px;
-                    font-weight: 600;
-                    font-size: 14px;
-                }}
-                ModernButton:hover {{
-                    background: {COLORS['primary_dark']};
-                }}
-                ModernButton:pressed {{
-                    background: {COLORS['primary_dark']};
-                    opacity: 0.9;
-                }}
-            """)
-        elif self.style_type == "secondary":
-            self.setStyleSheet(f"""
-                ModernButton {{
-                    background: {COLORS['surface']};
-                    color: {COLORS['text_primary']};
-                    border: 1px solid {COLORS['border']};
-                    border-radius: 8px;
-                    padding: 12px 24px;
-                    font-weight: 500;
-                    font-size: 14px;
-                }}
-                ModernButton:hover {{
-                    background: {COLORS['hover']};
-                    border-color: {COLORS['primary']};
-                }}
-                ModernButton:pressed {{
-                    background: {COLORS['border']};
-                }}
-            """)
+        qss = self._QSS_BY_STYLE.get(self.style_type)
+        if qss:
+            self.setStyleSheet(qss)
 
 class ModernInput(QLineEdit):
     """现代化输入框组件"""
     
+    _QSS = f"""
+        ModernInput {{
+            background: {COLORS['background']};
+            border: 1px solid {COLORS['border']};
+            border-radius: 6px;
+            padding: 12px 16px;
+            font-size: 14px;
+            color: {COLORS['text_primary']};
+        }}
+        ModernInput:focus {{
+            border: 2px solid {COLORS['primary']};
+            outline: none;
+        }}
+        ModernInput:hover {{
+            border-color: {COLORS['primary_light']};
+        }}
+    """
+    
     def __init__(self, placeholder="", parent=None):
         super().__init__(parent)
         self.setPlaceholderText(placeholder)
         self.setMinimumHeight(40)
-        self.setStyleSheet(f"""
-            ModernInput {{
-                background: {COLORS['background']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 12px 16px;
-                font-size: 14px;
-                color: {COLORS['text_primary']};
-            }}
-            ModernInput:focus {{
-                border: 2px solid {COLORS['primary']};
-                outline: none;
-            }}
-            ModernInput:hover {{
-                border-color: {COLORS['primary_light']};
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernComboBox(QComboBox):
     """现代化下拉框组件"""
     
+    _QSS = f"""
+        ModernComboBox {{
+            border: 1px solid {COLORS['border']};
+            border-radius: 6px;
+            padding: 8px 12px;
+            background-color: {COLORS['background']};
+            font-size: 14px;
+            color: {COLORS['text_primary']};
+        }}
+        ModernComboBox:focus {{
+            border: 2px solid {COLORS['primary']};
+            outline: none;
+        }}
+        ModernComboBox:hover {{
+            border-color: {COLORS['primary_light']};
+        }}
+        ModernComboBox::drop-down {{
+            border: none;
+            width: 30px;
+        }}
+        ModernComboBox::down-arrow {{
+            image: none;
+            border-left: 5px solid transparent;
+            border-right: 5px solid transparent;
+            border-top: 5px solid {COLORS['text_secondary']};
+            margin-right: 8px;
+        }}
+        ModernComboBox QAbstractItemView {{
+            background-color: {COLORS['background']};
+            border: 1px solid {COLORS['border']};
+            border-radius: 6px;
+            selection-background-color: {COLORS['selected']};
+            selection-color: {COLORS['primary']};
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(40)
-        self.setStyleSheet(f"""
-            ModernComboBox {{
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 8px 12px;
-                background-color: {COLORS['background']};
-                font-size: 14px;
-                color: {COLORS['text_primary']};
-            }}
-            ModernComboBox:focus {{
-                border: 2px solid {COLORS['primary']};
-                outline: none;
-            }}
-            ModernComboBox:hover {{
-                border-color: {COLORS['primary_light']};
-            }}
-            ModernComboBox::drop-down {{
-                border: none;
-                width: 30px;
-            }}
-            ModernComboBox::down-arrow {{
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid {COLORS['text_secondary']};
-                margin-right: 8px;
-            }}
-            ModernComboBox QAbstractItemView {{
-                background-color: {COLORS['background']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                selection-background-color: {COLORS['selected']};
-                selection-color: {COLORS['primary']};
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
-class ModernProgressBar(QProgressBar):
+class ModernProgressBar(ThrottledProgressBar):
     """现代化进度条组件"""
     
+    _QSS = """
+        ModernProgressBar {
+            border: none;
+            border-radius: 4px;
+            background-color: #E0E0E0;
+        }
+        ModernProgressBar::chunk {
+            background-color: #4CAF50;
+            border-radius: 4px;
+        }
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(8)
         self.setTextVisible(False)
-        self.setStyleSheet("""
-            ModernProgressBar {
-                border: none;
-                border-radius: 4px;
-                background-color: #E0E0E0;
-            }
-            ModernProgressBar::chunk {
-                background-color: #4CAF50;
-                border-radius: 4px;
-            }
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernTabWidget(QTabWidget):
     """现代化标签页组件"""
     
+    _QSS = f"""
+        ModernTabWidget::pane {{
+            border: 1px solid {COLORS['border']};
+            border-radius: 8px;
+            background-color: {COLORS['background']};
+            top: -1px;
+        }}
+        ModernTabWidget::tab-bar {{
+            alignment: left;
+        }}
+        ModernTabWidget::tab {{
+            background-color: {COLORS['surface']};
+            color: {COLORS['text_secondary']};
+            padding: 8px 16px;
+            margin-right: 2px;
+            border-top-left-radius: 8px;
+            border-top-right-radius: 8px;
+            border: none;
+        }}
+        ModernTabWidget::tab:selected {{
+            background-color: {COLORS['background']};
+            color: {COLORS['primary']};
+            border-bottom: 2px solid {COLORS['primary']};
+            font-weight: 600;
+        }}
+        ModernTabWidget::tab:hover {{
+            background-color: {COLORS['hover']};
+            color: {COLORS['text_primary']};
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet(f"""
-            ModernTabWidget::pane {{
-                border: 1px solid {COLORS['border']};
-                border-radius: 8px;
-                background-color: {COLORS['background']};
-                top: -1px;
-            }}
-            ModernTabWidget::tab-bar {{
-                alignment: left;
-            }}
-            ModernTabWidget::tab {{
-                background-color: {COLORS['surface']};
-                color: {COLORS['text_secondary']};
-                padding: 8px 16px;
-                margin-right: 2px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                border: none;
-            }}
-            ModernTabWidget::tab:selected {{
-                background-color: {COLORS['background']};
-                color: {COLORS['primary']};
-                border-bottom: 2px solid {COLORS['primary']};
-                font-weight: 600;
-            }}
-            ModernTabWidget::tab:hover {{
-                background-color: {COLORS['hover']};
-                color: {COLORS['text_primary']};
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernWindow(QWidget):
     """现代化窗口基类"""
     
+    _QSS = """
+        ModernWindow {
+            background-color: #FAFAFA;
+            color: #333;
+        }
+    """
+    
     def __init__(self, title="", parent=None):
         super().__init__(parent)
         self.setWindowTitle(title)
-        self.setStyleSheet("""
-            ModernWindow {
-                background-color: #FAFAFA;
-                color: #333;
-            }
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernPetWindow(ModernWindow):
     """现代化宠物窗口"""
@@ -391,20 +446,18 @@ class ModernSettingsWindow(ModernWindow):
         title_label.setFont(QFont("", 24, QFont.Bold))
         layout.addWidget(title_label)
         
-        # 设置标签页
+        # 设置标签页：先放空白页，页面内容在第一次切换到该页时才创建
         self.tabs = ModernTabWidget()
-        
-        # 宠物设置
-        pet_tab = self.create_pet_settings()
-        self.tabs.addTab(pet_tab, "🐱 宠物")
-        
-        # 界面设置
-        ui_tab = self.create_ui_settings()
-        self.tabs.addTab(ui_tab, "🎨 界面")
-        
-        # 系统设置
-        system_tab = self.create_system_settings()
-        self.tabs.addTab(system_tab, "🔧 系统")
+        self._tab_builders = [
+            (self.create_pet_settings, "🐱 宠物"),
+            (self.create_ui_settings, "🎨 界面"),
+            (self.create_system_settings, "🔧 系统"),
+        ]
+        self._built_tabs = set()
+        for _, title in self._tab_builders:
+            self.tabs.addTab(QWidget(), title)
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+        self._ensure_tab_built(self.tabs.currentIndex())
         
         layout.addWidget(self.tabs)
         
@@ -421,6 +474,16 @@ class ModernSettingsWindow(ModernWindow):
         layout.addLayout(button_layout)
         self.setLayout(layout)
     
+    def _ensure_tab_built(self, index):
+        """第一次显示某个标签页时创建其内容（每页只创建一次）"""
+        if index < 0 or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        builder, _ = self._tab_builders[index]
+        page_layout = QVBoxLayout(self.tabs.widget(index))
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        page_layout.addWidget(builder())
+    
     def create_pet_settings(self):
         widget = QWidget()
         layout = QVBoxLayout(widget)
@@ -494,175 +557,187 @@ class ModernSettingsWindow(ModernWindow):
 class ModernTableWidget(QTableWidget):
     """现代化表格组件"""
     
+    _QSS = f"""
+        ModernTableWidget {{
+            background-color: {COLORS['background']};
+            border: 1px solid {COLORS['border']};
+            border-radius: 8px;
+            gridline-color: {COLORS['divider']};
+            selection-background-color: {COLORS['selected']};
+            alternate-background-color: {COLORS['surface']};
+        }}
+        ModernTableWidget::item {{
+            padding: 12px;
+            border-bottom: 1px solid {COLORS['divider']};
+        }}
+        ModernTableWidget::item:selected {{
+            background-color: {COLORS['selected']};
+            color: {COLORS['primary']};
+        }}
+        ModernTableWidget::item:hover {{
+            background-color: {COLORS['hover']};
+        }}
+        ModernTableWidget QHeaderView::section {{
+            background-color: {COLORS['surface']};
+            color: {COLORS['text_primary']};
+            border: none;
+            border-bottom: 2px solid {COLORS['divider']};
+            padding: 12px;
+            font-weight: 600;
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet(f"""
-            ModernTableWidget {{
-                background-color: {COLORS['background']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 8px;
-                gridline-color: {COLORS['divider']};
-                selection-background-color: {COLORS['selected']};
-                alternate-background-color: {COLORS['surface']};
-            }}
-            ModernTableWidget::item {{
-                padding: 12px;
-                border-bottom: 1px solid {COLORS['divider']};
-            }}
-            ModernTableWidget::item:selected {{
-                background-color: {COLORS['selected']};
-                color: {COLORS['primary']};
-            }}
-            ModernTableWidget::item:hover {{
-                background-color: {COLORS['hover']};
-            }}
-            ModernTableWidget QHeaderView::section {{
-                background-color: {COLORS['surface']};
-                color: {COLORS['text_primary']};
-                border: none;
-                border-bottom: 2px solid {COLORS['divider']};
-                padding: 12px;
-                font-weight: 600;
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernListWidget(QListWidget):
     """现代化列表组件"""
     
+    _QSS = f"""
+        ModernListWidget {{
+            background-color: {COLORS['surface']};
+            border: 1px solid {COLORS['divider']};
+            border-radius: 8px;
+            selection-background-color: {COLORS['primary_light']};
+            alternate-background-color: #F8F9FA;
+        }}
+        ModernListWidget::item {{
+            padding: 8px;
+            border-bottom: 1px solid #F0F0F0;
+        }}
+        ModernListWidget::item:selected {{
+            background-color: {COLORS['primary_light']};
+            color: {COLORS['primary_dark']};
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet(f"""
-            ModernListWidget {{
-                background-color: {COLORS['surface']};
-                border: 1px solid {COLORS['divider']};
-                border-radius: 8px;
-                selection-background-color: {COLORS['primary_light']};
-                alternate-background-color: #F8F9FA;
-            }}
-            ModernListWidget::item {{
-                padding: 8px;
-                border-bottom: 1px solid #F0F0F0;
-            }}
-            ModernListWidget::item:selected {{
-                background-color: {COLORS['primary_light']};
-                color: {COLORS['primary_dark']};
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernTextEdit(QTextEdit):
     """现代化文本编辑组件"""
     
+    _QSS = f"""
+        ModernTextEdit {{
+            background: {COLORS['background']};
+            border: 1px solid {COLORS['border']};
+            border-radius: 6px;
+            padding: 12px;
+            font-size: 14px;
+            color: {COLORS['text_primary']};
+        }}
+        ModernTextEdit:focus {{
+            border: 2px solid {COLORS['primary']};
+            outline: none;
+        }}
+        ModernTextEdit:hover {{
+            border-color: {COLORS['primary_light']};
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet(f"""
-            ModernTextEdit {{
-                background: {COLORS['background']};
-                border: 1px solid {COLORS['border']};
-                border-radius: 6px;
-                padding: 12px;
-                font-size: 14px;
-                color: {COLORS['text_primary']};
-            }}
-            ModernTextEdit:focus {{
-                border: 2px solid {COLORS['primary']};
-                outline: none;
-            }}
-            ModernTextEdit:hover {{
-                border-color: {COLORS['primary_light']};
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernSlider(QSlider):
     """现代化滑块组件"""
     
+    _QSS = f"""
+        ModernSlider::groove:horizontal {{
+            border: none;
+            height: 10px;
+            background: {COLORS['surface']};
+            border-radius: 5px;
+            box-shadow: inset 2px 2px 4px {COLORS['shadow_dark']}, 
+                       inset -2px -2px 4px {COLORS['shadow_light']};
+        }}
+        ModernSlider::handle:horizontal {{
+            background: {COLORS['primary']};
+            border: none;
+            width: 24px;
+            height: 24px;
+            border-radius: 12px;
+            margin: -7px 0;
+            box-shadow: 3px 3px 6px {COLORS['shadow_dark']}, 
+                       -3px -3px 6px {COLORS['shadow_light']};
+        }}
+        ModernSlider::handle:horizontal:hover {{
+            background: {COLORS['primary_dark']};
+        }}
+        ModernSlider::handle:horizontal:pressed {{
+            box-shadow: inset 2px 2px 4px {COLORS['shadow_dark']};
+        }}
+    """
+    
     def __init__(self, orientation=Qt.Horizontal, parent=None):
         super().__init__(orientation, parent)
-        self.setStyleSheet(f"""
-            ModernSlider::groove:horizontal {{
-                border: none;
-                height: 10px;
-                background: {COLORS['surface']};
-                border-radius: 5px;
-                box-shadow: inset 2px 2px 4px {COLORS['shadow_dark']}, 
-                           inset -2px -2px 4px {COLORS['shadow_light']};
-            }}
-            ModernSlider::handle:horizontal {{
-                background: {COLORS['primary']};
-                border: none;
-                width: 24px;
-                height: 24px;
-                border-radius: 12px;
-                margin: -7px 0;
-                box-shadow: 3px 3px 6px {COLORS['shadow_dark']}, 
-                           -3px -3px 6px {COLORS['shadow_light']};
-            }}
-            ModernSlider::handle:horizontal:hover {{
-                background: {COLORS['primary_dark']};
-            }}
-            ModernSlider::handle:horizontal:pressed {{
-                box-shadow: inset 2px 2px 4px {COLORS['shadow_dark']};
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernCheckBox(QCheckBox):
     """现代化复选框组件"""
     
+    _QSS = f"""
+        ModernCheckBox {{
+            color: {COLORS['text_primary']};
+            font-size: 14px;
+            spacing: 10px;
+        }}
+        ModernCheckBox::indicator {{
+            width: 20px;
+            height: 20px;
+            border: 1px solid {COLORS['border']};
+            border-radius: 4px;
+            background: {COLORS['background']};
+        }}
+        ModernCheckBox::indicator:hover {{
+            border-color: {COLORS['primary']};
+        }}
+        ModernCheckBox::indicator:checked {{
+            background: {COLORS['primary']};
+            border-color: {COLORS['primary']};
+            image: url({_CHECK_ICON});
+        }}
+    """
+    
     def __init__(self, text="", parent=None):
         super().__init__(text, parent)
-        self.setStyleSheet(f"""
-            ModernCheckBox {{
-                color: {COLORS['text_primary']};
-                font-size: 14px;
-                spacing: 10px;
-            }}
-            ModernCheckBox::indicator {{
-                width: 20px;
-                height: 20px;
-                border: 1px solid {COLORS['border']};
-                border-radius: 4px;
-                background: {COLORS['background']};
-            }}
-            ModernCheckBox::indicator:hover {{
-                border-color: {COLORS['primary']};
-            }}
-            ModernCheckBox::indicator:checked {{
-                background: {COLORS['primary']};
-                border-color: {COLORS['primary']};
-                image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTIiIGhlaWdodD0iMTIiIHZpZXdCb3g9IjAgMCAxMiAxMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEwIDNMNC41IDguNUwyIDYiIHN0cm9rZT0id2hpdGUiIHN0cm9rZS13aWR0aD0iMiIgc3Ryb2tlLWxpbmVjYXA9InJvdW5kIiBzdHJva2UtbGluZWpvaW49InJvdW5kIi8+Cjwvc3ZnPgo=);
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 class ModernSpinBox(QSpinBox):
     """现代化数字输入框组件"""
     
+    _QSS = f"""
+        ModernSpinBox {{
+            background-color: {COLORS['surface']};
+            border: 2px solid {COLORS['divider']};
+            border-radius: 8px;
+            padding: 8px;
+            font-size: 14px;
+            color: {COLORS['text_primary']};
+        }}
+        ModernSpinBox:focus {{
+            border-color: {COLORS['primary']};
+            outline: none;
+        }}
+        ModernSpinBox::up-button {{
+            background-color: {COLORS['primary']};
+            border: none;
+            border-radius: 3px;
+            width: 20px;
+        }}
+        ModernSpinBox::down-button {{
+            background-color: {COLORS['primary']};
+            border: none;
+            border-radius: 3px;
+            width: 20px;
+        }}
+    """
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet(f"""
-            ModernSpinBox {{
-                background-color: {COLORS['surface']};
-                border: 2px solid {COLORS['divider']};
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                color: {COLORS['text_primary']};
-            }}
-            ModernSpinBox:focus {{
-                border-color: {COLORS['primary']};
-                outline: none;
-            }}
-            ModernSpinBox::up-button {{
-                background-color: {COLORS['primary']};
-                border: none;
-                border-radius: 3px;
-                width: 20px;
-            }}
-            ModernSpinBox::down-button {{
-                background-color: {COLORS['primary']};
-                border: none;
-                border-radius: 3px;
-                width: 20px;
-            }}
-        """)
+        self.setStyleSheet(self._QSS)
 
 # 测试代码
 if __name__ == "__main__":
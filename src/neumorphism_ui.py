@@ -9,16 +9,71 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 import sys
+from functools import lru_cache
+
+try:
+    from src.modern_ui import ThrottledProgressBar
+except ImportError:
+    from modern_ui import ThrottledProgressBar
+
+
+@lru_cache(maxsize=None)
+def _shadow_tile(radius, blur, rgba):
+    """
+    预渲染一块模糊的圆角阴影，作为九宫格贴图使用（同一组参数只渲染一次）
+    
+    Returns:
+        (贴图, 九宫格边距)：四角按原样绘制，中间部分拉伸
+    """
+    side = 2 * radius + 1
+    size = side + 2 * blur
+    shape = QPixmap(size, size)
+    shape.fill(Qt.transparent)
+    painter = QPainter(shape)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(*rgba))
+    painter.drawRoundedRect(QRectF(blur, blur, side, side), radius, radius)
+    painter.end()
+    
+    # 借助 QGraphicsBlurEffect 离屏模糊一次，之后每次绘制只是贴图
+    scene = QGraphicsScene()
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur)
+    scene.addPixmap(shape).setGraphicsEffect(effect)
+    tile = QPixmap(size, size)
+    tile.fill(Qt.transparent)
+    painter = QPainter(tile)
+    scene.render(painter, QRectF(0, 0, size, size), QRectF(0, 0, size, size))
+    painter.end()
+    return tile, blur + radius
+
+
+def _paint_shadow(widget, radius, blur, rgba):
+    """
+    在组件矩形内画预渲染的阴影
+    
+    组件的样式表用 margin 给阴影留出位置（左上 blur-偏移，右下 blur+偏移），
+    因此阴影正好铺满整个组件矩形，组件本身的背景再画在 margin 以内
+    """
+    tile, margin = _shadow_tile(radius, blur, rgba)
+    painter = QPainter(widget)
+    qDrawBorderPixmap(painter, widget.rect(), QMargins(margin, margin, margin, margin), tile)
+    painter.end()
+
 
 class NeumorphismCard(QFrame):
     """新拟物化卡片组件"""
     
+    # 阴影：圆角、模糊半径、颜色（向右下偏移 8 像素，见样式表 margin）
+    _SHADOW = (20, 15, (0, 0, 0, 25))
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFrameStyle(QFrame.NoFrame)
-        self.setAttribute(Qt.WA_StyledBackground, True)
         self.setStyleSheet("""
             NeumorphismCard {
+                margin: 7px 23px 23px 7px;
                 background-color: #E6E6E6;
                 border-radius: 20px;
                 padding: 20px;
@@ -27,22 +82,27 @@ class NeumorphismCard(QFrame):
                 background-color: #F0F0F0;
             }
         """)
-        
-        # 添加阴影效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(15)
-        shadow.setXOffset(8)
-        shadow.setYOffset(8)
-        shadow.setColor(QColor(0, 0, 0, 25))
-        self.setGraphicsEffect(shadow)
+    
+    def paintEvent(self, event):
+        _paint_shadow(self, *self._SHADOW)
+        # QFrame 不画样式表背景，这里在阴影之上按样式表画出卡片本身
+        option = QStyleOption()
+        option.initFrom(self)
+        painter = QPainter(self)
+        self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+        painter.end()
+        super().paintEvent(event)
 
 class NeumorphismButton(QPushButton):
     """新拟物化按钮组件"""
     
+    # 高光：圆角、模糊半径、颜色（向右下偏移 5 像素，见样式表 margin）
+    _SHADOW = (15, 10, (255, 255, 255, 100))
+    
     def __init__(self, text="", parent=None, style="primary"):
         super().__init__(text, parent)
         self.style_type = style
-        self.setMinimumHeight(50)
+        self.setMinimumHeight(70)
         self.setCursor(Qt.PointingHandCursor)
         self.apply_style()
     
@@ -50,6 +110,7 @@ class NeumorphismButton(QPushButton):
         if self.style_type == "primary":
             self.setStyleSheet("""
                 NeumorphismButton {
+                    margin: 5px 15px 15px 5px;
                     background-color: #E6E6E6;
                     color: #333;
                     border: none;
@@ -65,24 +126,24 @@ class NeumorphismButton(QPushButton):
                     background-color: #DCDCDC;
                 }
             """)
-        
-        # 添加内阴影效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(10)
-        shadow.setXOffset(5)
-        shadow.setYOffset(5)
-        shadow.setColor(QColor(255, 255, 255, 100))
-        self.setGraphicsEffect(shadow)
+    
+    def paintEvent(self, event):
+        _paint_shadow(self, *self._SHADOW)
+        super().paintEvent(event)
 
 class NeumorphismInput(QLineEdit):
     """新拟物化输入框组件"""
     
+    # 高光：圆角、模糊半径、颜色（向右下偏移 3 像素，见样式表 margin）
+    _SHADOW = (15, 8, (255, 255, 255, 80))
+    
     def __init__(self, placeholder="", parent=None):
         super().__init__(parent)
         self.setPlaceholderText(placeholder)
-        self.setMinimumHeight(50)
+        self.setMinimumHeight(66)
         self.setStyleSheet("""
             NeumorphismInput {
+                margin: 5px 11px 11px 5px;
                 background-color: #E6E6E6;
                 color: #333;
                 border: none;
@@ -95,24 +156,24 @@ class NeumorphismInput(QLineEdit):
                 outline: none;
             }
         """)
-        
-        # 添加内阴影效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(8)
-        shadow.setXOffset(3)
-        shadow.setYOffset(3)
-        shadow.setColor(QColor(255, 255, 255, 80))
-        self.setGraphicsEffect(shadow)
+    
+    def paintEvent(self, event):
+        _paint_shadow(self, *self._SHADOW)
+        super().paintEvent(event)
 
-class NeumorphismProgressBar(QProgressBar):
+class NeumorphismProgressBar(ThrottledProgressBar):
     """新拟物化进度条组件"""
     
+    # 阴影：圆角、模糊半径、颜色（向右下偏移 2 像素，见样式表 margin）
+    _SHADOW = (10, 5, (0, 0, 0, 20))
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setMinimumHeight(20)
+        self.setMinimumHeight(30)
         self.setTextVisible(False)
         self.setStyleSheet("""
             NeumorphismProgressBar {
+                margin: 3px 7px 7px 3px;
                 background-color: #E6E6E6;
                 border: none;
                 border-radius: 10px;
@@ -122,14 +183,10 @@ class NeumorphismProgressBar(QProgressBar):
                 border-radius: 10px;
             }
         """)
-        
-        # 添加阴影效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(5)
-        shadow.setXOffset(2)
-        shadow.setYOffset(2)
-        shadow.setColor(QColor(0, 0, 0, 20))
-        self.setGraphicsEffect(shadow)
+    
+    def paintEvent(self, event):
+        _paint_shadow(self, *self._SHADOW)
+        super().paintEvent(event)
 
 class NeumorphismWindow(QWidget):
     """新拟物化窗口基类"""
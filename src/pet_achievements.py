@@ -197,8 +197,8 @@ class AchievementsWindow(QWidget):
         # 获取已解锁的成就
         unlocked_achievements = set()
         if self.database and self.pet_id:
-            achievements = self.database.get_pet_achievements(self.pet_id)
-            unlocked_achievements = {ach['achievement_name'] for ach in achievements}
+            unlocked_achievements = {ach['achievement_name']
+                                     for ach in self.database.get_pet_achievements_iter(self.pet_id)}
         
         # 按类型分组显示
         row = 0
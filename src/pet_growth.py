@@ -209,7 +209,8 @@ class PetGrowthSystem(QObject):
         
         if attr_name in ['hunger', 'happiness', 'health', 'energy']:
             self.pet_data[attr_name] = value
-            self.database.update_pet(self.pet_id, **{attr_name: value})
+            # 属性衰减由定时器频繁触发，写库交给后台写线程
+            self.database.update_pet_async(self.pet_id, **{attr_name: value})
             self.attribute_changed.emit(attr_name, value)
             return True
         
@@ -315,8 +315,8 @@ class PetShopWindow(QWidget):
             return
         
         # 获取完成任务数
-        tasks = self.database.get_all_tasks()
-        completed_tasks = sum(1 for t in tasks if t['status'] == '已完成')
+        completed_tasks = sum(1 for t in self.database.get_all_tasks_iter()
+                              if t['status'] == '已完成')
         
         # 获取番茄钟数
         pomodoro_stats = self.database.get_pomodoro_stats(365)  # 一年内
@@ -150,7 +150,7 @@ class PetWindow(QWidget):
         """统一调试日志输出，包含宠物ID/角色包等信息"""
         prefix = f"[PetWindow][pet={self.pet_id or 'default'}][pack={self.character_pack_id}]"
         if hasattr(self, 'logger') and self.logger:
-            self.logger.debug(f"{prefix} {message}")
+            self.logger.debug("%s %s", prefix, message)
         else:
             print(f"{prefix} {message}")
     
@@ -156,9 +156,8 @@ class RecurringReminder:
         if not self.database:
             return []
         
-        all_tasks = self.database.get_all_tasks()
         recurring_tasks = [
-            task for task in all_tasks
+            task for task in self.database.get_all_tasks_iter()
             if task.get('repeat_type') and task.get('remind_time')
         ]
         
@@ -212,9 +212,9 @@ class SubtaskManager(QWidget):
         if not self.database:
             return
         
-        subtasks = self.database.get_subtasks(self.task_id)
+        subtasks = self.database.get_subtask_records(self.task_id)
         total = len(subtasks)
-        completed = sum(1 for s in subtasks if s.get('status') == 'completed')
+        completed = sum(1 for s in subtasks if s.status == 'completed')
         
         if total > 0:
             percentage = int(completed / total * 100)
@@ -227,9 +227,9 @@ class SubtaskManager(QWidget):
         if not self.database:
             return 0, 0
         
-        subtasks = self.database.get_subtasks(self.task_id)
+        subtasks = self.database.get_subtask_records(self.task_id)
         total = len(subtasks)
-        completed = sum(1 for s in subtasks if s.get('status') == 'completed')
+        completed = sum(1 for s in subtasks if s.status == 'completed')
         return completed, total
 
 
@@ -1152,8 +1152,9 @@ class TodoWindow(QWidget):
                 if self.task_table and self.current_view == 'list':
                     tasks = self.database.get_today_tasks()
                     self.task_table.setRowCount(0)
+                    tags_by_task = self.database.get_tags_for_tasks(t['id'] for t in tasks)
                     for task in tasks:
-                        self.add_task_to_table(task)
+                        self.add_task_to_table(task, tags_by_task[task['id']])
                     self.update_status()
                 # 更新其他视图
                 self.refresh_current_view()
@@ -1317,11 +1318,12 @@ class TodoWindow(QWidget):
             tasks = self.database.search_tasks(self.current_search_keyword)
             # 进一步按分类和标签筛选
             filtered_tasks = []
+            tags_by_task = self.database.get_tags_for_tasks(t['id'] for t in tasks) if tag_id else {}
             for task in tasks:
                 if category and task.get('category') != category:
                     continue
                 if tag_id:
-                    task_tags = self.database.get_task_tags(task['id'])
+                    task_tags = tags_by_task[task['id']]
                     if not any(tag['id'] == tag_id for tag in task_tags):
                         continue
                 filtered_tasks.append(task)
@@ -1332,15 +1334,22 @@ class TodoWindow(QWidget):
         # 清空表格
         self.task_table.setRowCount(0)
         
-        # 填充数据
+        # 填充数据（所有行的标签一次查询取出）
+        tags_by_task = self.database.get_tags_for_tasks(t['id'] for t in tasks)
         for task in tasks:
-            self.add_task_to_table(task)
+            self.add_task_to_table(task, tags_by_task[task['id']])
         
         # 更新状态
         self.update_status()
     
-    def add_task_to_table(self, task):
-        """添加任务到表格"""
+    def add_task_to_table(self, task, tags=None):
+        """
+        添加任务到表格
+        
+        Args:
+            task: 任务数据
+            tags: 任务的标签列表（批量填充时预先取出；为None时单独查询）
+        """
         if not self.task_table:
             return
         
@@ -1384,7 +1393,8 @@ class TodoWindow(QWidget):
         
         # 标签（第6列）
         if self.database:
-            tags = self.database.get_task_tags(task['id'])
+            if tags is None:
+                tags = self.database.get_task_tags(task['id'])
             if tags:
                 tag_names = [tag['name'] for tag in tags]
                 tag_text = ", ".join(tag_names)
@@ -1414,9 +1424,10 @@ class TodoWindow(QWidget):
                     task_id = self.database.add_task(**task_data)
                     
                     if task_id > 0:
-                        # 保存标签关联 [v0.3.0]
-                        for tag_id in tag_ids:
-                            self.database.add_task_tag(task_id, tag_id)
+                        # 保存标签关联 [v0.3.0]（一次事务提交）
+                        with self.database.transaction():
+                            for tag_id in tag_ids:
+                                self.database.add_task_tag(task_id, tag_id)
                         
                         task_data['id'] = task_id
                         task_data['status'] = 'pending'
@@ -1524,13 +1535,14 @@ class TodoWindow(QWidget):
                 # 更新数据库
                 self.database.update_task(task_id, **new_data)
                 
-                # 更新标签关联 [v0.3.0]
-                # 删除不再需要的标签
-                for tag_id in old_tag_ids - new_tag_ids:
-                    self.database.remove_task_tag(task_id, tag_id)
-                # 添加新标签
-                for tag_id in new_tag_ids - old_tag_ids:
-                    self.database.add_task_tag(task_id, tag_id)
+                # 更新标签关联 [v0.3.0]（一次事务提交）
+                with self.database.transaction():
+                    # 删除不再需要的标签
+                    for tag_id in old_tag_ids - new_tag_ids:
+                        self.database.remove_task_tag(task_id, tag_id)
+                    # 添加新标签
+                    for tag_id in new_tag_ids - old_tag_ids:
+                        self.database.add_task_tag(task_id, tag_id)
                 
                 # 刷新所有视图
                 self.refresh_current_view()
@@ -1737,13 +1749,14 @@ class TodoWindow(QWidget):
         
         # 进一步按分类和标签筛选
         filtered_tasks = []
+        tags_by_task = self.database.get_tags_for_tasks(t['id'] for t in all_tasks)
         for task in all_tasks:
             # 分类筛选
             if self.current_category and task.get('category') != self.current_category:
                 continue
             # 标签筛选
             if self.current_tag_id:
-                task_tags = self.database.get_task_tags(task['id'])
+                task_tags = tags_by_task[task['id']]
                 if not any(tag['id'] == self.current_tag_id for tag in task_tags):
                     continue
             filtered_tasks.append(task)
@@ -1753,7 +1766,7 @@ class TodoWindow(QWidget):
         
         # 显示搜索结果
         for task in filtered_tasks:
-            self.add_task_to_table(task)
+            self.add_task_to_table(task, tags_by_task[task['id']])
         
         # 更新状态
         self.update_status()
@@ -1842,11 +1855,13 @@ class TodoWindow(QWidget):
                 tasks = self.database.search_tasks(self.current_search_keyword)
                 # 进一步按分类和标签筛选
                 filtered_tasks = []
+                tags_by_task = (self.database.get_tags_for_tasks(t['id'] for t in tasks)
+                                if self.current_tag_id else {})
                 for task in tasks:
                     if self.current_category and task.get('category') != self.current_category:
                         continue
                     if self.current_tag_id:
-                        task_tags = self.database.get_task_tags(task['id'])
+                        task_tags = tags_by_task[task['id']]
                         if not any(tag['id'] == self.current_tag_id for tag in task_tags):
                             continue
                     filtered_tasks.append(task)
@@ -1897,11 +1912,13 @@ class TodoWindow(QWidget):
                 tasks = self.database.search_tasks(self.current_search_keyword)
                 # 进一步按分类和标签筛选
                 filtered_tasks = []
+                tags_by_task = (self.database.get_tags_for_tasks(t['id'] for t in tasks)
+                                if self.current_tag_id else {})
                 for task in tasks:
                     if self.current_category and task.get('category') != self.current_category:
                         continue
                     if self.current_tag_id:
-                        task_tags = self.database.get_task_tags(task['id'])
+                        task_tags = tags_by_task[task['id']]
                         if not any(tag['id'] == self.current_tag_id for tag in task_tags):
                             continue
                     filtered_tasks.append(task)
@@ -1969,11 +1986,13 @@ class TodoWindow(QWidget):
                 tasks = self.database.search_tasks(self.current_search_keyword)
                 # 进一步按分类和标签筛选
                 filtered_tasks = []
+                tags_by_task = (self.database.get_tags_for_tasks(t['id'] for t in tasks)
+                                if self.current_tag_id else {})
                 for task in tasks:
                     if self.current_category and task.get('category') != self.current_category:
                         continue
                     if self.current_tag_id:
-                        task_tags = self.database.get_task_tags(task['id'])
+                        task_tags = tags_by_task[task['id']]
                         if not any(tag['id'] == self.current_tag_id for tag in task_tags):
                             continue
                     filtered_tasks.append(task)
@@ -0,0 +1,911 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+数据库模块测试
+Database Module Tests
+"""
+
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+# 添加项目路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database import Database, Note, Subtask, ChatMessage, SCHEMA_VERSION
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """使用临时数据库文件的测试基类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "test_tasks.db")
+        self.db = Database(self.db_path)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.db.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestConnection(DatabaseTestCase):
+    """连接管理测试"""
+
+    def test_connection_is_persistent(self):
+        """测试连接只建立一次并在调用之间复用"""
+        conn = self.db.conn
+        self.db.add_task("任务")
+        self.db.get_all_tasks()
+        self.assertIs(self.db.conn, conn)
+
+    def test_reads_do_not_open_transaction(self):
+        """测试自动提交模式下只读查询不会开启事务"""
+        self.db.add_task("任务")
+        self.db.get_all_tasks()
+        self.assertFalse(self.db.conn.in_transaction)
+
+    def test_transaction_batches_writes(self):
+        """测试事务块内的多次写入在块结束时一起提交"""
+        with self.db.transaction():
+            self.db.add_task("任务1")
+            with self.db.transaction():
+                self.db.add_task("任务2")
+            self.assertTrue(self.db.conn.in_transaction)
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertEqual(len(self.db.get_all_tasks()), 2)
+
+    def test_transaction_rolls_back_on_error(self):
+        """测试事务块内抛出异常时所有写入一起回滚"""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.add_task("任务1")
+                self.db.add_task("任务2")
+                raise RuntimeError("中断")
+        self.assertEqual(self.db.get_all_tasks(), [])
+
+    def test_context_manager_closes_connection(self):
+        """测试with语句退出时才关闭连接"""
+        with Database(os.path.join(self.temp_dir, "ctx.db")) as db:
+            conn = db.conn
+            db.add_task("任务")
+            self.assertIs(db.conn, conn)
+        self.assertIsNone(db.conn)
+
+    def test_migrates_legacy_tasks_table_once(self):
+        """测试旧数据库补充新增列，并记录表结构版本"""
+        legacy_path = os.path.join(self.temp_dir, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("""
+            CREATE TABLE tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                due_date TEXT,
+                priority INTEGER DEFAULT 1,
+                status TEXT DEFAULT 'pending',
+                category TEXT DEFAULT 'general',
+                remind_time TEXT,
+                repeat_type TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+        db = Database(legacy_path)
+        columns = {row[1] for row in db.conn.execute("PRAGMA table_info(tasks)")}
+        self.assertTrue({'completed_date', 'pomodoro_count', 'notes', 'reminder_times'} <= columns)
+        self.assertEqual(db.conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+        db.close()
+
+        # 再次打开时不重复迁移
+        db = Database(legacy_path)
+        self.assertEqual(len(db.get_all_tasks()), 0)
+        db.close()
+
+    def test_migration_indexes_existing_tasks_for_search(self):
+        """测试升级后已有任务也能通过全文索引搜索"""
+        self.db.add_task("整理旧笔记")
+        self.db.conn.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('delete-all')")
+        self.db.conn.execute("PRAGMA user_version = 2")
+        self.db.close()
+
+        self.db = Database(self.db_path)
+        self.assertEqual([t['title'] for t in self.db.search_tasks("旧笔记")], ["整理旧笔记"])
+
+    def test_migration_rebuilds_task_tags_foreign_keys(self):
+        """测试旧版 task_tags 外键按正确定义重建，孤立的关联被清理"""
+        task_id = self.db.add_task("任务")
+        tag_id = self.db.add_tag("标签")
+        self.db.close()
+
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(f"""
+            DROP TABLE task_tags;
+            CREATE TABLE task_tags (
+                task_id INTEGER NOT NULL,
+                tag_id INTEGER NOT NULL,
+                PRIMARY KEY (task_id, tag_id),
+                FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
+                FOREIGN KEY (task_id) REFERENCES tags(id) ON DELETE CASCADE
+            );
+            INSERT INTO task_tags VALUES ({task_id}, {tag_id}), ({task_id}, 999), (999, {tag_id});
+            PRAGMA user_version = 3;
+        """)
+        conn.close()
+
+        self.db = Database(self.db_path)
+        fks = {(row[3], row[2]) for row in self.db.conn.execute("PRAGMA foreign_key_list(task_tags)")}
+        self.assertEqual(fks, {('task_id', 'tasks'), ('tag_id', 'tags')})
+        rows = self.db.conn.execute("SELECT task_id, tag_id FROM task_tags").fetchall()
+        self.assertEqual([tuple(row) for row in rows], [(task_id, tag_id)])
+
+        # 删除标签时由外键级联删除关联
+        self.assertTrue(self.db.delete_tag(tag_id))
+        self.assertEqual(self.db.get_task_tags(task_id), [])
+
+    def test_close_checkpoints_wal(self):
+        """测试关闭时把WAL写回主文件并截断"""
+        for i in range(50):
+            self.db.add_task(f"任务{i}")
+        wal_path = self.db_path + "-wal"
+        self.assertGreater(os.path.getsize(wal_path), 0)
+
+        # 另一个连接保持打开，WAL文件不会随最后一个连接关闭而删除
+        other = sqlite3.connect(self.db_path)
+        other.execute("SELECT COUNT(*) FROM tasks").fetchone()
+        self.db.close()
+        self.assertEqual(os.path.getsize(wal_path), 0)
+        other.close()
+
+    def test_connection_pragmas(self):
+        """测试连接启用WAL日志模式"""
+        mode = self.db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), "wal")
+        self.assertEqual(self.db.conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+        self.assertEqual(self.db.conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+        self.assertEqual(self.db.conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0], 1000)
+
+    def test_auto_backup_keeps_connection(self):
+        """测试备份后连接仍然可用"""
+        conn = self.db.conn
+        self.db.add_task("任务")
+        self.assertTrue(self.db.auto_backup(os.path.join(self.temp_dir, "backups")))
+        self.assertIs(self.db.conn, conn)
+        self.assertEqual(len(self.db.get_all_tasks()), 1)
+
+        # 备份文件包含WAL中尚未写回的数据
+        backup_dir = os.path.join(self.temp_dir, "backups")
+        backup_file = os.path.join(backup_dir, os.listdir(backup_dir)[0])
+        backup = Database(backup_file)
+        self.assertEqual(len(backup.get_all_tasks()), 1)
+        backup.close()
+
+    def test_clean_old_backups(self):
+        """测试只删除过期的备份文件"""
+        backup_dir = os.path.join(self.temp_dir, "backups")
+        os.makedirs(backup_dir)
+        old_ts = (datetime.now() - timedelta(days=10)).timestamp()
+        for name in ("tasks_backup_old.db", "tasks_backup_new.db", "other.db"):
+            open(os.path.join(backup_dir, name), "w").close()
+        for name in ("tasks_backup_old.db", "other.db"):
+            os.utime(os.path.join(backup_dir, name), (old_ts, old_ts))
+
+        self.db.clean_old_backups(backup_dir, keep_days=7)
+
+        self.assertEqual(sorted(os.listdir(backup_dir)), ["other.db", "tasks_backup_new.db"])
+
+    def test_auto_backup_during_write_transaction(self):
+        """测试其他线程持有写事务时备份不阻塞，且只包含已提交的数据"""
+        self.db.add_task("已提交")
+        backup_dir = os.path.join(self.temp_dir, "backups")
+        results = []
+
+        with self.db.transaction():
+            self.db.add_task("未提交")
+            worker = threading.Thread(
+                target=lambda: results.append(self.db.auto_backup(backup_dir)))
+            worker.start()
+            worker.join(timeout=5)
+            self.assertFalse(worker.is_alive())
+
+        self.assertEqual(results, [True])
+        backup = Database(os.path.join(backup_dir, os.listdir(backup_dir)[0]))
+        self.assertEqual([t['title'] for t in backup.get_all_tasks()], ["已提交"])
+        backup.close()
+
+    def test_use_from_worker_threads(self):
+        """测试多个线程共享同一个数据库实例"""
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(20):
+                    self.db.add_task(f"线程{n}-任务{i}")
+                    self.db.get_statistics()
+            except Exception as e:  # pragma: no cover - 失败时记录
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.db.get_statistics()['total'], 80)
+
+
+class TestBackgroundWriter(DatabaseTestCase):
+    """后台写线程测试"""
+
+    def test_update_pet_async(self):
+        """测试异步更新在flush后可见"""
+        pet_id = self.db.create_pet("小宠物")
+        futures = [self.db.update_pet_async(pet_id, hunger=i) for i in range(50)]
+        self.db.flush_writes()
+
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(futures[-1].result()['rowcount'], 1)
+        self.assertEqual(self.db.get_pet(pet_id)['hunger'], 49)
+
+    def test_failed_write_does_not_block_batch(self):
+        """测试单条失败只影响自己的Future"""
+        bad = self.db.submit_write("INSERT INTO no_such_table VALUES (1)")
+        good = self.db.submit_write("INSERT INTO config (key, value) VALUES (?, ?)", ("k", "v"))
+        self.db.flush_writes()
+
+        self.assertIsNotNone(bad.exception())
+        self.assertIsNotNone(good.result()['lastrowid'])
+
+    def test_add_chat_message_and_image_task_async(self):
+        """测试异步添加对话消息和识别记录，清除历史前先写完队列"""
+        pet_id = self.db.create_pet("小宠物")
+        long_message = "喵" * 1000
+        self.db.add_chat_message_async(pet_id, "user", "你好")
+        self.db.add_chat_message_async(pet_id, "assistant", long_message)
+        future = self.db.add_image_task_async("a.png", "{}", image_hash="abc")
+        self.db.flush_writes()
+
+        self.assertEqual([m['message'] for m in self.db.get_chat_history(pet_id)], ["你好", long_message])
+        self.assertEqual(self.db.get_image_task_by_hash("abc")['id'], future.result()['lastrowid'])
+
+        self.db.add_chat_message_async(pet_id, "user", "再见")
+        self.assertTrue(self.db.clear_chat_history(pet_id))
+        self.db.flush_writes()
+        self.assertEqual(self.db.get_chat_history(pet_id), [])
+
+    def test_close_flushes_pending_writes(self):
+        """测试关闭数据库时写完队列中的操作"""
+        pet_id = self.db.create_pet("小宠物")
+        self.db.update_pet_async(pet_id, energy=12)
+        self.db.close()
+
+        db = Database(self.db_path)
+        self.assertEqual(db.get_pet(pet_id)['energy'], 12)
+        db.close()
+
+
+class TestReadConnections(DatabaseTestCase):
+    """线程只读连接测试"""
+
+    def test_reader_thread_not_blocked_by_write_transaction(self):
+        """测试其他线程的查询不等待未提交的写事务，且只看到已提交的数据"""
+        self.db.add_task("已提交")
+        results = []
+
+        with self.db.transaction():
+            self.db.add_task("未提交")
+            # 当前线程在自己的事务中能读到未提交的写入
+            self.assertEqual(len(self.db.get_all_tasks()), 2)
+
+            reader = threading.Thread(
+                target=lambda: results.append(self.db.get_all_tasks()))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+
+        self.assertEqual([t['title'] for t in results[0]], ["已提交"])
+        self.assertEqual(self.db.get_statistics()['total'], 2)
+
+    def test_worker_thread_reads_chat_history(self):
+        """测试工作线程读取对话和识别记录时使用自己的只读连接"""
+        pet_id = self.db.create_pet("小宠物")
+        self.db.add_chat_message(pet_id, "user", "你好")
+        self.db.add_image_task("a.png", "{}")
+        results = []
+
+        with self.db.transaction():
+            self.db.add_chat_message(pet_id, "assistant", "未提交")
+            reader = threading.Thread(target=lambda: results.append(
+                (self.db.get_chat_history(pet_id), self.db.get_image_tasks(),
+                 self.db._local.conn)))
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive())
+
+        history, image_tasks, conn = results[0]
+        self.assertEqual([m['message'] for m in history], ["你好"])
+        self.assertEqual(len(image_tasks), 1)
+        self.assertIsNot(conn, self.db.conn)
+
+    def test_close_releases_reader_connections(self):
+        """测试关闭数据库时同时关闭各线程的只读连接"""
+        self.db.get_all_tasks()
+        reader = self.db._local.conn
+        self.db.close()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            reader.execute("SELECT 1")
+
+
+class TestPetProgress(DatabaseTestCase):
+    """成就和背包测试"""
+
+    def setUp(self):
+        super().setUp()
+        self.pet_id = self.db.create_pet("小宠物")
+
+    def test_unlock_achievement_once(self):
+        """测试同一成就只解锁一次"""
+        first = self.db.unlock_achievement(self.pet_id, "task", "第一个任务")
+        self.assertGreater(first, 0)
+        self.assertEqual(self.db.unlock_achievement(self.pet_id, "task", "第一个任务"), 0)
+        self.assertEqual(len(self.db.get_pet_achievements(self.pet_id)), 1)
+
+        # 重新打开数据库后仍然识别为已解锁
+        self.db.close()
+        self.db = Database(self.db_path)
+        self.assertEqual(self.db.unlock_achievement(self.pet_id, "task", "第一个任务"), 0)
+
+    def test_unlock_achievement_after_rollback(self):
+        """测试事务回滚后成就可以再次解锁"""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.assertGreater(self.db.unlock_achievement(self.pet_id, "task", "回滚成就"), 0)
+                raise RuntimeError("rollback")
+        self.assertGreater(self.db.unlock_achievement(self.pet_id, "task", "回滚成就"), 0)
+
+    def test_add_and_use_item(self):
+        """测试道具数量累加和用完后重新添加"""
+        item_id = self.db.add_item(self.pet_id, "小鱼干", "food", quantity=2)
+        self.assertEqual(self.db.add_item(self.pet_id, "小鱼干", "food", quantity=3), item_id)
+        self.assertEqual(self.db.get_inventory(self.pet_id)[0]['quantity'], 5)
+
+        self.assertTrue(self.db.use_item(self.pet_id, "小鱼干", 5))
+        self.assertEqual(self.db.get_inventory(self.pet_id), [])
+
+        new_id = self.db.add_item(self.pet_id, "小鱼干", "food")
+        self.assertGreater(new_id, 0)
+        self.assertEqual(self.db.get_inventory(self.pet_id)[0]['quantity'], 1)
+
+    def test_migration_merges_duplicate_rows(self):
+        """测试升级时合并旧数据库中重复的道具和成就"""
+        self.db.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript("""
+            DROP INDEX idx_inventory_unique;
+            DROP INDEX idx_achievements_unique;
+            PRAGMA user_version = 1;
+        """)
+        for quantity in (2, 3):
+            conn.execute(
+                "INSERT INTO inventory (pet_id, item_name, item_type, quantity, acquired_at) "
+                "VALUES (?, '小鱼干', 'food', ?, '2024-01-01 00:00:00')", (self.pet_id, quantity))
+            conn.execute(
+                "INSERT INTO achievements (pet_id, achievement_type, achievement_name) "
+                "VALUES (?, 'task', '第一个任务')", (self.pet_id,))
+        conn.commit()
+        conn.close()
+
+        self.db = Database(self.db_path)
+        inventory = self.db.get_inventory(self.pet_id)
+        self.assertEqual([(i['item_name'], i['quantity']) for i in inventory], [("小鱼干", 5)])
+        self.assertEqual(len(self.db.get_pet_achievements(self.pet_id)), 1)
+        self.assertEqual(self.db.add_item(self.pet_id, "小鱼干", "food"), inventory[0]['id'])
+
+
+class TestNotes(DatabaseTestCase):
+    """便签相关测试"""
+
+    def test_update_note_with_full_record(self):
+        """测试直接传入整条便签数据（含id）更新"""
+        note_id = self.db.add_note("便签")
+        note = self.db.get_note(note_id)
+        note['title'] = "新标题"
+        self.assertTrue(self.db.update_note(note_id, **note))
+        self.assertEqual(self.db.get_note(note_id)['title'], "新标题")
+
+    def test_get_all_notes_iter_matches_list(self):
+        """测试流式读取与列表读取结果一致"""
+        for i in range(600):
+            self.db.add_note(f"便签{i}", content=f"内容{i}", is_pinned=(i % 100 == 0))
+
+        notes = self.db.get_all_notes()
+        streamed = list(self.db.get_all_notes_iter())
+
+        self.assertEqual(len(notes), 600)
+        self.assertEqual(notes, streamed)
+        self.assertIsInstance(streamed[0], dict)
+        # 置顶便签排在最前
+        self.assertTrue(all(note['is_pinned'] for note in streamed[:6]))
+
+    def test_get_all_notes_iter_interleaved_queries(self):
+        """测试迭代过程中执行其他查询不会打断迭代"""
+        for i in range(300):
+            self.db.add_note(f"便签{i}")
+
+        count = 0
+        for note in self.db.get_all_notes_iter():
+            self.assertIsNotNone(self.db.get_note(note['id']))
+            count += 1
+
+        self.assertEqual(count, 300)
+
+    def test_timestamps_generated_by_sqlite(self):
+        """测试创建/更新时间由SQLite生成且格式不变"""
+        note_id = self.db.add_note("便签")
+        note = self.db.get_note(note_id)
+        self.assertRegex(note['created_at'], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+        self.assertEqual(note['created_at'], note['updated_at'])
+
+        self.db.conn.execute("UPDATE notes SET updated_at = '2000-01-01 00:00:00'")
+        self.assertTrue(self.db.update_note(note_id, title="新标题"))
+        note = self.db.get_note(note_id)
+        self.assertEqual(note['title'], "新标题")
+        self.assertGreater(note['updated_at'], '2000-01-01 00:00:00')
+
+    def test_note_records_match_dicts(self):
+        """测试记录对象与字典结果一致"""
+        category_id = self.db.add_note_category("工作")
+        self.db.add_note("A", content="a", category_id=category_id)
+        self.db.add_note("B", is_pinned=True)
+
+        records = list(self.db.iter_note_records())
+        self.assertTrue(all(isinstance(r, Note) for r in records))
+        self.assertEqual([r.as_dict() for r in records], self.db.get_all_notes())
+        self.assertEqual([r.title for r in self.db.iter_note_records(category_id)], ["A"])
+
+    def test_get_all_notes_filters(self):
+        """测试分类和置顶筛选"""
+        category_id = self.db.add_note_category("工作")
+        self.db.add_note("A", category_id=category_id)
+        self.db.add_note("B", is_pinned=True)
+
+        self.assertEqual([n['title'] for n in self.db.get_all_notes(category_id=category_id)], ["A"])
+        self.assertEqual([n['title'] for n in self.db.get_all_notes(is_pinned=True)], ["B"])
+
+
+class TestTasks(DatabaseTestCase):
+    """任务查询测试"""
+
+    def test_delete_task_cascades(self):
+        """测试删除任务时子任务、标签关联级联删除，番茄钟记录保留但解除关联"""
+        task_id = self.db.add_task("任务")
+        self.db.add_subtask(task_id, "子任务")
+        self.db.add_task_tag(task_id, self.db.add_tag("标签"))
+        session_id = self.db.add_pomodoro_session(task_id, 25)
+
+        self.assertTrue(self.db.delete_task(task_id))
+
+        self.assertEqual(self.db.get_subtasks(task_id), [])
+        self.assertEqual(self.db.get_task_tags(task_id), [])
+        row = self.db.conn.execute("SELECT task_id FROM pomodoro_sessions WHERE id = ?",
+                                   (session_id,)).fetchone()
+        self.assertIsNone(row[0])
+
+    def test_get_tags_for_tasks(self):
+        """测试批量获取标签与逐个查询结果一致"""
+        work = self.db.add_tag("工作")
+        urgent = self.db.add_tag("紧急")
+        task_ids = [self.db.add_task(f"任务{i}") for i in range(1200)]
+        for task_id in task_ids[::2]:
+            self.db.add_task_tag(task_id, work)
+        self.db.add_task_tag(task_ids[0], urgent)
+
+        tags_by_task = self.db.get_tags_for_tasks(task_ids)
+
+        self.assertEqual(len(tags_by_task), 1200)
+        self.assertEqual([t['name'] for t in tags_by_task[task_ids[0]]], ["工作", "紧急"])
+        self.assertEqual(tags_by_task[task_ids[1]], [])
+        for task_id in (task_ids[0], task_ids[1000], task_ids[1001]):
+            self.assertEqual(tags_by_task[task_id], self.db.get_task_tags(task_id))
+
+    def test_update_rejects_unknown_columns(self):
+        """测试动态更新只接受白名单中的列名"""
+        task_id = self.db.add_task("任务")
+        with self.assertRaises(ValueError):
+            self.db.update_task(task_id, **{"title = 'x', status": "completed"})
+        self.assertEqual(self.db.get_task(task_id)['title'], "任务")
+
+        pet_id = self.db.create_pet("小宠物")
+        self.assertFalse(self.db.update_pet(pet_id, no_such_column=1))
+        self.assertTrue(self.db.update_pet(pet_id, hunger=10))
+
+    def test_get_all_tasks_iter(self):
+        """测试流式读取与列表接口结果一致，且跨越多个批次"""
+        self.db.add_tasks_bulk([{'title': f"任务{i}", 'due_date': f"2026-01-01 00:{i % 60:02d}:00"}
+                                for i in range(600)])
+
+        it = self.db.get_all_tasks_iter(status="pending")
+        self.assertEqual(next(it)['status'], "pending")
+        self.assertEqual([next(it)] + list(it), self.db.get_all_tasks(status="pending")[1:])
+
+    def test_list_results_are_plain_dicts(self):
+        """测试列表查询返回普通字典，且不影响共享游标的行类型"""
+        task_id = self.db.add_task("任务", description="描述")
+        tasks = self.db.get_today_tasks() + self.db.get_all_tasks()
+        self.assertTrue(all(type(t) is dict for t in tasks))
+        self.assertEqual(tasks[-1]['description'], "描述")
+
+        self.assertIs(self.db.cursor.row_factory, sqlite3.Row)
+        self.assertEqual(self.db.get_task(task_id)['title'], "任务")
+
+    def test_search_tasks(self):
+        """测试全文索引搜索标题和描述，并随更新、删除同步"""
+        self.db.add_task("复习高等数学", description="第三章 Integrals")
+        task_id = self.db.add_task("写周报", description="整理本周工作")
+        self.db.add_task("买菜")
+
+        self.assertEqual([t['title'] for t in self.db.search_tasks("高等数学")], ["复习高等数学"])
+        self.assertEqual([t['title'] for t in self.db.search_tasks("integral")], ["复习高等数学"])
+        self.assertEqual([t['title'] for t in self.db.search_tasks("本周工作")], ["写周报"])
+        # 不足3个字符的关键词走 LIKE
+        self.assertEqual([t['title'] for t in self.db.search_tasks("买")], ["买菜"])
+
+        self.db.update_task(task_id, title="写月报", description="整理本月工作")
+        self.assertEqual(self.db.search_tasks("本周工作"), [])
+        self.assertEqual([t['title'] for t in self.db.search_tasks("本月工作")], ["写月报"])
+
+        self.db.delete_task(task_id)
+        self.assertEqual(self.db.search_tasks("本月工作"), [])
+
+    def test_search_without_fts(self):
+        """测试SQLite不支持全文索引时数据库仍可用，搜索改用 LIKE"""
+        path = os.path.join(self.temp_dir, "no_fts.db")
+        with mock.patch("src.database._FTS_SCHEMA_SQL",
+                        "CREATE VIRTUAL TABLE tasks_fts USING no_such_module(title);"):
+            db = Database(path)
+        try:
+            self.assertFalse(db._fts_enabled)
+            db.add_task("复习高等数学", description="第三章 Integrals")
+            db.add_task("买菜")
+            self.assertEqual([t['title'] for t in db.search_tasks("高等数学")], ["复习高等数学"])
+            self.assertEqual([t['title'] for t in db.search_tasks("integral")], ["复习高等数学"])
+        finally:
+            db.close()
+
+        # 之后换到支持全文索引的SQLite时补建索引
+        db = Database(path)
+        try:
+            self.assertTrue(db._fts_enabled)
+            self.assertEqual([t['title'] for t in db.search_tasks("高等数学")], ["复习高等数学"])
+        finally:
+            db.close()
+
+    def test_get_statistics(self):
+        """测试统计总数和各状态计数（空表时为0）"""
+        self.assertEqual(self.db.get_statistics(),
+                         {'total': 0, 'pending': 0, 'completed': 0, 'expired': 0})
+
+        self.db.add_task("待完成")
+        self.db.update_task(self.db.add_task("已完成"), status="completed")
+        self.db.update_task(self.db.add_task("已过期"), status="expired")
+        self.db.update_task(self.db.add_task("已过期2"), status="expired")
+
+        self.assertEqual(self.db.get_statistics(),
+                         {'total': 4, 'pending': 1, 'completed': 1, 'expired': 2})
+
+    def test_get_today_tasks(self):
+        """测试只返回今天到期且未完成的任务"""
+        today = datetime.now()
+        self.db.add_task("今天", due_date=today.strftime("%Y-%m-%d 23:59:59"))
+        self.db.add_task("今天(仅日期)", due_date=today.strftime("%Y-%m-%d"))
+        self.db.add_task("明天", due_date=(today + timedelta(days=1)).strftime("%Y-%m-%d 00:00:00"))
+        done_id = self.db.add_task("已完成", due_date=today.strftime("%Y-%m-%d 08:00:00"))
+        self.db.update_task(done_id, status="completed")
+
+        titles = sorted(t['title'] for t in self.db.get_today_tasks())
+        self.assertEqual(titles, sorted(["今天", "今天(仅日期)"]))
+
+    def test_task_timestamps_generated_by_sqlite(self):
+        """测试任务创建/更新时间由SQLite生成"""
+        task_id = self.db.add_task("任务")
+        task = self.db.get_task(task_id)
+        self.assertRegex(task['created_at'], r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$")
+        self.assertEqual(task['created_at'], task['updated_at'])
+
+        self.db.conn.execute("UPDATE tasks SET updated_at = '2000-01-01 00:00:00'")
+        self.assertTrue(self.db.update_task(task_id, priority=3))
+        self.assertGreater(self.db.get_task(task_id)['updated_at'], '2000-01-01 00:00:00')
+
+
+class TestTaskDependencies(DatabaseTestCase):
+    """任务依赖测试"""
+
+    def setUp(self):
+        super().setUp()
+        self.ids = [self.db.add_task(f"任务{i}") for i in range(4)]
+
+    def test_get_all_task_relations(self):
+        """测试一次取出正向和反向依赖"""
+        a, b, c, d = self.ids
+        self.db.add_task_dependency(a, b)
+        self.db.add_task_dependency(b, c)
+        self.db.add_task_dependency(d, b)
+
+        relations = self.db.get_all_task_relations([a, b])
+        self.assertEqual(relations[a], {'depends_on': [b], 'dependents': []})
+        self.assertEqual(relations[b]['depends_on'], [c])
+        self.assertEqual(sorted(relations[b]['dependents']), [a, d])
+
+    def test_check_circular_dependency(self):
+        """测试循环依赖检测"""
+        a, b, c, d = self.ids
+        self.db.add_task_dependency(a, b)
+        self.db.add_task_dependency(b, c)
+
+        self.assertTrue(self.db.check_circular_dependency(c, a))
+        self.assertTrue(self.db.check_circular_dependency(c, b))
+        self.assertFalse(self.db.check_circular_dependency(a, d))
+        self.assertFalse(self.db.check_circular_dependency(d, a))
+
+
+class TestSubtasks(DatabaseTestCase):
+    """子任务测试"""
+
+    def test_subtask_records(self):
+        """测试子任务记录对象"""
+        task_id = self.db.add_task("任务")
+        first = self.db.add_subtask(task_id, "子任务1", sort_order=0)
+        self.db.add_subtask(task_id, "子任务2", sort_order=1)
+        self.db.update_subtask(first, status='completed')
+
+        records = self.db.get_subtask_records(task_id)
+        self.assertTrue(all(isinstance(r, Subtask) for r in records))
+        self.assertEqual([r.as_dict() for r in records], self.db.get_subtasks(task_id))
+        self.assertEqual([r.status for r in records], ['completed', 'pending'])
+        self.assertIsNotNone(records[0].completed_at)
+
+
+class TestChatHistory(DatabaseTestCase):
+    """对话历史测试"""
+
+    def test_get_chat_history_returns_latest_in_order(self):
+        """测试返回最近N条消息且按时间正序排列"""
+        pet_id = self.db.create_pet("小宠物")
+        for i in range(10):
+            self.db.add_chat_message(pet_id, "user", f"消息{i}")
+
+        history = self.db.get_chat_history(pet_id, limit=3)
+        self.assertEqual([m['message'] for m in history], ["消息7", "消息8", "消息9"])
+
+        history = self.db.get_chat_history(limit=4)
+        self.assertEqual([m['message'] for m in history], ["消息6", "消息7", "消息8", "消息9"])
+
+    def test_chat_history_and_image_tasks_pagination(self):
+        """测试通过 before_id 向前翻页"""
+        pet_id = self.db.create_pet("小宠物")
+        other_id = self.db.create_pet("另一只")
+        for i in range(6):
+            self.db.add_chat_message(pet_id, "user", f"消息{i}")
+            self.db.add_chat_message(other_id, "user", f"其他{i}")
+
+        page = self.db.get_chat_history(pet_id, limit=2)
+        self.assertEqual([m['message'] for m in page], ["消息4", "消息5"])
+        page = self.db.get_chat_history(pet_id, limit=3, before_id=page[0]['id'])
+        self.assertEqual([m['message'] for m in page], ["消息1", "消息2", "消息3"])
+        records = self.db.get_chat_records(pet_id, limit=5, before_id=page[0]['id'])
+        self.assertEqual([r.message for r in records], ["消息0"])
+
+        for i in range(5):
+            self.db.add_image_task(f"{i}.png", "{}")
+        page = self.db.get_image_tasks(limit=2)
+        self.assertEqual([t['image_path'] for t in page], ["4.png", "3.png"])
+        page = self.db.get_image_tasks(limit=2, before_id=page[-1]['id'])
+        self.assertEqual([t['image_path'] for t in page], ["2.png", "1.png"])
+
+    def test_pet_history_includes_messages_without_pet(self):
+        """测试按宠物查询时合并无宠物的消息，并按id顺序取最近N条"""
+        pet_id = self.db.create_pet("小宠物")
+        other_id = self.db.create_pet("另一只")
+        self.db.add_chat_message(None, "user", "公共0")
+        for i in range(3):
+            self.db.add_chat_message(pet_id, "user", f"消息{i}")
+            self.db.add_chat_message(other_id, "user", f"其他{i}")
+        self.db.add_chat_message(None, "user", "公共1")
+
+        history = self.db.get_chat_history(pet_id, limit=3)
+        self.assertEqual([m['message'] for m in history], ["消息1", "消息2", "公共1"])
+        history = self.db.get_chat_history(pet_id, limit=10, before_id=history[0]['id'])
+        self.assertEqual([m['message'] for m in history], ["公共0", "消息0"])
+
+    def test_get_image_task_by_hash(self):
+        """测试按图片哈希取最近一次识别结果"""
+        result = '{"summary": "' + "会议记录" * 200 + '", "tasks": []}'
+        self.db.add_image_task("a.png", "{}", image_hash="abc")
+        self.db.add_image_task("b.png", result, image_hash="abc")
+
+        cached = self.db.get_image_task_by_hash("abc")
+        self.assertEqual(cached['image_path'], "b.png")
+        self.assertEqual(cached['recognition_result'], result)
+        self.assertIsNone(self.db.get_image_task_by_hash("def"))
+
+    def test_chat_records(self):
+        """测试对话记录对象"""
+        pet_id = self.db.create_pet("小宠物")
+        self.db.add_chat_message(pet_id, "user", "你好")
+        self.db.add_chat_message(pet_id, "assistant", "喵")
+
+        records = self.db.get_chat_records(pet_id)
+        self.assertTrue(all(isinstance(r, ChatMessage) for r in records))
+        self.assertEqual([(r.role, r.message) for r in records], [("user", "你好"), ("assistant", "喵")])
+        self.assertEqual([r.as_dict() for r in records], self.db.get_chat_history(pet_id))
+
+    def test_long_text_stored_compressed(self):
+        """测试长消息和识别结果压缩存储，读取时透明解压"""
+        pet_id = self.db.create_pet("小宠物")
+        long_message = "今天也要认真完成任务哦！" * 100
+        self.db.add_chat_message(pet_id, "assistant", long_message)
+        self.db.add_chat_message(pet_id, "user", "好")
+        result = '{"tasks": [' + ", ".join(['{"title": "整理文档"}'] * 50) + ']}'
+        self.db.add_image_task("a.png", result)
+
+        stored = self.db.conn.execute("SELECT message FROM chat_history ORDER BY id").fetchall()
+        self.assertIsInstance(stored[0][0], bytes)
+        self.assertLess(len(stored[0][0]), len(long_message.encode("utf-8")))
+        self.assertEqual(stored[1][0], "好")
+
+        self.assertEqual([m['message'] for m in self.db.get_chat_history(pet_id)], [long_message, "好"])
+        self.assertEqual(self.db.get_chat_records(pet_id)[0].message, long_message)
+        self.assertEqual(self.db.get_image_tasks()[0]['recognition_result'], result)
+
+
+
+class TestViewSettings(DatabaseTestCase):
+    """视图设置测试"""
+
+    def test_save_view_settings_upsert(self):
+        """测试重复保存时更新同一条记录"""
+        first = self.db.save_view_settings("kanban", '{"a": 1}')
+        second = self.db.save_view_settings("kanban", '{"a": 2}', is_default=True)
+        other = self.db.save_view_settings("kanban", '{"b": 1}', user_id="other")
+
+        self.assertGreater(first, 0)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+        settings = self.db.get_view_settings("kanban")
+        self.assertEqual(settings['settings_data'], '{"a": 2}')
+        self.assertEqual(settings['is_default'], 1)
+
+
+class TestReminderTemplates(DatabaseTestCase):
+    """提醒模板测试"""
+
+    def test_update_usage_returns_new_count(self):
+        """测试更新使用次数时直接返回新值"""
+        template_id = self.db.add_reminder_template("提前10分钟", remind_before_minutes=10)
+        self.assertEqual(self.db.update_reminder_template_usage(template_id), 1)
+        self.assertEqual(self.db.update_reminder_template_usage(template_id), 2)
+        self.assertEqual(self.db.get_all_reminder_templates()[0]['usage_count'], 2)
+        self.assertEqual(self.db.update_reminder_template_usage(template_id + 100), 0)
+
+
+class TestBulkInserts(DatabaseTestCase):
+    """批量写入测试"""
+
+    def test_add_tasks_bulk_returns_ids_in_order(self):
+        """测试批量添加任务返回每个任务的ID"""
+        ids = self.db.add_tasks_bulk([{'title': f"任务{i}", 'priority': 2} for i in range(5)])
+        self.assertEqual(len(ids), 5)
+        self.assertEqual([self.db.get_task(i)['title'] for i in ids], [f"任务{i}" for i in range(5)])
+
+        # 缺少标题时整体回滚
+        self.assertEqual(self.db.add_tasks_bulk([{'title': "新任务"}, {'title': None}]), [])
+        self.assertEqual(len(self.db.get_all_tasks()), 5)
+
+    def test_add_pomodoro_sessions_bulk(self):
+        """测试批量添加番茄钟会话"""
+        count = self.db.add_pomodoro_sessions_bulk([{'duration': 1500}, {'duration': 300, 'session_type': 'break'}])
+        self.assertEqual(count, 2)
+        self.assertEqual(self.db.get_pomodoro_stats()['total_sessions'], 2)
+
+    def test_add_reminder_templates_bulk(self):
+        """测试批量添加提醒模板"""
+        count = self.db.add_reminder_templates_bulk([
+            {'name': "提前10分钟", 'remind_before_minutes': 10},
+            {'name': "每天", 'repeat_type': 'daily'},
+        ])
+        self.assertEqual(count, 2)
+        names = sorted(t['name'] for t in self.db.get_all_reminder_templates())
+        self.assertEqual(names, sorted(["提前10分钟", "每天"]))
+
+    def test_add_backup_records_bulk_is_atomic(self):
+        """测试批量添加备份记录，任意一条失败时整体回滚"""
+        self.assertEqual(self.db.add_backup_records_bulk([
+            {'backup_file_path': "a.db"},
+            {'backup_file_path': "b.db", 'backup_type': 'auto', 'file_size': 10},
+        ]), 2)
+        self.assertEqual(len(self.db.get_backup_records()), 2)
+        self.assertEqual(list(self.db.get_backup_records_iter(1)), self.db.get_backup_records(1))
+
+        self.assertEqual(self.db.add_backup_records_bulk([
+            {'backup_file_path': "c.db"},
+            {'backup_file_path': None},
+        ]), -1)
+        self.assertEqual(len(self.db.get_backup_records()), 2)
+
+    def test_add_chat_messages_and_image_tasks_bulk(self):
+        """测试批量添加对话消息和图片识别记录"""
+        pet_id = self.db.create_pet("小宠物")
+        long_message = "加油！" * 300
+        self.assertEqual(self.db.add_chat_messages_bulk([
+            {'pet_id': pet_id, 'role': "user", 'message': "你好"},
+            {'pet_id': pet_id, 'role': "assistant", 'message': long_message, 'tokens_used': 5},
+        ]), 2)
+        self.assertEqual([m['message'] for m in self.db.get_chat_history(pet_id)], ["你好", long_message])
+
+        self.assertEqual(self.db.add_image_tasks_bulk([
+            {'image_path': "a.png", 'recognition_result': "{}"},
+            {'image_path': "b.png", 'recognition_result': "{}", 'image_hash': "abc"},
+        ]), 2)
+        self.assertEqual(len(self.db.get_image_tasks()), 2)
+
+        self.assertEqual(self.db.add_chat_messages_bulk([
+            {'pet_id': pet_id, 'role': "user", 'message': "新消息"},
+            {'pet_id': pet_id, 'role': None, 'message': "无角色"},
+        ]), -1)
+        self.assertEqual(len(self.db.get_chat_history(pet_id)), 2)
+
+
+class TestReturningFallback(DatabaseTestCase):
+    """不支持 RETURNING 的旧版SQLite（< 3.35）测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        patcher = mock.patch("src.database._HAS_RETURNING", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_insert_ids(self):
+        """测试改为读取 lastrowid 时新行ID正确"""
+        task_id = self.db.add_task("任务")
+        self.assertEqual(self.db.get_task(task_id)['title'], "任务")
+        ids = self.db.add_tasks_bulk([{'title': "任务1"}, {'title': "任务2"}])
+        self.assertEqual([self.db.get_task(i)['title'] for i in ids], ["任务1", "任务2"])
+        self.assertGreater(self.db.add_pomodoro_session(task_id, 1500), 0)
+        self.assertGreater(self.db.add_tag("标签"), 0)
+
+    def test_upserts_and_counters(self):
+        """测试UPSERT、忽略插入和计数更新的返回值"""
+        pet_id = self.db.create_pet("小宠物")
+        self.assertGreater(self.db.unlock_achievement(pet_id, "task", "第一个任务"), 0)
+        self.assertEqual(self.db.unlock_achievement(pet_id, "task", "第一个任务"), 0)
+
+        item_id = self.db.add_item(pet_id, "小鱼干", "food")
+        self.db.add_item(pet_id, "小零食", "food")
+        self.assertEqual(self.db.add_item(pet_id, "小鱼干", "food"), item_id)
+
+        first = self.db.save_view_settings("kanban", '{"a": 1}')
+        self.db.save_view_settings("kanban", '{"b": 1}', user_id="other")
+        self.assertEqual(self.db.save_view_settings("kanban", '{"a": 2}'), first)
+
+        template_id = self.db.add_reminder_template("提前10分钟", remind_before_minutes=10)
+        self.assertEqual(self.db.update_reminder_template_usage(template_id), 1)
+        self.assertEqual(self.db.update_reminder_template_usage(template_id), 2)
+        self.assertEqual(self.db.update_reminder_template_usage(template_id + 100), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()